@@ -0,0 +1,155 @@
+"""
+This module decides which websocket connections on `/commands` are accepted
+without asking the database on every connect.
+"""
+
+import logging
+import threading
+
+LOGGER = logging.getLogger("fsim.admission")
+
+
+class SlaveIndex:
+    """
+    A thread-safe in-memory index which maps the IP address of a slave to its
+    identifier and name. The index is filled on demand and has to be
+    invalidated if a `SlaveModel` is created, updated or deleted.
+
+    In addition the index remembers the `online` requests which are send to
+    connecting slaves, so that a connect does not write into the database.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.__slaves = {}
+        self.__online_requests = {}
+        # amount of invalidations (detects invalidations during a lookup)
+        self.__generation = 0
+
+    def clear(self):
+        """
+        Thread-safe function.
+
+        Forgets all slaves and `online` requests.
+        """
+        with self.lock:
+            self.__slaves.clear()
+            self.__online_requests.clear()
+            self.__generation += 1
+
+    def invalidate(self):
+        """
+        Thread-safe function.
+
+        Forgets all slaves. Has to be called if a `SlaveModel` was created,
+        updated or deleted.
+        """
+        with self.lock:
+            self.__slaves.clear()
+            self.__generation += 1
+
+    def lookup(self, ip_address):
+        """
+        Thread-safe function.
+
+        Searches the slave with the given `ip_address`. The database is only
+        queried if the slave is not in the index.
+
+        Parameters
+        ----------
+            ip_address: str
+                The IP address of the slave.
+
+        Returns
+        -------
+            (int, str) or None:
+                The identifier and the name of the slave or None if no slave
+                with `ip_address` exists.
+        """
+        from .models import Slave as SlaveModel
+
+        with self.lock:
+            slave = self.__slaves.get(ip_address)
+            generation = self.__generation
+
+        if slave is None:
+            slave = SlaveModel.objects.filter(
+                ip_address=ip_address).values_list('id', 'name').first()
+
+            with self.lock:
+                # an invalidation during the query could make `slave` stale
+                if slave is not None and generation == self.__generation:
+                    self.__slaves[ip_address] = slave
+
+        return slave
+
+    def request_online(self, uuid, slave):
+        """
+        Thread-safe function.
+
+        Remembers that an `online` request with `uuid` was send to `slave`.
+
+        Parameters
+        ----------
+            uuid: str
+                The uuid of the `online` command.
+            slave: (int, str)
+                The identifier and the name of the slave.
+        """
+        with self.lock:
+            self.__online_requests[uuid] = slave
+
+    def is_online_requested(self, uuid):
+        """
+        Thread-safe function.
+
+        Returns
+        -------
+            bool:
+                If the `online` request with `uuid` is not answered yet.
+        """
+        with self.lock:
+            return uuid in self.__online_requests
+
+    def cancel_online(self, slave_ids):
+        """
+        Thread-safe function.
+
+        Removes all `online` requests of the given slaves (e.g. because they
+        disconnected).
+
+        Parameters
+        ----------
+            slave_ids: list of int
+                The identifiers of the slaves.
+        """
+        slave_ids = set(slave_ids)
+
+        with self.lock:
+            for (uuid, slave) in list(self.__online_requests.items()):
+                if slave[0] in slave_ids:
+                    del self.__online_requests[uuid]
+
+    def answer_online(self, uuid):
+        """
+        Thread-safe function.
+
+        Removes the `online` request with `uuid`.
+
+        Parameters
+        ----------
+            uuid: str
+                The uuid of the `online` command.
+
+        Returns
+        -------
+            (int, str) or None:
+                The identifier and the name of the slave which received the
+                request or None if the request is unknown.
+        """
+        with self.lock:
+            return self.__online_requests.pop(uuid, None)
+
+
+# The index which is used by the whole application.
+SLAVE_INDEX = SlaveIndex()
@@ -4,14 +4,19 @@ handler function has an HTTP METHOD attribute in the doc string where more
 information about a supported HTTP method can be found.
 """
 import logging
-import platform
-import sched, threading
-import subprocess
 
-from django.http import HttpResponseForbidden
+from django.http import (
+    HttpResponse,
+    HttpResponseForbidden,
+    HttpResponseNotModified,
+)
 from django.http.request import QueryDict
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.db.utils import IntegrityError
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 
 from utils import Status
 from utils.typecheck import ensure_type
@@ -26,9 +31,20 @@ from .models import (
     Filesystem as FilesystemModel,
     ScriptGraphFiles as SGFModel,
     ScriptGraphPrograms as SGPModel,
+    ProgramRun as ProgramRunModel,
+    ProgramRunStatistics as ProgramRunStatisticsModel,
+    new_version,
 )
 
-from .scripts import Script
+from .scripts import Script, key_columns
+from .tracker import COMMANDS
+from .ingest import LOGS
+from .livestate import LIVE_STATE
+from .exportcache import SCRIPT_EXPORTS
+from .shutdown import SHUTDOWN
+from .heartbeat import HEARTBEATS
+from .admission import SLAVE_INDEX
+from .search import NAME_INDEX
 from .forms import SlaveForm, ProgramForm, FilesystemForm
 
 from .errors import (
@@ -39,6 +55,9 @@ from .errors import (
     SimultaneousQueryError,
     ScriptRunningError,
     ScriptNotExistError,
+    ShutdownRunningError,
+    QueryParameterError,
+    PositiveNumberError,
 )
 
 from frontend import controller
@@ -49,15 +68,43 @@ from .controller import (
     fs_delete,
     fs_move,
     fs_restore,
+    fs_batch,
+    fs_move_command,
+    fs_restore_command,
     prog_log_disable,
     prog_log_enable,
     prog_log_get,
     script_deep_copy,
+    script_deep_copy_many,
     slave_wake_on_lan,
 )
 
 LOGGER = logging.getLogger("fsim.api")
 
+# the fields which can be requested with ?fields= from the list endpoints
+SLAVE_FIELDS = ['id', 'name', 'ip_address', 'mac_address', 'online']
+PROGRAM_FIELDS = [
+    'id',
+    'name',
+    'slave',
+    'path',
+    'arguments',
+    'start_time',
+    'ready_pattern',
+    'ready_port',
+]
+FILESYSTEM_FIELDS = [
+    'id',
+    'name',
+    'slave',
+    'source_path',
+    'source_type',
+    'destination_path',
+    'destination_type',
+    'hash_value',
+    'error_code',
+]
+
 
 def script_put_post(data, script_id):
     """
@@ -65,26 +112,38 @@ def script_put_post(data, script_id):
     `script_set`. The logic for the PUT and POST method inside these functions
     are identical. For more information take a look at `script_entry` or
     `script_set`
+
+    A PUT (`script_id` is not None) only writes the changed graph entries and
+    returns the amount of added and removed programs and filesystems.
     """
     try:
         script = Script.from_json(data)
         if script_id is None:
             script.save()
+            return StatusResponse.ok('')
         else:
-            (new_model, _) = ScriptModel.objects.update_or_create(
-                id=script_id,
-                defaults={"name": script.name},
-            )
-
-            SGFModel.objects.filter(script_id=script_id).delete()
-            SGPModel.objects.filter(script_id=script_id).delete()
-
-            for program in script.programs:
-                program.save(new_model)
-            for filesystem in script.filesystems:
-                filesystem.save(new_model)
-
-        return StatusResponse.ok('')
+            with transaction.atomic():
+                model = ScriptModel.objects.filter(id=script_id).first()
+
+                if model is None:
+                    model = ScriptModel.objects.create(
+                        id=script_id,
+                        name=script.name,
+                    )
+                elif model.name != script.name:
+                    model.name = script.name
+                    model.version = new_version()
+                    model.save(update_fields=['name', 'version'])
+
+                # only the changed entries are written
+                changes = script.update_entries(model)
+
+                if any(
+                        change['added'] or change['removed']
+                        for change in changes.values()):
+                    ScriptModel.touch(id=model.id)
+
+            return StatusResponse.ok(changes)
     except FsimError as err:
         return StatusResponse(err)
     except KeyError as err:
@@ -100,6 +159,174 @@ def script_put_post(data, script_id):
         return StatusResponse.err(str(err))
 
 
+def etag_matches(request, etag):
+    """
+    Checks if the If-None-Match header of `request` contains `etag` (weak
+    comparison).
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+        etag: str
+            The current (quoted) ETag of the resource.
+
+    Returns
+    -------
+        bool:
+            If the client already has the current version of the resource.
+    """
+    etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    return '*' in etags or etag in [
+        tag[2:] if tag.startswith('W/') else tag for tag in etags
+    ]
+
+
+def batch_results(identifiers, errors):
+    """
+    Creates the result of a batch request with one entry per identifier (in
+    the order of the request).
+
+    Parameters
+    ----------
+        identifiers: list of int
+            The identifiers of the request.
+        errors: dict
+            Maps every identifier to the `FsimError` which was raised for it
+            (or None if the action succeeded).
+
+    Returns
+    -------
+        list of dict:
+            The identifier, the status ('ok' or 'err') and the error message.
+    """
+    return [{
+        'id': identifier,
+        'status': Status.ID_OK if errors[identifier] is None else
+        Status.ID_ERR,
+        'payload': '' if errors[identifier] is None else str(
+            errors[identifier]),
+    } for identifier in identifiers]
+
+
+def batch_identifiers(request, key):
+    """
+    Reads the identifiers of a batch request (e.g. ?programs=1&programs=2).
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+        key: str
+            The name of the list in the request.
+
+    Returns
+    -------
+        list of int:
+            The identifiers without duplicates (in the order of the request).
+
+    Raises
+    ------
+        ValueError:
+            If an identifier is not an integer.
+    """
+    identifiers = []
+    for identifier in request.POST.getlist(key):
+        identifier = int(identifier)
+        if identifier not in identifiers:
+            identifiers.append(identifier)
+    return identifiers
+
+
+def is_paginated(request):
+    """
+    Checks if a list endpoint should return a page (see `paginate`) instead
+    of all names.
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+
+    Returns
+    -------
+        bool:
+            If one of the parameters limit, cursor or fields is given.
+    """
+    return any(key in request.GET for key in ('limit', 'cursor', 'fields'))
+
+
+def paginate(request, queryset, fields):
+    """
+    Returns one page of `queryset` ordered by the id. The page is selected
+    with the parameters of `request`:
+        limit:
+            The maximal amount of rows on the page (FSIM_PAGE_SIZE by default,
+            at most FSIM_MAX_PAGE_SIZE). A limit of 0 returns an empty page
+            whose `next` is the given cursor (if any rows follow).
+        cursor:
+            The `next` value of the previous page (the first page if it is
+            not given).
+        fields:
+            A comma separated list of the fields which are returned for every
+            row (id and name by default).
+
+    The next page starts after the last id of the page (keyset pagination),
+    so every page costs one indexed query no matter how deep it is.
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+        queryset: QuerySet
+            The rows of the list.
+        fields: list of str
+            The fields which can be requested.
+
+    Returns
+    -------
+        StatusResponse:
+            The rows of the page as 'results' and the cursor of the next page
+            as 'next' (None if this is the last page).
+    """
+    try:
+        selected = request.GET.get('fields', 'id,name').split(',')
+        for field in selected:
+            if field not in fields:
+                raise QueryParameterError(field, fields)
+
+        limit = int(request.GET.get('limit', settings.FSIM_PAGE_SIZE))
+        if limit < 0:
+            raise PositiveNumberError(limit, 'limit')
+        limit = min(limit, settings.FSIM_MAX_PAGE_SIZE)
+
+        cursor = request.GET.get('cursor', '')
+        if cursor:
+            queryset = queryset.filter(id__gt=int(cursor))
+    except ValueError as err:
+        return StatusResponse.err(str(err))
+    except FsimError as err:
+        return StatusResponse(err)
+
+    # the volatile fields are read with queries
+    LIVE_STATE.flush()
+
+    rows = list(
+        queryset.order_by('id').values(*set(['id'] + selected))[:limit + 1])
+
+    following = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        # an empty page continues where it started (all ids are positive)
+        following = str(rows[-1]['id']) if rows else cursor or '0'
+
+    return StatusResponse.ok({
+        'results': [{field: row[field]
+                     for field in selected} for row in rows],
+        'next': following,
+    })
+
+
 def convert_str_to_bool(string):
     """
     Converts a string into a boolean by checking common patterns.  If no
@@ -133,13 +360,20 @@ def slave_set(request):
         POST:
             Adds a new `SlaveModel` to the database.
         GET: query with (?q=None)
-            Searches for the name which is like ".*q.*"
+            Searches for the name which is like ".*q.*" (the best matches
+            first, see `NameIndex.search`).
         GET: query with (?programs=False)
             If this is True, then all `SlaveModel`s are returned which have a
             `ProgramModel`.
         GET: query with (?filesystems=False)
             If this is True, then all `SlaveModel`s are returned which have a
             `FilesystemModel`.
+        GET: query with (?limit=None&cursor=None&fields=id,name)
+            Returns one page of the `SlaveModel`s which match the other
+            queries with the given fields (see `SLAVE_FIELDS`) and the
+            cursor of the next page (see `paginate`). A page of `q` contains
+            the names which are like ".*q.*" ordered by the id (not the best
+            matches first).
 
     Parameters
     ----------
@@ -156,6 +390,7 @@ def slave_set(request):
         form = SlaveForm(request.POST)
         if form.is_valid():
             form.save()
+            SLAVE_INDEX.invalidate()
             return StatusResponse.ok('')
         return StatusResponse.err(form.errors)
     elif request.method == 'GET':
@@ -167,26 +402,27 @@ def slave_set(request):
         filesystems = request.GET.get('filesystems', '')
         filesystems = convert_str_to_bool(filesystems)
 
+        if programs and filesystems and query is None:
+            return StatusResponse(
+                SimultaneousQueryError('filesystems', 'programs'))
+
         if query is not None:
+            if not is_paginated(request):
+                return StatusResponse.ok(NAME_INDEX.search(SlaveModel, query))
+            slaves = SlaveModel.objects.filter(name__contains=query)
+        elif programs:
             slaves = SlaveModel.objects.filter(
-                name__contains=query).values_list(
-                    "name",
-                    flat=True,
-                )
-        elif programs or filesystems:
-            if programs and filesystems:
-                return StatusResponse(
-                    SimultaneousQueryError('filesystems', 'programs'))
-            elif programs:
-                slaves = SlaveModel.with_programs()
-            elif filesystems:
-                slaves = SlaveModel.with_filesystems()
+                id__in=ProgramModel.objects.values('slave'))
+        elif filesystems:
+            slaves = SlaveModel.objects.filter(
+                id__in=FilesystemModel.objects.values('slave'))
         else:
-            slaves = SlaveModel.objects.all().values_list(
-                'name',
-                flat=True,
-            )
-        return StatusResponse.ok(list(slaves))
+            slaves = SlaveModel.objects.all()
+
+        if is_paginated(request):
+            return paginate(request, slaves, SLAVE_FIELDS)
+
+        return StatusResponse.ok(list(slaves.values_list('name', flat=True)))
     else:
         return HttpResponseForbidden()
 
@@ -216,6 +452,7 @@ def slave_entry(request, slave_id):
     if request.method == 'DELETE':
         try:
             SlaveModel.objects.get(id=slave_id).delete()
+            SLAVE_INDEX.invalidate()
             return StatusResponse.ok('')
         except SlaveModel.DoesNotExist as err:
             return StatusResponse(SlaveNotExistError(err, slave_id))
@@ -230,6 +467,7 @@ def slave_entry(request, slave_id):
 
             if form.is_valid():
                 form.save()
+                SLAVE_INDEX.invalidate()
                 return StatusResponse.ok('')
             else:
                 return StatusResponse.err(form.errors)
@@ -239,6 +477,52 @@ def slave_entry(request, slave_id):
         return HttpResponseForbidden()
 
 
+def slave_connection(request, slave_id):
+    """
+    Process requests for the websocket connection of a `SlaveModel`.
+
+    HTTP Methods
+    ------------
+        GET:
+            Returns the state of the connection. `last_seen` contains the
+            seconds since the last message of the slave, `rtt` the smoothed
+            round trip time and `jitter` its variation (both in seconds) and
+            `missed` the number of heartbeats in a row which were not answered
+            before the next one was send. These values are None if the slave
+            is not connected.
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+
+    Returns
+    -------
+        HttpResponse:
+            If the HTTP method is not supported, then an
+            `HttpResponseForbidden` is returned.
+    """
+    if request.method == 'GET':
+        try:
+            slave = SlaveModel.objects.get(id=slave_id)
+        except SlaveModel.DoesNotExist as err:
+            return StatusResponse(SlaveNotExistError(err, slave_id))
+
+        statistics = HEARTBEATS.statistics(slave.id)
+        if statistics is None:
+            statistics = {
+                'last_seen': None,
+                'rtt': None,
+                'jitter': None,
+                'missed': None,
+            }
+
+        statistics['online'] = slave.is_online
+        return StatusResponse.ok(statistics)
+    else:
+        return HttpResponseForbidden()
+
+
 def slave_shutdown(request, slave_id):
     """
     Processes an method invocation (shutdown) for an `SlaveModel`.(see
@@ -317,11 +601,18 @@ def program_set(request):
         POST:
             Adds a new `ProgramModel` to the database.
         GET: query with (?q=None)
-            Searches for the name which is like ".*q.*"
+            Searches for the name which is like ".*q.*" (the best matches
+            first, see `NameIndex.search`).
         GET: query with (?slave=None&is_string=False)
             Searches for all `ProgramModel`s which belong to the given `slave`.
             Where `is_string` specifies if the given `slave` is an unique name
             or and unique index.
+        GET: query with (?limit=None&cursor=None&fields=id,name)
+            Returns one page of the `ProgramModel`s which match the other
+            queries with the given fields (see `PROGRAM_FIELDS`) and the
+            cursor of the next page (see `paginate`). A page of `q` contains
+            the names which are like ".*q.*" ordered by the id (not the best
+            matches first).
 
     Parameters
     ----------
@@ -359,11 +650,10 @@ def program_set(request):
         slave_str = request.GET.get('is_string', False)
 
         if query is not None:
-            progs = ProgramModel.objects.filter(
-                name__contains=query).values_list(
-                    "name",
-                    flat=True,
-                )
+            if not is_paginated(request):
+                return StatusResponse.ok(
+                    NAME_INDEX.search(ProgramModel, query))
+            progs = ProgramModel.objects.filter(name__contains=query)
         elif slave is not None:
             if slave_str:
                 slave_str = convert_str_to_bool(slave_str)
@@ -375,18 +665,15 @@ def program_set(request):
             except SlaveModel.DoesNotExist as err:
                 return StatusResponse(SlaveNotExistError(err, slave))
 
-            progs = ProgramModel.objects.filter(slave=slave).values_list(
-                "name",
-                flat=True,
-            )
+            progs = ProgramModel.objects.filter(slave=slave)
 
         else:
-            progs = ProgramModel.objects.all().values_list(
-                "name",
-                flat=True,
-            )
+            progs = ProgramModel.objects.all()
+
+        if is_paginated(request):
+            return paginate(request, progs, PROGRAM_FIELDS)
 
-        return StatusResponse.ok(list(progs))
+        return StatusResponse.ok(list(progs.values_list('name', flat=True)))
     else:
         return HttpResponseForbidden()
 
@@ -519,6 +806,75 @@ def program_stop(request, program_id):
         return HttpResponseForbidden()
 
 
+def program_batch(request, action):
+    """
+    Processes an method invocation (`action` is `prog_start` or `prog_stop`)
+    for a set of `ProgramModel`s. The `ProgramModel`s are read with one
+    query.
+
+    HTTP Methods
+    ------------
+        POST: (with programs=<id>&programs=<id>...)
+            Invokes the method for every `ProgramModel` and returns one
+            result per `ProgramModel` (see `batch_results`).
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+        action: function
+            The method which is invoked for every `ProgramModel`.
+
+    Returns
+    -------
+        HttpResponse:
+            If the HTTP method is not supported, then an
+            `HttpResponseForbidden` is returned.
+    """
+    if request.method == 'POST':
+        try:
+            program_ids = batch_identifiers(request, 'programs')
+        except ValueError as err:
+            return StatusResponse.err(str(err))
+
+        # the state is read with the query
+        LIVE_STATE.flush()
+        programs = ProgramModel.objects.with_state().select_related(
+            'slave', 'programstatus').in_bulk(program_ids)
+
+        errors = {}
+        for program_id in program_ids:
+            try:
+                if program_id not in programs:
+                    raise ProgramNotExistError(ProgramModel.DoesNotExist(),
+                                               program_id)
+
+                action(programs[program_id])
+                errors[program_id] = None
+            except FsimError as err:
+                errors[program_id] = err
+
+        return StatusResponse.ok(batch_results(program_ids, errors))
+    else:
+        return HttpResponseForbidden()
+
+
+def program_start_set(request):
+    """
+    Starts a set of `ProgramModel`s (see `program_batch` and
+    @frontend.controller.prog_start).
+    """
+    return program_batch(request, prog_start)
+
+
+def program_stop_set(request):
+    """
+    Stops a set of `ProgramModel`s (see `program_batch` and
+    @frontend.controller.prog_stop).
+    """
+    return program_batch(request, prog_stop)
+
+
 def program_log_entry(request, program_id):
     """
     Process requests for a single `ProgramModel`s for the log attribute.
@@ -621,6 +977,99 @@ def program_log_disable(request, program_id):
         return HttpResponseForbidden()
 
 
+def program_runs(request, program_id):
+    """
+    Process requests for the run history of a single `ProgramModel`.
+
+    HTTP Methods
+    ------------
+        GET:
+            Returns the aggregated statistics of all runs (amount, errors,
+            timeouts, mean and percentile durations) and the latest runs.
+            The amount of runs can be limited with the query parameter
+            `limit` (default 20).
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+
+    Returns
+    -------
+        HttpResponse:
+            If the HTTP method is not supported, then an
+            `HttpResponseForbidden` is returned.
+    """
+    if request.method == 'GET':
+        try:
+            program = ProgramModel.objects.get(id=program_id)
+        except ProgramModel.DoesNotExist as err:
+            return StatusResponse(ProgramNotExistError(err, program_id))
+
+        try:
+            limit = max(0, int(request.GET.get('limit', 20)))
+        except ValueError:
+            return StatusResponse.err('limit has to be an integer.')
+
+        try:
+            statistics = program.programrunstatistics
+        except ProgramRunStatisticsModel.DoesNotExist:
+            statistics = ProgramRunStatisticsModel(program=program)
+
+        runs = ProgramRunModel.objects.filter(
+            program=program).order_by('-start')[:limit]
+
+        return StatusResponse.ok({
+            'statistics': statistics.to_dict(),
+            'runs': [run.to_dict() for run in runs],
+        })
+    else:
+        return HttpResponseForbidden()
+
+
+def program_start_time(request, program_id):
+    """
+    Process requests for the tuning of the `start_time` of a single
+    `ProgramModel`. (see @frontend.controller.prog_suggest_start_time)
+
+    HTTP Methods
+    ------------
+        GET:
+            Returns the current and the suggested `start_time` (None if there
+            is no tighter suggestion).
+        POST:
+            Applies the suggested `start_time`.
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+
+    Returns
+    -------
+        HttpResponse:
+            If the HTTP method is not supported, then an
+            `HttpResponseForbidden` is returned.
+    """
+    if request.method in ['GET', 'POST']:
+        try:
+            program = ProgramModel.objects.get(id=program_id)
+        except ProgramModel.DoesNotExist as err:
+            return StatusResponse(ProgramNotExistError(err, program_id))
+
+        if request.method == 'GET':
+            suggestion = controller.prog_suggest_start_time(program)
+        else:
+            suggestion = controller.prog_tune_start_time(program)
+
+        return StatusResponse.ok({
+            'start_time': program.start_time,
+            'suggestion': suggestion,
+        })
+    else:
+        return HttpResponseForbidden()
+
+
 def script_set(request):
     """
     Process requests on a set of `ScriptModel`s.
@@ -657,6 +1106,9 @@ def script_entry(request, script_id):
             Returns this `ScriptModel` as a JSON encoded string where
             `SlavesModel`, `ProgramModel` and `FilesystemModel` encoded as str
             or int (specified by &slaves=str, &programs=str, &filesystem=str).
+            The export is cached per version of the `ScriptModel` and has an
+            ETag, a request with a matching If-None-Match header is answered
+            with 304 (Not Modified).
         DELETE:
             Removes the specified entry (in the URL) from the database.
         PUT:
@@ -681,13 +1133,46 @@ def script_entry(request, script_id):
             program_key = request.GET.get('programs', 'int')
             filesystem_key = request.GET.get('filesystems', 'int')
 
-            script = Script.from_model(
-                script_id,
+            # the version changes with every change of the export, so that
+            # an outdated export is never found in the cache
+            version = ScriptModel.objects.values_list(
+                'version', flat=True).get(id=script_id)
+
+            # an invalid key type is an error, even if the ETag matches
+            for key_type in (slave_key, program_key, filesystem_key):
+                key_columns(key_type, 'id', 'name')
+
+            etag = '"{}-{}-{}-{}"'.format(
+                version,
                 slave_key,
                 program_key,
                 filesystem_key,
             )
-            return StatusResponse.ok(dict(script))
+
+            if etag_matches(request, etag):
+                response = HttpResponseNotModified()
+            else:
+                key = (int(script_id), etag)
+                content = SCRIPT_EXPORTS.get(key)
+
+                if content is None:
+                    script = Script.from_model(
+                        script_id,
+                        slave_key,
+                        program_key,
+                        filesystem_key,
+                    )
+                    content = StatusResponse.ok(dict(script)).content
+                    SCRIPT_EXPORTS.put(key, content)
+
+                response = HttpResponse(
+                    content, content_type='application/json')
+
+            # the browser has to ask again (with the ETag) before it uses the
+            # script from its cache
+            response['ETag'] = etag
+            patch_cache_control(response, no_cache=True)
+            return response
         except FsimError as err:
             return StatusResponse(err)
         except ScriptModel.DoesNotExist as err:
@@ -737,6 +1222,54 @@ def script_copy(request, script_id):
         return HttpResponseForbidden()
 
 
+def script_copy_set(request):
+    """
+    Processes an method invocation (copy) for a set of `ScriptModel`s. (see
+    @frontend.controller.script_deep_copy_many)
+
+    HTTP Methods
+    ------------
+        POST: (with scripts=<id>&scripts=<id>...)
+            Copies all given `ScriptModel`s in one transaction and returns
+            the id and the name of every copy (in the order of the request).
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+
+    Returns
+    -------
+        HttpResponse:
+            If the HTTP method is not supported, then an
+            `HttpResponseForbidden` is returned.
+    """
+    if request.method == 'POST':
+        try:
+            script_ids = [int(i) for i in request.POST.getlist('scripts')]
+        except ValueError as err:
+            return StatusResponse.err(str(err))
+
+        scripts = ScriptModel.objects.in_bulk(script_ids)
+
+        for script_id in script_ids:
+            if script_id not in scripts:
+                return StatusResponse(
+                    ScriptNotExistError(
+                        ScriptModel.DoesNotExist(), script_id))
+
+        copies = script_deep_copy_many(
+            [scripts[script_id] for script_id in script_ids])
+
+        return StatusResponse.ok([{
+            'script': script_id,
+            'id': copy.id,
+            'name': copy.name,
+        } for (script_id, copy) in zip(script_ids, copies)])
+    else:
+        return HttpResponseForbidden()
+
+
 def script_run(request, script_id):
     """
     Processes an method invocation (run) for an `ScriptModel`. (see
@@ -845,11 +1378,18 @@ def filesystem_set(request):
         POST:
             Adds a new `FilesystemModel` to the database.
         GET: query with (?q=None)
-            Searches for the name which is like ".*q.*"
+            Searches for the name which is like ".*q.*" (the best matches
+            first, see `NameIndex.search`).
         GET: query with (?slave=None&is_string=False)
             Searches for all `FilesystemModel`s which belong to the given `slave`.
             Where `is_string` specifies if the given `slave` is an unique name or
             and unique index.
+        GET: query with (?limit=None&cursor=None&fields=id,name)
+            Returns one page of the `FilesystemModel`s which match the other
+            queries with the given fields (see `FILESYSTEM_FIELDS`) and the
+            cursor of the next page (see `paginate`). A page of `q` contains
+            the names which are like ".*q.*" ordered by the id (not the best
+            matches first).
 
     Parameters
     ----------
@@ -912,11 +1452,11 @@ def filesystem_set(request):
         slave_str = request.GET.get('is_string', False)
 
         if query is not None:
+            if not is_paginated(request):
+                return StatusResponse.ok(
+                    NAME_INDEX.search(FilesystemModel, query))
             filesystems = FilesystemModel.objects.filter(
-                name__contains=query).values_list(
-                    "name",
-                    flat=True,
-                )
+                name__contains=query)
         elif slave is not None:
             if slave_str:
                 slave_str = convert_str_to_bool(slave_str)
@@ -928,19 +1468,16 @@ def filesystem_set(request):
             except SlaveModel.DoesNotExist as err:
                 return StatusResponse(SlaveNotExistError(err, slave))
 
-            filesystems = FilesystemModel.objects.filter(
-                slave=slave).values_list(
-                    "name",
-                    flat=True,
-                )
+            filesystems = FilesystemModel.objects.filter(slave=slave)
 
         else:
-            filesystems = FilesystemModel.objects.all().values_list(
-                "name",
-                flat=True,
-            )
+            filesystems = FilesystemModel.objects.all()
+
+        if is_paginated(request):
+            return paginate(request, filesystems, FILESYSTEM_FIELDS)
 
-        return StatusResponse.ok(list(filesystems))
+        return StatusResponse.ok(
+            list(filesystems.values_list('name', flat=True)))
     else:
         return HttpResponseForbidden()
 
@@ -1017,6 +1554,77 @@ def filesystem_restore(request, filesystem_id):
         return HttpResponseForbidden()
 
 
+def filesystem_batch(request, create_command):
+    """
+    Processes an method invocation (`create_command` is `fs_move_command` or
+    `fs_restore_command`) for a set of `FilesystemModel`s. The
+    `FilesystemModel`s are read with one query and every slave receives all
+    its commands at once. (see @frontend.controller.fs_batch)
+
+    HTTP Methods
+    ------------
+        POST: (with filesystems=<id>&filesystems=<id>...)
+            Invokes the method for every `FilesystemModel` and returns one
+            result per `FilesystemModel` (see `batch_results`).
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+        create_command: function
+            Creates the command for one `FilesystemModel`.
+
+    Returns
+    -------
+        HttpResponse:
+            If the HTTP method is not supported, then an
+            `HttpResponseForbidden` is returned.
+    """
+    if request.method == 'POST':
+        try:
+            filesystem_ids = batch_identifiers(request, 'filesystems')
+        except ValueError as err:
+            return StatusResponse.err(str(err))
+
+        # the state is read with the query
+        LIVE_STATE.flush()
+        filesystems = FilesystemModel.objects.select_related(
+            'slave').in_bulk(filesystem_ids)
+
+        errors = fs_batch(
+            [
+                filesystems[filesystem_id] for filesystem_id in filesystem_ids
+                if filesystem_id in filesystems
+            ],
+            create_command,
+        )
+
+        for filesystem_id in filesystem_ids:
+            if filesystem_id not in filesystems:
+                errors[filesystem_id] = FilesystemNotExistError(
+                    FilesystemModel.DoesNotExist(), filesystem_id)
+
+        return StatusResponse.ok(batch_results(filesystem_ids, errors))
+    else:
+        return HttpResponseForbidden()
+
+
+def filesystem_move_set(request):
+    """
+    Moves a set of `FilesystemModel`s (see `filesystem_batch` and
+    @frontend.controller.fs_move).
+    """
+    return filesystem_batch(request, fs_move_command)
+
+
+def filesystem_restore_set(request):
+    """
+    Restores a set of `FilesystemModel`s (see `filesystem_batch` and
+    @frontend.controller.fs_restore).
+    """
+    return filesystem_batch(request, fs_restore_command)
+
+
 def filesystem_entry(request, filesystem_id):
     """
     Process requests for a single `FilesystemModel`s.
@@ -1079,14 +1687,129 @@ def filesystem_entry(request, filesystem_id):
         return HttpResponseForbidden()
 
 
+def dashboard(request):
+    """
+    Process requests for the state of all `SlaveModel`s, `ProgramModel`s and
+    `FilesystemModel`s (e.g. to update the web interface without a reload).
+
+    HTTP Methods
+    ------------
+        GET:
+            Returns all `SlaveModel`s, `ProgramModel`s and `FilesystemModel`s
+            with their state and the counters of the whole installation. The
+            amount of queries does not depend on the amount of objects.
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+
+    Returns
+    -------
+        HttpResponse:
+            If the HTTP method is not supported, then an
+            `HttpResponseForbidden` is returned.
+    """
+    if request.method == 'GET':
+        # the state is read with the queries
+        LIVE_STATE.flush()
+
+        slaves = [
+            slave.to_dict()
+            for slave in SlaveModel.with_status_counts().order_by('id')
+        ]
+        programs = list(ProgramModel.objects.with_state().order_by('id'))
+        filesystems = [
+            filesystem.to_dict()
+            for filesystem in FilesystemModel.objects.order_by('id')
+        ]
+
+        return StatusResponse.ok({
+            'slaves': slaves,
+            'programs': [program.to_dict() for program in programs],
+            'filesystems': filesystems,
+            'counters': {
+                'slaves': len(slaves),
+                'online': sum(slave['state'] == 'success' for slave in slaves),
+                'programs': len(programs),
+                # a ready program is running as well (see `data_state`)
+                'running': sum(program.is_running for program in programs),
+                'errored_programs': sum(
+                    program.is_error for program in programs),
+                'filesystems': len(filesystems),
+                'moved': sum(filesystem['state'] == 'moved'
+                             for filesystem in filesystems),
+                'errored_filesystems': sum(filesystem['state'] == 'error'
+                                           for filesystem in filesystems),
+            },
+        })
+    else:
+        return HttpResponseForbidden()
+
+
+def command_metrics(request):
+    """
+    Process requests for the in-flight commands which are send to slaves.
+
+    HTTP Methods
+    ------------
+        GET:
+            Returns the acknowledgement metrics of the `CommandTracker`.
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+
+    Returns
+    -------
+        HttpResponse:
+            If the HTTP method is not supported, then an
+            `HttpResponseForbidden` is returned.
+    """
+    if request.method == 'GET':
+        return StatusResponse.ok(COMMANDS.metrics())
+    else:
+        return HttpResponseForbidden()
+
+
+def log_metrics(request):
+    """
+    Process requests for the logs which are forwarded to the web interface.
+
+    HTTP Methods
+    ------------
+        GET:
+            Returns the counters of the `LogIngest`.
+
+    Parameters
+    ----------
+        request: HttpRequest
+            The request which should be processed.
+
+    Returns
+    -------
+        HttpResponse:
+            If the HTTP method is not supported, then an
+            `HttpResponseForbidden` is returned.
+    """
+    if request.method == 'GET':
+        return StatusResponse.ok(LOGS.metrics())
+    else:
+        return HttpResponseForbidden()
+
+
 def scope_operations(request):
     """
     Process requests to shutdown all clients
 
     HTTP Methods
     ------------
-        POST:
-            Stops all programs, resets the filesystem and shuts down every client
+        POST: (with scope=programs|filesystem|clients|all)
+            Stops all programs, resets the filesystem and shuts down every
+            client (see @frontend.shutdown.Shutdown). The progress is send
+            over the notifications.
+
     Parameters
     ----------
         request: HttpRequest
@@ -1099,51 +1822,15 @@ def scope_operations(request):
             `HttpResponseForbidden` is returned.
     """
     if request.method == 'POST':
+        # a running script must not start programs after the shutdown has
+        # collected the running programs
         FSIM_CURRENT_SCHEDULER.stop()
         FSIM_CURRENT_SCHEDULER.notify()
-        t = ShutdownThread(request.POST['scope'])
-        t.start()
+
+        if not SHUTDOWN.start(request.POST['scope']):
+            return StatusResponse(ShutdownRunningError())
+
         return StatusResponse.ok('')
     else:
         return HttpResponseForbidden()
 
-
-class ShutdownThread(threading.Thread):
-    def __init__(self, scope):
-        threading.Thread.__init__(self)
-        self.scope = scope
-
-    def run(self):  # pragma: no cover
-        s = sched.scheduler()
-        programs = ProgramModel.objects.all()
-        programs = filter(lambda x: x.is_running, programs)
-        delay = 0
-        for program in programs:
-            s.enter(delay, 2, prog_stop, argument=(program, ))
-            delay += 1
-        if self.scope == 'programs':
-            s.run()
-            return
-        filesystems = FilesystemModel.objects.all()
-        filesystems = filter(lambda x: x.is_moved, filesystems)
-        delay += 10
-        for filesystem in filesystems:
-            s.enter(delay, 1, fs_restore, argument=(filesystem, ))
-        if self.scope == 'filesystem':
-            s.run()
-            return
-        slaves = SlaveModel.objects.all()
-        slaves = filter(lambda x: x.is_online, slaves)
-        delay += 8
-        for slave in slaves:
-            s.enter(delay, 3, controller.slave_shutdown, argument=(slave, ))
-            delay += 1
-        if self.scope == 'clients':
-            s.run()
-            return
-        s.run()
-
-        if platform.system() == "Windows":
-            subprocess.run(['shutdown', '-s', '-t', '0'])
-        else:
-            subprocess.run(['shutdown', '-h now'])
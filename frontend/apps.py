@@ -4,8 +4,12 @@ This module contains the configuration of the `frontend` application
 import builtins
 
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.db.utils import OperationalError
-from .scheduler import Scheduler
+
+from server.database import configure_sqlite
+from .scheduler import LazyScheduler
 
 
 def flush(*tables):
@@ -30,6 +34,7 @@ def flush(*tables):
 def reset(*tables):
     """
     Resets all fields for every row in the database for all given `tables`.
+    Every table is reseted with one query (see `ResetQuerySet`).
 
     Parameters
     ---------
@@ -49,16 +54,44 @@ def reset(*tables):
         except AttributeError:
             raise AttributeError(
                 "The table {} is not a Django.Model".format(table))
-        try:
-            for obj in objs.all():
-                obj.reset()
-        except AttributeError:
+        if not hasattr(objs, 'reset'):
             raise AttributeError(
                 "The table {} has no function `reset(self)`.".format(table))
+        try:
+            objs.reset()
         except OperationalError:
             pass
 
 
+def abort_runs():
+    """
+    Ends all program runs which were not finished before the server stopped.
+    The runs have no return code.
+    """
+    from django.utils.timezone import now
+    from frontend.models import ProgramRun
+
+    try:
+        ProgramRun.objects.filter(end=None).update(end=now())
+    except OperationalError:
+        pass
+
+
+def reset_database():
+    """
+    Resets the state which does not survive a restart of the server (with a
+    constant amount of queries).
+    """
+    # Resets the tables. DO NOT DELETE!
+    reset("Slave", "Script", "Filesystem")
+
+    # Flush status tables DO NOT DELETE!
+    flush('ProgramStatus')
+
+    # The runs of the flushed status entries are over DO NOT DELETE!
+    abort_runs()
+
+
 class FrontendConfig(AppConfig):
     """
     This class configures the `frontend` application.
@@ -66,12 +99,29 @@ class FrontendConfig(AppConfig):
     name = 'frontend'
 
     def ready(self):
-        # add FSIM_CURRENT_SCHEDULER to the builtins which make it
-        # avialabel in every module
-        builtins.FSIM_CURRENT_SCHEDULER = Scheduler()
+        # tune every new SQLite connection (WAL, caches)
+        connection_created.connect(configure_sqlite)
+
+        # renamed or deleted objects change the exported scripts
+        from frontend import models, signals
+
+        for (model, receiver) in [
+            (models.Program, signals.program_changed),
+            (models.Filesystem, signals.filesystem_changed),
+            (models.Slave, signals.slave_changed),
+        ]:
+            post_save.connect(receiver, sender=model)
+            # before the cascade deletes the graph entries
+            pre_delete.connect(receiver, sender=model)
 
-        # Resets the tables. DO NOT DELETE!
-        reset("Slave", "Script", "Filesystem")
+            # the name search is kept in sync with the table
+            post_save.connect(signals.name_saved, sender=model)
+            post_delete.connect(signals.name_deleted, sender=model)
+
+        # add FSIM_CURRENT_SCHEDULER to the builtins which make it
+        # avialabel in every module (the thread of the scheduler is started
+        # on first use, so that management commands do not start it)
+        builtins.FSIM_CURRENT_SCHEDULER = LazyScheduler()
 
-        # Flush status tables DO NOT DELETE!
-        flush('ProgramStatus')
+        # Resets the volatile state. DO NOT DELETE!
+        reset_database()
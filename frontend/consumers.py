@@ -7,18 +7,29 @@ import os
 
 from channels import Group
 from channels.sessions import channel_session
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import now
 
 from utils import Command, Status, FormatError
 
 from .models import (
     Slave as SlaveModel,
-    Program as ProgramModel,
     ProgramStatus as ProgramStatusModel,
+    ProgramRun as ProgramRunModel,
     Filesystem as FilesystemModel,
 )
 
 from server.utils import notify_err, notify
 
+from .tracker import COMMANDS
+from .heartbeat import HEARTBEATS
+from .admission import SLAVE_INDEX
+from .ingest import LOGS
+from .livestate import LIVE_STATE
+from .shutdown import SHUTDOWN
+from .controller import prog_tune_start_time
+
 # Get an instance of a logger
 LOGGER = logging.getLogger('fsim.websockets')
 
@@ -37,20 +48,40 @@ def select_method(status):
     """
     LOGGER.debug(dict(status))
 
+    # messages which the slave sends on its own (the uuid belongs to a
+    # command which is still running)
+    unsolicited_methods = ('ready', )
+
+    if (status.payload['method'] not in unsolicited_methods
+            and not COMMANDS.acknowledge(status.uuid)):
+        LOGGER.info(
+            "Ignoring duplicate answer for command %s.",
+            status.uuid,
+        )
+        return
+
     function_handle_table = {
         'online': handle_online,
         'execute': handle_execute,
+        'ready': handle_ready,
         'filesystem_move': handle_filesystem_moved,
         'filesystem_restore': handle_filesystem_restored,
         'chain_execution': handle_chain_execution,
         'get_log': handle_get_log,
+        'heartbeat': handle_heartbeat,
     }
 
+    # answers which do not change anything the scheduler is waiting for
+    silent_methods = ('heartbeat', )
+
     if status.payload['method'] in function_handle_table:
         function_handle_table[status.payload['method']](status)
 
-        # notify the scheduler that the status has changed
-        FSIM_CURRENT_SCHEDULER.notify()
+        if status.payload['method'] not in silent_methods:
+            # notify the scheduler and a running shutdown that the status has
+            # changed
+            FSIM_CURRENT_SCHEDULER.notify()
+            SHUTDOWN.notify()
     else:
         LOGGER.warning(
             'Client send answer from unknown function %s.',
@@ -107,9 +138,12 @@ def handle_filesystem_restored(status):
         return
 
     if status.is_ok():
-        file_.hash_value = ""
-        file_.error_code = ""
-        file_.save()
+        LIVE_STATE.update(
+            FilesystemModel,
+            file_.id,
+            hash_value="",
+            error_code="",
+        )
 
         LOGGER.info(
             "Restored filesystemsystem %s.",
@@ -121,8 +155,11 @@ def handle_filesystem_restored(status):
             'fid': str(file_.id),
         })
     else:
-        file_.error_code = status.payload['result']
-        file_.save()
+        LIVE_STATE.update(
+            FilesystemModel,
+            file_.id,
+            error_code=status.payload['result'],
+        )
 
         notify({
             'filesystem_status': 'error',
@@ -154,14 +191,17 @@ def handle_filesystem_moved(status):
         return
 
     if status.is_ok():
-        file_.hash_value = status.payload['result']
-        file_.error_code = ""
-        file_.save()
+        LIVE_STATE.update(
+            FilesystemModel,
+            file_.id,
+            hash_value=status.payload['result'],
+            error_code="",
+        )
 
         LOGGER.info(
             "Saved filesystem %s with hash value %s.",
             file_.name,
-            file_.hash_value,
+            status.payload['result'],
         )
 
         notify({
@@ -170,9 +210,12 @@ def handle_filesystem_moved(status):
         })
 
     else:
-        file_.error_code = status.payload['result']
-        file_.hash_value = ""
-        file_.save()
+        LIVE_STATE.update(
+            FilesystemModel,
+            file_.id,
+            hash_value="",
+            error_code=status.payload['result'],
+        )
 
         LOGGER.error(
             "Error while moving filesystem: %s",
@@ -231,9 +274,18 @@ def handle_execute(status):
         )
 
     # update status
-    program_status.code = status.payload['result']
-    program_status.running = False
-    program_status.save()
+    LIVE_STATE.update(
+        ProgramStatusModel,
+        program_status.pk,
+        code=status.payload['result'],
+        running=False,
+    )
+
+    # add the run to the history of the program
+    run = ProgramRunModel.finish(status.uuid, status.payload['result'], now())
+
+    if run is not None and settings.FSIM_START_TIME_AUTO_TUNE:
+        prog_tune_start_time(program)
 
     # tell webinterface that the program has ended
     notify({
@@ -243,6 +295,54 @@ def handle_execute(status):
     })
 
 
+def handle_ready(status):
+    """
+    This function handles incoming messages for the method `ready`. The slave
+    sends it as soon as a probe of a running program (see
+    `ProgramModel.ready_probe`) succeeds. The corresponding
+    `ProgramStatusModel` will be marked as ready (so that the scheduler does
+    not wait for the `start_time`) and the user will be notified.
+
+    Parameters
+    ----------
+        status: Status
+            The `Status` object that was send by the slave
+    """
+    LOGGER.info("Handle program ready %s", dict(status))
+
+    try:
+        program_status = ProgramStatusModel.objects.select_related(
+            'program').get(command_uuid=status.uuid)
+        program = program_status.program
+    except ProgramStatusModel.DoesNotExist:
+        LOGGER.warning(
+            "A program is ready with id %s, but is not in the database.",
+            status.uuid,
+        )
+        return
+
+    if not status.is_ok():
+        LOGGER.warning(
+            "The ready probe of program %s failed: %s",
+            program.name,
+            status.payload['result'],
+        )
+        return
+
+    if (not LIVE_STATE.get(program_status, 'running')
+            or LIVE_STATE.get(program_status, 'ready')):
+        return
+
+    LIVE_STATE.update(ProgramStatusModel, program_status.pk, ready=True)
+    ProgramRunModel.mark_ready(status.uuid, now())
+
+    # tell webinterface that the program is ready
+    notify({
+        'program_status': 'ready',
+        'pid': str(program.id),
+    })
+
+
 def handle_online(status):
     """
     This function handles incoming responses for the method `online`.
@@ -256,33 +356,47 @@ def handle_online(status):
     """
     LOGGER.info("Handle slave online %s", dict(status))
 
-    try:
-        slave = SlaveModel.objects.get(command_uuid=status.uuid)
-    except SlaveModel.DoesNotExist:
+    slave = SLAVE_INDEX.answer_online(status.uuid)
+
+    if slave is None:
+        # the request was send before the index existed
+        slave = SlaveModel.objects.filter(
+            command_uuid=status.uuid).values_list('id', 'name').first()
+
+    if slave is None:
         LOGGER.warning(
             "Slaves online request with uuid %s, was not asked for it.",
             status.uuid,
         )
         return
 
+    (slave_id, slave_name) = slave
+
     if status.is_ok():
-        slave.online = True
-        slave.save()
+        if not SlaveModel.objects.filter(id=slave_id).update(
+                online=True,
+                command_uuid=status.uuid,
+        ):
+            LOGGER.warning(
+                "Slave %s answered the online request, but is not in the database.",
+                slave_name,
+            )
+            return
 
         # tell webinterface that the client has been connected
-        notify({'slave_status': 'connected', 'sid': str(slave.id)})
+        notify({'slave_status': 'connected', 'sid': str(slave_id)})
         LOGGER.info(
             'Slave %s has connected to the master',
-            slave.name,
+            slave_name,
         )
     else:
         # notify the webinterface
         notify_err('An error occurred while connecting to client {}!'.format(
-            slave.name))
+            slave_name))
 
         LOGGER.error(
             'Exception occurred in client %s (online-request): %s %s',
-            slave.name,
+            slave_name,
             os.linesep,
             status.payload['result'],
         )
@@ -336,6 +450,77 @@ def handle_get_log(status):
         )
 
 
+def handle_heartbeat(status):
+    """
+    This function handles incoming responses for the method `heartbeat`.
+    Every answer (even `Status.err` from slaves which do not know the method)
+    updates the round trip time of the slave.
+
+    Parameters
+    ----------
+        status: Status
+            The `Status` object that was send by the slave
+    """
+    HEARTBEATS.pong(status.uuid)
+
+
+def disconnect_slaves(slave_ids):
+    """
+    Sets all given `SlaveModel`s offline with set based queries in one
+    transaction. All programs of the slaves are stopped and all commands which
+    are not answered yet are failed. The user will be notified with one
+    message and the scheduler will be notified once.
+
+    Parameters
+    ----------
+        slave_ids: list of int
+            The identifiers of the slaves which have disconnected.
+
+    Returns
+    -------
+        list of int:
+            The identifiers of the slaves which exist in the database.
+    """
+    with transaction.atomic():
+        slave_ids = list(
+            SlaveModel.objects.filter(id__in=slave_ids).values_list(
+                'id',
+                flat=True,
+            ))
+
+        if not slave_ids:
+            return slave_ids
+
+        SlaveModel.objects.filter(id__in=slave_ids).update(
+            online=False,
+            command_uuid=None,
+        )
+
+        # if a slave disconnects all programs stop
+        ProgramStatusModel.objects.filter(
+            program__slave__in=slave_ids).delete()
+        ProgramRunModel.abort(slave_ids, now())
+
+    # the slaves can not answer anymore
+    SLAVE_INDEX.cancel_online(slave_ids)
+    COMMANDS.abort_slaves(slave_ids)
+
+    # tell the web interface that the clients have disconnected
+    if len(slave_ids) == 1:
+        notify({'slave_status': 'disconnected', 'sid': str(slave_ids[0])})
+    else:
+        notify({
+            'slave_status': 'disconnected',
+            'sids': [str(slave_id) for slave_id in slave_ids],
+        })
+
+    # notify the scheduler and a running shutdown that status has change
+    FSIM_CURRENT_SCHEDULER.notify()
+    SHUTDOWN.notify()
+
+    return slave_ids
+
+
 @channel_session
 def ws_rpc_connect(message):
     """
@@ -344,6 +529,8 @@ def ws_rpc_connect(message):
     the client is known then a unique group will be created. The only member of
     this group is the sender. The naming scheme for this group is
     `client_<id>`. Now the sender has to response to the `online` method.
+    Known clients are looked up in the `SLAVE_INDEX`, so a connect does not
+    access the database in the common case.
 
     Parameters
     ----------
@@ -353,40 +540,49 @@ def ws_rpc_connect(message):
     """
     ip_address, port = message.get('client')
     message.channel_session['ip_address'] = ip_address
-    try:
-        slave = SlaveModel.objects.get(ip_address=ip_address)
 
-        # Accept the connection
-        message.reply_channel.send({"accept": True})
+    slave = SLAVE_INDEX.lookup(ip_address)
 
-        LOGGER.info(
-            "client connected with ip %s on port %s",
-            ip_address,
-            port,
-        )
+    if slave is None:
+        LOGGER.error("Rejecting unknown client with ip %s!", ip_address)
+        message.reply_channel.send({"accept": False})
+        return
 
-        # Add to the command group
-        Group('client_{}'.format(slave.id)).add(message.reply_channel)
-        LOGGER.debug('Added client to command group client_%s', slave.id)
+    (slave_id, slave_name) = slave
 
-        cmd = Command(method='online')
+    # Accept the connection
+    message.reply_channel.send({"accept": True})
 
-        # send/save online request
-        slave.command_uuid = cmd.uuid
-        slave.save()
-        Group('client_{}'.format(slave.id)).send({'text': cmd.to_json()})
-        LOGGER.info("send online request to %s", slave.name)
+    LOGGER.info(
+        "client connected with ip %s on port %s",
+        ip_address,
+        port,
+    )
 
-    except SlaveModel.DoesNotExist:
-        LOGGER.error("Rejecting unknown client with ip %s!", ip_address)
-        message.reply_channel.send({"accept": False})
+    # the connection is identified by the slave until it disconnects
+    message.channel_session['slave_id'] = slave_id
+    replaced = HEARTBEATS.register(slave_id, message.reply_channel.name)
+
+    # Add to the command group (without an older connection of the slave)
+    if replaced is not None:
+        Group('client_{}'.format(slave_id)).discard(replaced)
+    Group('client_{}'.format(slave_id)).add(message.reply_channel)
+    LOGGER.debug('Added client to command group client_%s', slave_id)
 
+    # send online request (the slave is saved if it answers)
+    cmd = Command(method='online')
+    SLAVE_INDEX.request_online(cmd.uuid, slave)
+    COMMANDS.send(cmd, slave_id)
+    LOGGER.info("send online request to %s", slave_name)
 
+
+@channel_session
 def ws_rpc_receive(message):
     """
     Handles incoming requests on the websocket `/commands`. The incoming
     message will be parsed to a `Status` object. The appropriate handler is
-    called with `select_method`.
+    called with `select_method`. Every message counts as a sign of life of the
+    sender.
 
     Parameters
     ----------
@@ -394,6 +590,8 @@ def ws_rpc_receive(message):
             Contains a message which needs to be JSON encoded string.
 
     """
+    HEARTBEATS.seen(message.channel_session.get('slave_id'))
+
     try:
         try:
             status = Status.from_json(message.content['text'])
@@ -420,6 +618,8 @@ def ws_rpc_disconnect(message):
     be successful if the sender is a known client. If the sender is a known
     client then the `SlaveModel` will be updated and the sender will be removed
     from the group. The user will be notified if the disconnect was successful.
+    Disconnects of connections which are already replaced by a newer
+    connection (or declared dead by the `HEARTBEATS`) are ignored.
 
     Parameters
     ----------
@@ -427,38 +627,37 @@ def ws_rpc_disconnect(message):
             The last message which is send by the sender.
 
     """
+    ip_address = message.channel_session.get('ip_address')
+    slave_id = message.channel_session.get('slave_id')
 
-    try:
-        slave = SlaveModel.objects.get(
-            ip_address=message.channel_session['ip_address'])
-
-        Group('client_{}'.format(slave.id)).discard(message.reply_channel)
-
-        slave.online = False
-        slave.command_uuid = None
-
-        slave.save()
+    # the session is not needed after the connection is closed
+    message.channel_session.delete()
 
-        # if a slave disconnects all programs stop
-        for program in ProgramModel.objects.filter(slave=slave):
-            if ProgramStatusModel.objects.filter(program=program).exists():
-                ProgramStatusModel.objects.get(program=program).delete()
+    if slave_id is None:
+        LOGGER.error(
+            "Disconnected client is not in database. (with IP %s)",
+            ip_address,
+        )
+        return
 
-        # tell the web interface that the client has disconnected
-        notify({'slave_status': 'disconnected', 'sid': str(slave.id)})
+    Group('client_{}'.format(slave_id)).discard(message.reply_channel)
 
-        # notify the scheduler that status has change
-        FSIM_CURRENT_SCHEDULER.notify()
+    if not HEARTBEATS.unregister(slave_id, message.reply_channel.name):
+        LOGGER.info(
+            "Stale connection of client with ip %s closed.",
+            ip_address,
+        )
+        return
 
+    if disconnect_slaves([slave_id]):
         LOGGER.info(
             "Client with ip %s disconnected from /commands!",
-            message.channel_session['ip_address'],
+            ip_address,
         )
-
-    except SlaveModel.DoesNotExist:
+    else:
         LOGGER.error(
             "Disconnected client is not in database. (with IP %s)",
-            message.channel_session['ip_address'],
+            ip_address,
         )
 
 
@@ -480,14 +679,15 @@ def ws_logs_connect(message):
 def ws_logs_receive(message):
     """
     Handles incoming requests on the websocket `/log`. The incoming messages
-    will be forwarded to the `notification` group.
+    will be forwarded to the `notification` group. The amount of forwarded
+    logs is limited per program (see `LogIngest`).
 
     Parameters
     ----------
         message: channels.message.Message
             A message which contains log content.
     """
-    Group('notifications').send({'text': message.content['text']})
+    LOGS.receive(message.content['text'])
     message.reply_channel.send({'text': 'ack'})
 
 
@@ -516,4 +716,5 @@ def ws_notifications_disconnect(message):
             The last message which is send by the sender.
     """
     Group('notifications').discard(message.reply_channel)
+    LOGS.forget(message.reply_channel.name)
 
@@ -3,18 +3,22 @@ This module contains functions which modify a Model.
 """
 
 import logging
+import math
 import os
 from shlex import split
 from uuid import uuid4
 
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
 from django.utils.timezone import now
 
 from wakeonlan import send_magic_packet
 from utils import Command
-from server.utils import notify, notify_slave
+from server.utils import notify
+from server.database import chunked
 
-from utils.typecheck import ensure_type
+from utils.typecheck import ensure_type, ensure_type_array
 
 from .models import (
     FILE_BACKUP_ENDING,
@@ -25,12 +29,16 @@ from .models import (
     Filesystem as FilesystemModel,
     Program as ProgramModel,
     ProgramStatus as ProgramStatusModel,
+    ProgramRun as ProgramRunModel,
 )
 
+from server.errors import FsimError
+
 from .errors import (
     SlaveOfflineError,
     FilesystemMovedError,
     FilesystemNotMovedError,
+    FilesystemDestinationError,
     FilesystemDeleteError,
     ProgramError,
     ProgramRunningError,
@@ -38,6 +46,9 @@ from .errors import (
     LogNotExistError,
 )
 
+from .tracker import COMMANDS
+from .livestate import LIVE_STATE
+
 LOGGER = logging.getLogger("fsim.controller")
 
 
@@ -50,14 +61,17 @@ def timer_timeout_program(identifier):
         identifier: name or int
             An identifier which identifies a `ProgramModel`.
     """
-    ProgramStatusModel.objects.filter(program=identifier).update(
-        timeouted=True)
+    LIVE_STATE.update(ProgramStatusModel, identifier, timeouted=True)
+    ProgramRunModel.objects.filter(
+        program=identifier,
+        end=None,
+    ).update(timeouted=True)
     FSIM_CURRENT_SCHEDULER.notify()
 
 
-def fs_move(fs):
+def fs_move_command(fs):
     """
-    This functions sends a command to slave to move the given filesystem. If
+    This functions creates the command which moves the given filesystem. If
     any filesystem is at the same place it will be restored and the then `fs`
     will be moved. If the slave is offline an error will be returned.
 
@@ -72,6 +86,11 @@ def fs_move(fs):
         FilesystemMovedError
         TypeError:
             If `fs` is not an `FilesystemModel`
+
+    Returns
+    -------
+        Command:
+            The command which has to be send to the slave of `fs`.
     """
     ensure_type("fs", fs, FilesystemModel)
     slave = fs.slave
@@ -128,10 +147,10 @@ def fs_move(fs):
             )
 
             filesystem_replace.command_uuid = first.uuid
-            filesystem_replace.save()
+            filesystem_replace.save(update_fields=['command_uuid'])
 
             fs.command_uuid = second.uuid
-            fs.save()
+            fs.save(update_fields=['command_uuid'])
 
         else:
             cmd = Command(
@@ -144,10 +163,9 @@ def fs_move(fs):
             )
 
             fs.command_uuid = cmd.uuid
-            fs.save()
+            fs.save(update_fields=['command_uuid'])
 
-        # send command to the client
-        notify_slave(cmd, slave.id)
+        return cmd
     else:
         raise SlaveOfflineError(
             str(fs.name),
@@ -157,11 +175,33 @@ def fs_move(fs):
         )
 
 
-def fs_restore(fs):
+def fs_move(fs):
     """
-    This functions restores a given `fs` by sending a command to the slave to
-    restore the original state.  If the slave is offline an error will be
-    returned.
+    This functions sends a command to slave to move the given filesystem (see
+    `fs_move_command`).
+
+    Parameters
+    ----------
+        fs: FilesystemModel
+            A valid `FilesystemModel`.
+
+    Raises
+    ------
+        SlaveOfflineError
+        FilesystemMovedError
+        TypeError:
+            If `fs` is not an `FilesystemModel`
+    """
+    # send command to the client
+    COMMANDS.send(fs_move_command(fs), fs.slave_id)
+
+
+def fs_restore_command(fs):
+    """
+    This functions creates the command which restores the original state of
+    a given `fs`. If the slave is offline an error will be returned. The error
+    code of an earlier command is cleared, so a new error code is always the
+    answer to this command.
 
     Parameters
     ----------
@@ -174,6 +214,11 @@ def fs_restore(fs):
         FilesystemNotMovedError
         TypeError:
             If `fs` is not an `FilesystemModel`
+
+    Returns
+    -------
+        Command:
+            The command which has to be send to the slave of `fs`.
     """
     ensure_type("fs", fs, FilesystemModel)
     slave = fs.slave
@@ -195,11 +240,11 @@ def fs_restore(fs):
             hash_value=fs.hash_value,
         )
 
-        # send command to the client
-        notify_slave(cmd, slave.id)
-
         fs.command_uuid = cmd.uuid
-        fs.save()
+        fs.error_code = ''
+        fs.save(update_fields=['command_uuid', 'error_code'])
+
+        return cmd
     else:
         raise SlaveOfflineError(
             str(fs.name),
@@ -209,6 +254,115 @@ def fs_restore(fs):
         )
 
 
+def fs_restore(fs):
+    """
+    This functions restores a given `fs` by sending a command to the slave to
+    restore the original state (see `fs_restore_command`).
+
+    Parameters
+    ----------
+        fs: FilesystemModel
+            A valid `FilesystemModel`.
+
+    Raises
+    ------
+        SlaveOfflineError
+        FilesystemNotMovedError
+        TypeError:
+            If `fs` is not an `FilesystemModel`
+    """
+    # send command to the client
+    COMMANDS.send(fs_restore_command(fs), fs.slave_id)
+
+
+def fs_destination(fs):
+    """
+    Returns the path which the given filesystem occupies on its slave when
+    it is moved.
+
+    Parameters
+    ----------
+        fs: FilesystemModel
+            A valid `FilesystemModel`.
+
+    Returns
+    -------
+        str:
+            The destination of a file or the path of `fs` inside of the
+            destination directory.
+    """
+    if fs.destination_type == 'dir':
+        return os.path.join(fs.destination_path,
+                            os.path.basename(fs.source_path))
+    return fs.destination_path
+
+
+def fs_batch(filesystems, create_command):
+    """
+    Creates the commands for all `filesystems` with `create_command` (e.g.
+    `fs_move_command`) and sends every slave all its commands at once (in one
+    `chain_execution`). Only the first of the moved filesystems with the same
+    destination (see `fs_destination`) gets a command, because the commands
+    of the others would restore or replace it in the same chain.
+
+    Parameters
+    ----------
+        filesystems: list of FilesystemModel
+            Valid `FilesystemModel`s.
+        create_command: function
+            Creates the `Command` for one `FilesystemModel`.
+
+    Returns
+    -------
+        dict:
+            Maps the id of every `FilesystemModel` to the `FsimError` which
+            was raised for it (or None).
+    """
+    errors = {}
+    commands = {}
+    # (slave id, destination) -> the filesystem which is moved there
+    destinations = {}
+
+    for filesystem in filesystems:
+        destination = (filesystem.slave_id, fs_destination(filesystem))
+        if not filesystem.is_moved and destination in destinations:
+            errors[filesystem.id] = FilesystemDestinationError(
+                str(filesystem.name),
+                str(filesystem.slave.name),
+                str(destinations[destination].name),
+            )
+            continue
+
+        try:
+            command = create_command(filesystem)
+        except FsimError as err:
+            errors[filesystem.id] = err
+            continue
+
+        errors[filesystem.id] = None
+        commands.setdefault(filesystem.slave_id, []).append(command)
+        if not filesystem.is_moved:
+            destinations[destination] = filesystem
+
+    for (slave_id, batch) in commands.items():
+        if len(batch) == 1:
+            command = batch[0]
+        else:
+            chained = []
+            for command in batch:
+                if command.method == 'chain_execution':
+                    chained.extend(command.arguments['commands'])
+                else:
+                    chained.append(dict(command))
+
+            command = Command(method="chain_execution", commands=chained)
+
+        # send commands to the client
+        COMMANDS.send(command, slave_id)
+
+    return errors
+
+
 def fs_delete(fs):
     """
     This functions deletes a `fs` only if `fs` is not moved.
@@ -256,6 +410,11 @@ def prog_start(prog):
             raise ProgramRunningError(str(prog.name), str(prog.slave.name))
         uuid = uuid4().hex
 
+        arguments = {}
+        if prog.ready_probe is not None:
+            # the slave reports the program as ready if a probe succeeds
+            arguments['ready'] = prog.ready_probe
+
         cmd = Command(
             uuid=uuid,  # for the command
             pid=prog.id,
@@ -263,6 +422,7 @@ def prog_start(prog):
             method="execute",
             path=prog.path,
             arguments=[prog.arguments],
+            **arguments
         )
 
         LOGGER.info(
@@ -272,7 +432,7 @@ def prog_start(prog):
         )
 
         # send command to the client
-        notify_slave(cmd, prog.slave.id)
+        COMMANDS.send(cmd, prog.slave.id)
 
         # tell webinterface that the program has started
         notify({
@@ -280,9 +440,22 @@ def prog_start(prog):
             'pid': prog.id,
         })
 
-        # create status entry
-        ProgramStatusModel(
-            program=prog, command_uuid=cmd.uuid, start_time=now()).save()
+        # create status entry (replaces the state of the last run)
+        start_time = now()
+        with LIVE_STATE.replacing(ProgramStatusModel, [prog.id]):
+            ProgramStatusModel(
+                program=prog,
+                command_uuid=cmd.uuid,
+                start_time=start_time,
+            ).save()
+
+        # append the run to the history of the program
+        ProgramRunModel.objects.create(
+            program=prog,
+            slave=prog.slave,
+            command_uuid=cmd.uuid,
+            start=start_time,
+        )
 
         if prog.start_time > 0:
             LOGGER.debug(
@@ -338,7 +511,7 @@ def prog_stop(prog):
             prog.slave.name,
         )
 
-        notify_slave(
+        COMMANDS.send(
             Command(
                 method="execute",
                 uuid=prog.programstatus.command_uuid,
@@ -354,6 +527,82 @@ def prog_stop(prog):
         )
 
 
+def prog_suggest_start_time(prog):
+    """
+    Suggests a tighter `start_time` for `prog` from the readiness of its
+    latest runs (the slowest readiness plus a safety margin). Only programs
+    which wait a specified amount of seconds (`start_time` > 0) are tuned.
+
+    Parameters
+    ----------
+        prog: ProgramModel
+            A valid `ProgramModel`.
+
+    Returns
+    -------
+        int or None:
+            The suggested `start_time` or None if there are not enough runs
+            or the current `start_time` is not greater than the suggestion.
+
+    Raises
+    ------
+        TypeError:
+            If `prog` is not an `ProgramModel`
+    """
+    ensure_type("prog", prog, ProgramModel)
+
+    if prog.start_time <= 0:
+        return None
+
+    samples = prog.readiness_samples(
+        settings.FSIM_START_TIME_SAMPLES)
+
+    if len(samples) < settings.FSIM_START_TIME_MIN_SAMPLES:
+        return None
+
+    margin = settings.FSIM_START_TIME_MARGIN
+    suggestion = max(1, int(math.ceil(max(samples) * (1 + margin))))
+
+    if suggestion >= prog.start_time:
+        return None
+    return suggestion
+
+
+def prog_tune_start_time(prog):
+    """
+    Applies the suggested `start_time` (see `prog_suggest_start_time`) to
+    `prog`.
+
+    Parameters
+    ----------
+        prog: ProgramModel
+            A valid `ProgramModel`.
+
+    Returns
+    -------
+        int or None:
+            The new `start_time` or None if it was not changed.
+
+    Raises
+    ------
+        TypeError:
+            If `prog` is not an `ProgramModel`
+    """
+    suggestion = prog_suggest_start_time(prog)
+
+    if suggestion is not None:
+        LOGGER.info(
+            "Changing start time of program %s from %d to %d seconds",
+            prog.name,
+            prog.start_time,
+            suggestion,
+        )
+        prog.start_time = suggestion
+        prog.save(update_fields=['start_time'])
+
+    return suggestion
+
+
 def slave_shutdown(slave):
     """
     This functions shutsdown a `slave` by a command to the slave.
@@ -369,7 +618,7 @@ def slave_shutdown(slave):
             If `slave` is not an `SlaveModel`
     """
     if slave.is_online:
-        notify_slave(Command(method="shutdown"), slave.id)
+        COMMANDS.send(Command(method="shutdown"), slave.id)
         notify({"message": "Send shutdown Command to {}".format(slave.name)})
     else:
         raise SlaveOfflineError('', '', 'shutdown', slave.name)
@@ -427,7 +676,7 @@ def prog_log_get(program):
     if not (program.is_executed or program.is_running):
         raise LogNotExistError(program.id)
 
-    notify_slave(
+    COMMANDS.send(
         Command(
             method="get_log",
             target_uuid=program.programstatus.command_uuid,
@@ -468,7 +717,7 @@ def prog_log_enable(program):
     if not (program.is_executed or program.is_running):
         raise LogNotExistError(program.id)
 
-    notify_slave(
+    COMMANDS.send(
         Command(
             method="enable_logging",
             target_uuid=program.programstatus.command_uuid,
@@ -504,7 +753,7 @@ def prog_log_disable(program):
     if not program.slave.is_online:
         raise SlaveOfflineError('', '', 'log_disable', program.slave.name)
 
-    notify_slave(
+    COMMANDS.send(
         Command(
             method="disable_logging",
             target_uuid=program.programstatus.command_uuid,
@@ -513,6 +762,118 @@ def prog_log_disable(program):
     )
 
 
+def copy_names(names):
+    """
+    Reserves a free name for the copy of every name in `names`. A copy has
+    the same name but with an suffix '_copy'. If the name with the suffix
+    already exists (or is reserved for another copy), then a number is
+    appended to the name.
+
+    The existing names are read with one query (per 400 names).
+
+    Parameters
+    ----------
+        names: list of str
+            The names of the copied `ScriptModel`s.
+
+    Returns
+    -------
+        list of str:
+            The names of the copies (in the order of `names`).
+    """
+    taken = set()
+
+    # SQLite limits the depth of an expression tree to 1000
+    for start in range(0, len(names), 400):
+        query = Q()
+        for name in set(names[start:start + 400]):
+            query |= Q(name__startswith=name + '_copy')
+
+        taken.update(
+            ScriptModel.objects.filter(query).values_list('name', flat=True))
+
+    copies = []
+    for name in names:
+        copy = name + '_copy'
+        i = 0
+
+        while copy in taken:
+            i = i + 1
+            copy = name + '_copy_' + str(i)
+
+        taken.add(copy)
+        copies.append(copy)
+
+    return copies
+
+
+@transaction.atomic
+def script_deep_copy_many(scripts):
+    """
+    This function creates a copy of every `ScriptModel` in `scripts` with all
+    `ScriptGraphFiles` and `ScriptGraphPrograms` (see `copy_names` for the
+    names of the copies). The amount of queries does not depend on the amount
+    of graph entries.
+
+    Parameters
+    ----------
+        scripts: list of ScriptModel
+            Valid `ScriptModel`s.
+
+    Returns
+    -------
+        list of ScriptModel:
+            The copies (in the order of `scripts`).
+
+    Raises
+    ------
+        TypeError:
+            If `scripts` is not a list of `ScriptModel`s.
+    """
+    ensure_type("scripts", scripts, list)
+    ensure_type_array("scripts", scripts, ScriptModel)
+
+    copies = [
+        ScriptModel(name=name)
+        for name in copy_names([script.name for script in scripts])
+    ]
+    ScriptModel.objects.bulk_create(copies)
+
+    # SQLite does not return the primary keys of a bulk insert
+    ids = {}
+    for chunk in chunked([copy.name for copy in copies]):
+        ids.update(
+            ScriptModel.objects.filter(name__in=chunk).values_list(
+                'name', 'id'))
+
+    for copy in copies:
+        copy.id = ids[copy.name]
+
+    # a script which is listed twice is copied twice
+    copy_ids = {}
+    for (script, copy) in zip(scripts, copies):
+        copy_ids.setdefault(script.id, []).append(copy.id)
+    sources = list(copy_ids)
+
+    for (model, field) in [(SGF, 'filesystem_id'), (SGP, 'program_id')]:
+        entries = []
+        for chunk in chunked(sources):
+            entries.extend(
+                model.objects.filter(script_id__in=chunk).order_by(
+                    'id').values_list('script_id', 'index', field))
+
+        model.objects.bulk_create([
+            model(**{
+                'script_id': copy_id,
+                'index': index,
+                field: obj_id,
+            }) for (script_id, index, obj_id) in entries
+            for copy_id in copy_ids[script_id]
+        ])
+
+    return copies
+
+
 def script_deep_copy(script):
     """
     This function creates a copy of a `ScriptModel` with all `ScriptGraphFiles`
@@ -536,29 +897,4 @@ def script_deep_copy(script):
             If `script` is not an `ScriptModel`
     """
     ensure_type("script", script, ScriptModel)
-    i = 0
-    copy = None
-
-    while not copy:
-        if i is 0:
-            name = script.name + '_copy'
-        else:
-            name = script.name + '_copy_' + str(i)
-
-        if ScriptModel.objects.filter(name=name).exists():
-            i = i + 1
-        else:
-            copy = ScriptModel(name=name)
-
-    copy.save()
-    for file_entry in SGF.objects.filter(script_id=script.id):
-        SGF(script=copy,
-            index=file_entry.index,
-            filesystem=file_entry.filesystem).save()
-
-    for program_entry in SGP.objects.filter(script_id=script.id):
-        SGP(script=copy,
-            index=program_entry.index,
-            program=program_entry.program).save()
-
-    return copy
+    return script_deep_copy_many([script])[0]
@@ -75,6 +75,24 @@ class FilesystemNotMovedError(FilesystemError):
         return "Could not restore Filesystem `.*` on client `.*` because it is not moved."
 
 
+class FilesystemDestinationError(FilesystemError):
+    """
+    This class is raised if move command on the `FilesystemModel` failed
+    because another `FilesystemModel` is moved to the same destination at the
+    same time.
+    """
+
+    def __init__(self, name, slave, other):
+        super().__init__(
+            name, slave,
+            "Could not move Filesystem `{}` on client `{}` because Filesystem `{}` is moved to the same destination.".
+            format(name, slave, other))
+
+    @staticmethod
+    def regex_string():
+        return "Could not move Filesystem `.*` on client `.*` because Filesystem `.*` is moved to the same destination."
+
+
 class FilesystemDeleteError(FilesystemError):
     """
     This class is raised if delete command on the `FilesystemModel` failed
@@ -325,3 +343,18 @@ class IdentifierError(FsimError):
     @staticmethod
     def regex_string():
         return "The given type `.*` for `.*` is not compatible. \(given value: `.*`\)"
+
+
+class ShutdownRunningError(FsimError):
+    """
+    This class is raised if a shutdown was requested, but a shutdown is
+    already in progress.
+    """
+
+    def __init__(self):
+        super().__init__(
+            "A shutdown is already in progress and can not be started again.")
+
+    @staticmethod
+    def regex_string():
+        return "A shutdown is already in progress and can not be started again."
@@ -0,0 +1,115 @@
+"""
+This module keeps the serialized exports of the scripts in memory, so that
+unchanged scripts are not built from the database again.
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class ExportCache:
+    """
+    A thread-safe LRU cache for serialized scripts. An export is identified by
+    the id and the version of the `Script` and the requested format, so that
+    a changed `Script` is never served from the cache (outdated exports are
+    evicted as the least recently used ones).
+
+    Parameters
+    ----------
+        capacity: int
+            The maximal amount of exports in the cache.
+    """
+
+    def __init__(self, capacity=None):
+        if capacity is None:
+            capacity = settings.FSIM_SCRIPT_EXPORT_CACHE_SIZE
+
+        self.capacity = capacity
+
+        self.lock = threading.Lock()
+        self.__exports = OrderedDict()
+        self.__counters = {
+            'hits': 0,
+            'misses': 0,
+            'evicted': 0,
+        }
+
+    def clear(self):
+        """
+        Thread-safe function.
+
+        Forgets all exports.
+        """
+        with self.lock:
+            self.__exports.clear()
+            for key in self.__counters:
+                self.__counters[key] = 0
+
+    def get(self, key):
+        """
+        Thread-safe function.
+
+        Returns the export which is stored under `key` and marks it as the
+        most recently used one.
+
+        Parameters
+        ----------
+            key: tuple
+                The id, version and format of the script.
+
+        Returns
+        -------
+            bytes or None:
+                The export or None if it is not in the cache.
+        """
+        with self.lock:
+            content = self.__exports.get(key)
+
+            if content is None:
+                self.__counters['misses'] += 1
+            else:
+                self.__counters['hits'] += 1
+                self.__exports.move_to_end(key)
+
+            return content
+
+    def put(self, key, content):
+        """
+        Thread-safe function.
+
+        Stores an export and evicts the least recently used exports if the
+        cache is full.
+
+        Parameters
+        ----------
+            key: tuple
+                The id, version and format of the script.
+            content: bytes
+                The serialized script.
+        """
+        with self.lock:
+            self.__exports[key] = content
+            self.__exports.move_to_end(key)
+
+            while len(self.__exports) > self.capacity:
+                self.__exports.popitem(last=False)
+                self.__counters['evicted'] += 1
+
+    def metrics(self):
+        """
+        Thread-safe function.
+
+        Returns
+        -------
+            dict:
+                The amount of hits, misses, evicted exports and exports in
+                the cache.
+        """
+        with self.lock:
+            return dict(self.__counters, size=len(self.__exports))
+
+
+# The cache which is used by the whole application.
+SCRIPT_EXPORTS = ExportCache()
@@ -64,9 +64,17 @@ class ProgramForm(BaseModelForm):
         """
         Meta class
         """
-        labels = {'name': 'Display Name', 'path': 'Path to executable'}
+        labels = {
+            'name': 'Display Name',
+            'path': 'Path to executable',
+            'ready_pattern': 'Ready when output matches',
+            'ready_port': 'Ready when port is open',
+        }
         model = ProgramModel
-        fields = ['name', 'path', 'arguments', 'start_time']
+        fields = [
+            'name', 'path', 'arguments', 'start_time', 'ready_pattern',
+            'ready_port'
+        ]
         widgets = {
             'path': Textarea(attrs={'rows': 1}),
             'arguments': Textarea(attrs={'rows': 1}),
@@ -101,7 +109,22 @@ class ProgramForm(BaseModelForm):
             <code>time <  0</code> Wait for the program to stop<br>
             <hr>
             <b>Example</b><br>
-            <code>2</code>"""
+            <code>2</code>""",
+            'ready_pattern':
+            r"""<b>Description</b><br>
+            (Optional) Regular expression. The program is ready as soon as a
+            line of its output matches, even if the start time is not elapsed.
+            <hr>
+            <b>Example</b><br>
+            <code>Listening on port \d+</code>""",
+            'ready_port':
+            r"""<b>Description</b><br>
+            (Optional) TCP port on the client. The program is ready as soon as
+            the port accepts connections, even if the start time is not
+            elapsed.
+            <hr>
+            <b>Example</b><br>
+            <code>8080</code>"""
         }
 
 
@@ -0,0 +1,329 @@
+"""
+This module sends heartbeats to connected slaves and estimates the round trip
+time of their connections.
+"""
+
+import logging
+import threading
+import time
+
+from asgiref.base_layer import BaseChannelLayer
+from channels import Channel, Group
+from django.conf import settings
+from django.db.utils import DatabaseError
+
+from utils import Command
+
+from .safeloop import shared_loop
+
+LOGGER = logging.getLogger("fsim.heartbeat")
+
+
+class SlaveConnection:
+    """
+    The state of the websocket connection of a slave on `/commands`.
+
+    Parameters
+    ----------
+        slave_id: int
+            The identifier of the `SlaveModel`.
+        channel: str
+            The name of the reply channel of the connection.
+    """
+
+    def __init__(self, slave_id, channel):
+        self.slave_id = slave_id
+        self.channel = channel
+        self.last_seen = time.monotonic()
+        self.srtt = None
+        self.rttvar = None
+        self.missed = 0
+        self.pending = {}
+
+    def update_rtt(self, sample):
+        """
+        Updates the smoothed round trip time and its variation with a new
+        `sample` (like the TCP retransmission timer in RFC 6298).
+
+        Parameters
+        ----------
+            sample: float
+                The measured round trip time in seconds.
+        """
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - sample)
+            self.srtt = 0.875 * self.srtt + 0.125 * sample
+
+    def to_dict(self, now):
+        """
+        Returns
+        -------
+            dict:
+                The connection statistics of this slave.
+        """
+        return {
+            'last_seen': now - self.last_seen,
+            'rtt': self.srtt,
+            'jitter': self.rttvar,
+            'missed': self.missed,
+        }
+
+
+class HeartbeatMonitor:
+    """
+    A thread-safe monitor which sends a `heartbeat` command to every connected
+    slave. Every message of a slave counts as a sign of life. If a slave does
+    not send anything within `timeout` seconds it is declared offline, even if
+    the websocket is not closed (e.g. a half-open TCP connection).
+
+    Parameters
+    ----------
+        interval: number
+            Seconds between two heartbeats.
+        timeout: number
+            Seconds without any message after which a slave is offline.
+    """
+
+    def __init__(self, interval=None, timeout=None):
+        if interval is None:
+            interval = settings.FSIM_HEARTBEAT_INTERVAL
+        if timeout is None:
+            timeout = settings.FSIM_HEARTBEAT_TIMEOUT
+
+        self.interval = interval
+        self.timeout = timeout
+
+        self.lock = threading.Lock()
+        self.__slaves = {}
+        self.__ticking = False
+
+    def clear(self):
+        """
+        Thread-safe function.
+
+        Forgets all connections.
+        """
+        with self.lock:
+            self.__slaves.clear()
+
+    def register(self, slave_id, channel):
+        """
+        Thread-safe function.
+
+        Starts monitoring the connection of a slave. An older connection of
+        the same slave is replaced.
+
+        Parameters
+        ----------
+            slave_id: int
+                The identifier of the `SlaveModel`.
+            channel: str
+                The name of the reply channel of the connection.
+
+        Returns
+        -------
+            str or None:
+                The name of the reply channel of the replaced connection.
+        """
+        with self.lock:
+            replaced = self.__slaves.get(slave_id)
+            self.__slaves[slave_id] = SlaveConnection(slave_id, channel)
+            start = not self.__ticking
+            self.__ticking = True
+
+        if start:
+            shared_loop().spawn(self.interval, self.__periodic)
+
+        if replaced is not None and replaced.channel != channel:
+            return replaced.channel
+        return None
+
+    def unregister(self, slave_id, channel=None):
+        """
+        Thread-safe function.
+
+        Stops monitoring the connection of a slave. If `channel` is given then
+        only this connection is removed.
+
+        Parameters
+        ----------
+            slave_id: int
+                The identifier of the `SlaveModel`.
+            channel: str
+                The name of the reply channel of the connection.
+
+        Returns
+        -------
+            bool:
+                If the connection was the current connection of the slave.
+        """
+        with self.lock:
+            connection = self.__slaves.get(slave_id)
+            if connection is not None and channel in (None,
+                                                      connection.channel):
+                del self.__slaves[slave_id]
+                return True
+        return False
+
+    def seen(self, slave_id):
+        """
+        Thread-safe function.
+
+        Marks the slave as alive, because a message has arrived.
+
+        Parameters
+        ----------
+            slave_id: int
+                The identifier of the `SlaveModel`.
+        """
+        with self.lock:
+            connection = self.__slaves.get(slave_id)
+            if connection is not None:
+                connection.last_seen = time.monotonic()
+
+    def pong(self, uuid):
+        """
+        Thread-safe function.
+
+        Handles the answer of a heartbeat and updates the round trip time.
+
+        Parameters
+        ----------
+            uuid: str
+                The uuid of the heartbeat `Command`.
+        """
+        now = time.monotonic()
+
+        with self.lock:
+            for connection in self.__slaves.values():
+                sent_at = connection.pending.pop(uuid, None)
+                if sent_at is not None:
+                    connection.update_rtt(now - sent_at)
+                    connection.last_seen = now
+                    connection.missed = 0
+                    return
+
+        LOGGER.debug("Received an unknown heartbeat %s.", uuid)
+
+    def statistics(self, slave_id):
+        """
+        Thread-safe function.
+
+        Parameters
+        ----------
+            slave_id: int
+                The identifier of the `SlaveModel`.
+
+        Returns
+        -------
+            dict or None:
+                The connection statistics or None if the slave is not
+                connected.
+        """
+        with self.lock:
+            connection = self.__slaves.get(slave_id)
+            if connection is None:
+                return None
+            return connection.to_dict(time.monotonic())
+
+    def tick(self, now=None):
+        """
+        Thread-safe function.
+
+        Declares every slave offline which did not send a message within the
+        timeout and sends a heartbeat to all other slaves.
+
+        Parameters
+        ----------
+            now: float
+                The current (monotonic) time.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        expired = []
+        with self.lock:
+            for connection in list(self.__slaves.values()):
+                if now - connection.last_seen > self.timeout:
+                    del self.__slaves[connection.slave_id]
+                    expired.append(connection)
+                    continue
+
+                # the previous heartbeat is still unanswered
+                if connection.pending:
+                    connection.missed += 1
+
+                # forget heartbeats which will never be answered
+                for (uuid, sent_at) in list(connection.pending.items()):
+                    if now - sent_at > self.timeout:
+                        del connection.pending[uuid]
+
+                cmd = Command(method='heartbeat')
+                try:
+                    Channel(connection.channel).send({'text': cmd.to_json()})
+                    connection.pending[cmd.uuid] = now
+                except BaseChannelLayer.ChannelFull:
+                    LOGGER.warning("Heartbeat for slave %s is not delivered.",
+                                   connection.slave_id)
+
+        if expired:
+            self.expire(expired)
+
+    def expire(self, connections):
+        """
+        Declares the slaves of all `connections` offline (in one batch) and
+        closes the connections.
+
+        Parameters
+        ----------
+            connections: list of SlaveConnection
+                The connections which timed out.
+        """
+        from .consumers import disconnect_slaves
+
+        for connection in connections:
+            LOGGER.warning(
+                "Slave %s did not answer for %s seconds ... declaring it offline.",
+                connection.slave_id,
+                self.timeout,
+            )
+
+            Group('client_{}'.format(connection.slave_id)).discard(
+                connection.channel)
+            try:
+                Channel(connection.channel).send({'close': True})
+            except BaseChannelLayer.ChannelFull:
+                pass
+
+        try:
+            disconnect_slaves(
+                [connection.slave_id for connection in connections])
+        except DatabaseError as err:
+            LOGGER.error(
+                "Could not set slaves offline ... trying again. (cause: %s)",
+                str(err),
+            )
+            with self.lock:
+                for connection in connections:
+                    self.__slaves.setdefault(connection.slave_id, connection)
+
+    def __periodic(self):
+        """
+        Runs `tick` every `interval` seconds as long as slaves are connected.
+        """
+        try:
+            self.tick()
+        finally:
+            with self.lock:
+                self.__ticking = bool(self.__slaves)
+                ticking = self.__ticking
+
+            if ticking:
+                shared_loop().spawn(self.interval, self.__periodic)
+
+
+# The monitor which is used by the whole application.
+HEARTBEATS = HeartbeatMonitor()
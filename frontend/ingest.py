@@ -0,0 +1,327 @@
+"""
+This module limits the logs which are forwarded from slaves (on `/logs`) to
+the web interface (on `/notifications`).
+"""
+
+import logging
+import threading
+import time
+
+from asgiref.base_layer import BaseChannelLayer
+from channels import Channel, Group, channel_layers, DEFAULT_CHANNEL_LAYER
+from django.conf import settings
+
+from utils import Status, FormatError
+
+from .safeloop import shared_loop
+
+LOGGER = logging.getLogger("fsim.ingest")
+
+# seconds to wait at least before a buffered log is forwarded
+MIN_FLUSH_DELAY = 0.05
+
+
+class LogBudget:
+    """
+    A token bucket and a buffer for the log of one program.
+
+    Parameters
+    ----------
+        rate: number
+            Characters per second which are added to the bucket.
+        burst: number
+            The size of the bucket and the buffer.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+        self.chunks = []
+        self.buffered = 0
+        self.scheduled = False
+        self.pending_drop = 0
+
+        self.counters = {
+            'received': 0,
+            'forwarded': 0,
+            'merged': 0,
+            'truncated': 0,
+            'dropped': 0,
+        }
+
+    def refill(self, now):
+        """
+        Adds the tokens which were earned since the last refill.
+        """
+        self.tokens = min(self.burst,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def add(self, log):
+        """
+        Buffers `log`. If the buffer is full the oldest characters are
+        dropped.
+        """
+        self.chunks.append(log)
+        self.buffered += len(log)
+
+        while self.buffered > self.burst:
+            oldest = self.chunks[0]
+            overflow = self.buffered - self.burst
+
+            if len(oldest) <= overflow:
+                self.chunks.pop(0)
+                dropped = len(oldest)
+            else:
+                self.chunks[0] = oldest[overflow:]
+                dropped = overflow
+
+            self.buffered -= dropped
+            self.pending_drop += dropped
+            self.counters['dropped'] += dropped
+
+    def take(self):
+        """
+        Returns the whole buffer as one string if enough tokens are available.
+
+        Returns
+        -------
+            str or None:
+                The merged log or None if the log has to wait.
+        """
+        if not self.chunks or self.tokens < self.buffered:
+            return None
+
+        if len(self.chunks) > 1:
+            self.counters['merged'] += len(self.chunks) - 1
+
+        log = ''.join(self.chunks)
+        if self.pending_drop:
+            log = '\n[{} characters of the log were dropped]\n'.format(
+                self.pending_drop) + log
+            self.pending_drop = 0
+
+        self.tokens -= self.buffered
+        self.counters['forwarded'] += self.buffered
+        self.chunks = []
+        self.buffered = 0
+
+        return log
+
+    def delay(self):
+        """
+        Returns
+        -------
+            float:
+                Seconds until the buffer can be forwarded.
+        """
+        return max(MIN_FLUSH_DELAY, (self.buffered - self.tokens) / self.rate)
+
+
+class LogIngest:
+    """
+    A thread-safe limiter for logs. Every program has its own budget (token
+    bucket), so that one program which writes a lot of logs does not slow down
+    the others. Chunks which can not be forwarded immediately are merged and
+    forwarded later. If the buffer of a program is full, the oldest characters
+    are dropped and the web interface gets a note about it.
+
+    Members of the `notifications` group which can not receive more messages
+    (because the browser is too slow) are downgraded and get no more logs
+    until they connect again.
+
+    Parameters
+    ----------
+        rate: number
+            Characters per second which are forwarded for one program.
+        burst: number
+            Characters which can be forwarded at once for one program.
+        max_chunk: number
+            Characters of one chunk which are kept.
+    """
+
+    def __init__(self, rate=None, burst=None, max_chunk=None):
+        if rate is None:
+            rate = settings.FSIM_LOG_RATE
+        if burst is None:
+            burst = settings.FSIM_LOG_BURST
+        if max_chunk is None:
+            max_chunk = settings.FSIM_LOG_MAX_CHUNK
+
+        self.rate = rate
+        self.burst = burst
+        self.max_chunk = min(max_chunk, burst)
+
+        self.lock = threading.Lock()
+        self.__budgets = {}
+        self.__muted = set()
+
+    def clear(self):
+        """
+        Thread-safe function.
+
+        Forgets all budgets and downgraded members.
+        """
+        with self.lock:
+            self.__budgets.clear()
+            self.__muted.clear()
+
+    def receive(self, text):
+        """
+        Thread-safe function.
+
+        Handles one chunk of a log. Messages which are not a log are forwarded
+        unchanged.
+
+        Parameters
+        ----------
+            text: str
+                The JSON encoded `Status` which was send by the slave.
+        """
+        try:
+            status = Status.from_json(text)
+            pid = status.payload['pid']
+            log = status.payload['log']
+            if not isinstance(log, str):
+                raise TypeError("The log is not a string.")
+        except (ValueError, KeyError, TypeError, FormatError):
+            self.broadcast(text)
+            return
+
+        with self.lock:
+            budget = self.__budgets.get(pid)
+            if budget is None:
+                budget = LogBudget(self.rate, self.burst)
+                self.__budgets[pid] = budget
+
+            budget.refill(time.monotonic())
+            budget.counters['received'] += len(log)
+
+            unchanged = not budget.chunks and len(log) <= self.max_chunk
+
+            if len(log) > self.max_chunk:
+                budget.counters['truncated'] += len(log) - self.max_chunk
+                log = log[-self.max_chunk:]
+
+            budget.add(log)
+            merged = budget.take()
+
+            schedule = budget.chunks and not budget.scheduled
+            if schedule:
+                budget.scheduled = True
+                delay = budget.delay()
+
+        if merged is not None:
+            if unchanged and merged == log:
+                self.broadcast(text)
+            else:
+                self.broadcast(Status.ok({'log': merged, 'pid': pid}).to_json())
+
+        if schedule:
+            shared_loop().spawn(delay, self.flush, pid)
+
+    def flush(self, pid):
+        """
+        Thread-safe function.
+
+        This is callback function which forwards the buffered log of a
+        program.
+
+        Parameters
+        ----------
+            pid: str
+                The identifier of the program.
+        """
+        with self.lock:
+            budget = self.__budgets.get(pid)
+            if budget is None:
+                return
+
+            budget.refill(time.monotonic())
+            merged = budget.take()
+
+            budget.scheduled = bool(budget.chunks)
+            delay = budget.delay()
+
+        if merged is not None:
+            self.broadcast(Status.ok({'log': merged, 'pid': pid}).to_json())
+
+        if budget.scheduled:
+            shared_loop().spawn(delay, self.flush, pid)
+
+    def broadcast(self, text):
+        """
+        Thread-safe function.
+
+        Sends `text` to every member of the `notifications` group which is not
+        downgraded. Members which can not receive more messages are
+        downgraded.
+
+        Parameters
+        ----------
+            text: str
+                The message.
+        """
+        layer = channel_layers[DEFAULT_CHANNEL_LAYER]
+
+        if 'groups' not in layer.extensions:
+            Group('notifications').send({'text': text})
+            return
+
+        with self.lock:
+            muted = set(self.__muted)
+
+        for channel in list(layer.group_channels('notifications')):
+            if channel in muted:
+                continue
+
+            try:
+                Channel(channel).send({'text': text}, immediately=True)
+            except BaseChannelLayer.ChannelFull:
+                LOGGER.warning(
+                    "Web interface %s is too slow ... sending no more logs.",
+                    channel,
+                )
+                with self.lock:
+                    self.__muted.add(channel)
+
+    def forget(self, channel):
+        """
+        Thread-safe function.
+
+        Removes a member of the `notifications` group (e.g. on a disconnect),
+        so that it receives logs after the next connect.
+
+        Parameters
+        ----------
+            channel: str
+                The name of the reply channel.
+        """
+        with self.lock:
+            self.__muted.discard(channel)
+
+    def metrics(self):
+        """
+        Thread-safe function.
+
+        Returns
+        -------
+            dict:
+                The counters for every program and the amount of downgraded
+                members.
+        """
+        with self.lock:
+            return {
+                'programs': {
+                    str(pid): dict(budget.counters, buffered=budget.buffered)
+                    for (pid, budget) in self.__budgets.items()
+                },
+                'downgraded': len(self.__muted),
+            }
+
+
+# The limiter which is used by the whole application.
+LOGS = LogIngest()
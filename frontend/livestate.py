@@ -0,0 +1,255 @@
+"""
+This module keeps the volatile state of the models (e.g. the result of a
+program or a filesystem) in memory and writes it into the database.
+
+The store only batches the writes of the results (program and filesystem
+results, readiness, timeouts and the index of a script). The database stays
+the source of truth for the readers, which flush the store before their
+queries. The `online` flag of a slave, the `command_uuid`s and the
+`is_running` flag of a script are written directly.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.utils import DatabaseError
+
+from .safeloop import shared_loop
+
+LOGGER = logging.getLogger("fsim.livestate")
+
+
+class LiveStateStore:
+    """
+    A thread-safe store for the volatile fields of the models. Every change is
+    kept in memory and written into the database by `LiveStateStore.flush`.
+
+    If `flush_interval` is greater than 0, the changes are collected and
+    written every `flush_interval` seconds in one transaction (write-behind).
+    Multiple changes of the same row are merged into one UPDATE and only one
+    thread writes at a time. Until the changes are written, only
+    `LiveStateStore.get` returns the newest values, so code which reads the
+    volatile fields with queries has to call `LiveStateStore.flush` first.
+
+    Parameters
+    ----------
+        flush_interval: number
+            Seconds between two writes into the database.
+        using: str
+            The alias of the database which receives the changes.
+    """
+
+    def __init__(self, flush_interval=None, using=DEFAULT_DB_ALIAS):
+        if flush_interval is None:
+            flush_interval = settings.FSIM_LIVE_STATE_FLUSH_INTERVAL
+
+        self.flush_interval = flush_interval
+        self.using = using
+
+        self.lock = threading.Lock()
+        # only one thread writes at a time, so that the threads do not wait
+        # for the write lock of the database
+        self.writer = threading.Lock()
+        self.__pending = {}
+        self.__scheduled = False
+        self.__counters = {
+            'updates': 0,
+            'merged': 0,
+            'flushes': 0,
+            'written': 0,
+        }
+
+    def clear(self):
+        """
+        Thread-safe function.
+
+        Forgets all changes which are not written yet.
+        """
+        with self.lock:
+            self.__pending.clear()
+            for key in self.__counters:
+                self.__counters[key] = 0
+
+    def update(self, model, pk, **fields):
+        """
+        Thread-safe function.
+
+        Changes the volatile `fields` of one row.
+
+        Parameters
+        ----------
+            model: Model
+                The class of the model.
+            pk: int
+                The primary key of the row.
+            fields: kwargs
+                The new values of the fields.
+        """
+        with self.lock:
+            self.__counters['updates'] += 1
+
+            pending = self.__pending.get((model, pk))
+            if pending is None:
+                self.__pending[(model, pk)] = dict(fields)
+            else:
+                self.__counters['merged'] += 1
+                pending.update(fields)
+
+            schedule = self.flush_interval > 0 and not self.__scheduled
+            if schedule:
+                self.__scheduled = True
+
+        if self.flush_interval <= 0:
+            self.flush()
+        elif schedule:
+            shared_loop().spawn(self.flush_interval, self.__periodic)
+
+    def get(self, instance, field):
+        """
+        Thread-safe function.
+
+        Returns the current value of a field, even if the change is not
+        written yet.
+
+        Parameters
+        ----------
+            instance: Model
+                A row which was loaded from the database.
+            field: str
+                The name of the field.
+
+        Returns
+        -------
+            any:
+                The value of the field.
+        """
+        with self.lock:
+            pending = self.__pending.get((type(instance), instance.pk))
+            if pending is not None and field in pending:
+                return pending[field]
+
+        return getattr(instance, field)
+
+    def discard(self, model, pks):
+        """
+        Thread-safe function.
+
+        Forgets the changes of the given rows (e.g. because the rows are
+        written or deleted directly).
+
+        Parameters
+        ----------
+            model: Model
+                The class of the model.
+            pks: list of int
+                The primary keys of the rows.
+        """
+        with self.lock:
+            for pk in pks:
+                self.__pending.pop((model, pk), None)
+
+    @contextmanager
+    def replacing(self, model, pks):
+        """
+        Thread-safe function.
+
+        Forgets the changes of the given rows and blocks all writes of the
+        store until the `with` block is left, so that the rows can be written
+        directly (e.g. the `ProgramStatus` of a new run). Without the block a
+        flush which already took the old changes could overwrite the new
+        rows.
+
+        Parameters
+        ----------
+            model: Model
+                The class of the model.
+            pks: list of int
+                The primary keys of the rows.
+        """
+        with self.writer:
+            self.discard(model, pks)
+            yield
+
+    def flush(self):
+        """
+        Thread-safe function.
+
+        Writes all changes into the database (in one transaction). If the
+        database is not available, the changes are kept and written later.
+
+        Returns
+        -------
+            int:
+                The amount of written rows.
+        """
+        # the changes are taken while holding the writer lock, so that older
+        # changes are never written after newer changes
+        with self.writer:
+            with self.lock:
+                pending = self.__pending
+                self.__pending = {}
+
+            if not pending:
+                return 0
+
+            try:
+                with transaction.atomic(using=self.using):
+                    for ((model, pk), fields) in pending.items():
+                        model.objects.using(self.using).filter(
+                            pk=pk).update(**fields)
+            except DatabaseError as err:
+                LOGGER.error(
+                    "Could not write the state of %s rows ... trying again. (cause: %s)",
+                    len(pending),
+                    str(err),
+                )
+
+                with self.lock:
+                    # newer changes win
+                    for (key, fields) in pending.items():
+                        fields.update(self.__pending.get(key, {}))
+                        self.__pending[key] = fields
+
+                    schedule = self.flush_interval > 0 and not self.__scheduled
+                    if schedule:
+                        self.__scheduled = True
+
+                if schedule:
+                    shared_loop().spawn(self.flush_interval, self.__periodic)
+                return 0
+
+        with self.lock:
+            self.__counters['flushes'] += 1
+            self.__counters['written'] += len(pending)
+
+        return len(pending)
+
+    def metrics(self):
+        """
+        Thread-safe function.
+
+        Returns
+        -------
+            dict:
+                The amount of changes, merged changes, flushes, written rows
+                and rows which are not written yet.
+        """
+        with self.lock:
+            return dict(self.__counters, pending=len(self.__pending))
+
+    def __periodic(self):
+        """
+        Writes the changes every `flush_interval` seconds as long as changes
+        are pending.
+        """
+        with self.lock:
+            self.__scheduled = False
+
+        self.flush()
+
+
+# The store which is used by the whole application.
+LIVE_STATE = LiveStateStore()
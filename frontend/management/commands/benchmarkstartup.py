@@ -0,0 +1,122 @@
+"""
+This module contains the 'benchmarkstartup' command
+"""
+
+import os
+import subprocess
+import sys
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from frontend.apps import reset_database
+from frontend.models import (
+    Slave as SlaveModel,
+    Script as ScriptModel,
+    Filesystem as FilesystemModel,
+)
+
+
+class Command(BaseCommand):
+    """
+    generates the 'benchmarkstartup' command
+    """
+    help = 'Measures the startup time and fails if it exceeds the budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1000,
+            help='amount of slaves, filesystems and scripts which are reset',
+        )
+        parser.add_argument(
+            '--boot-runs',
+            type=int,
+            default=3,
+            help='amount of started management commands (0 skips them)',
+        )
+
+    def handle(self, *args, **options):
+        budget = settings.FSIM_STARTUP_BUDGET
+        results = {}
+
+        if options['boot_runs'] > 0:
+            results['boot'] = self.__boot(options['boot_runs'])
+
+        # the reset runs in a transaction which is rolled back, so the rows
+        # of the installation (and the temporary rows) are left untouched
+        with transaction.atomic():
+            self.__create_rows(options['rows'])
+
+            start = time.perf_counter()
+            reset_database()
+            results['reset'] = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        self.stdout.write('{:<10} {:>10} {:>10}'.format(
+            'phase', 'seconds', 'budget'))
+        for (name, duration) in results.items():
+            self.stdout.write('{:<10} {:>10.3f} {:>10.3f}'.format(
+                name, duration, budget[name]))
+
+        exceeded = [
+            name for (name, duration) in results.items()
+            if duration > budget[name]
+        ]
+        if exceeded:
+            raise CommandError('The startup budget is exceeded ({}).'.format(
+                ', '.join(exceeded)))
+
+    def __create_rows(self, rows):
+        """
+        Creates `rows` online slaves, running scripts and failed filesystems
+        which are reset.
+        """
+        prefix = 'benchmark_' + uuid4().hex
+        SlaveModel.objects.bulk_create([
+            SlaveModel(
+                name='{}_{}'.format(prefix, i),
+                ip_address='255.255.{}.{}'.format(i // 256, i % 256),
+                mac_address='FF:FF:FF:FF:{:02X}:{:02X}'.format(
+                    i // 256, i % 256),
+                online=True,
+            ) for i in range(rows)
+        ])
+        slave = SlaveModel.objects.get(name='{}_0'.format(prefix))
+        ScriptModel.objects.bulk_create([
+            ScriptModel(name='{}_{}'.format(prefix, i), is_running=True)
+            for i in range(rows)
+        ])
+        FilesystemModel.objects.bulk_create([
+            FilesystemModel(
+                name='{}_{}'.format(prefix, i),
+                slave=slave,
+                source_path='{}_{}'.format(prefix, i),
+                destination_path='{}_{}'.format(prefix, i),
+                error_code='benchmark',
+            ) for i in range(rows)
+        ])
+
+    def __boot(self, runs):
+        """
+        Returns the mean duration of `manage.py check` in seconds.
+        """
+        start = time.perf_counter()
+
+        for _ in range(runs):
+            subprocess.run(
+                [
+                    sys.executable,
+                    os.path.join(settings.BASE_DIR, 'manage.py'),
+                    'check',
+                ],
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+
+        return (time.perf_counter() - start) / runs
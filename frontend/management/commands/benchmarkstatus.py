@@ -0,0 +1,142 @@
+"""
+This module contains the 'benchmarkstatus' command
+"""
+
+import os
+import tempfile
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from server.database import configure_sqlite
+
+from frontend.livestate import LiveStateStore
+from frontend.models import Slave as SlaveModel, Filesystem as FilesystemModel
+
+# the alias of the temporary database which receives the updates
+DATABASE_ALIAS = 'benchmark'
+
+# the SQLite defaults (rollback journal, sync on every commit)
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+}
+
+
+class Command(BaseCommand):
+    """
+    generates the 'benchmarkstatus' command
+    """
+    help = ('Measures how many status updates per second are written into a '
+            'temporary SQLite database')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=2000,
+            help='amount of status updates per run',
+        )
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=50,
+            help='amount of filesystems which receive the updates',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0.05,
+            help='flush interval for the write-behind run',
+        )
+
+    def handle(self, *args, **options):
+        # the pragmas (e.g. `journal_mode`) are stored in the database file,
+        # so the database of the installation is never touched
+        with tempfile.TemporaryDirectory() as directory:
+            connections.databases[DATABASE_ALIAS] = {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': os.path.join(directory, 'benchmark.sqlite3'),
+            }
+
+            try:
+                call_command(
+                    'migrate',
+                    'frontend',
+                    database=DATABASE_ALIAS,
+                    verbosity=0,
+                    interactive=False,
+                )
+                self.__benchmark(connections[DATABASE_ALIAS], options)
+            finally:
+                connections[DATABASE_ALIAS].close()
+                del connections[DATABASE_ALIAS]
+                del connections.databases[DATABASE_ALIAS]
+
+    def __benchmark(self, connection, options):
+        """
+        Creates the filesystems in the database of `connection` and prints
+        the throughput of every run.
+        """
+        SlaveModel.objects.using(DATABASE_ALIAS).bulk_create([
+            SlaveModel(
+                name='benchmark',
+                ip_address='255.255.255.254',
+                mac_address='FF:FF:FF:FF:FF:FE',
+            )
+        ])
+        slave = SlaveModel.objects.using(DATABASE_ALIAS).get()
+        FilesystemModel.objects.using(DATABASE_ALIAS).bulk_create([
+            FilesystemModel(
+                name='benchmark_{}'.format(i),
+                slave=slave,
+                source_path='benchmark_{}'.format(i),
+                destination_path='benchmark_{}'.format(i),
+            ) for i in range(options['rows'])
+        ])
+        filesystems = list(
+            FilesystemModel.objects.using(DATABASE_ALIAS).values_list(
+                'id', flat=True))
+
+        self.stdout.write('{:<40} {:>12}'.format('run', 'updates/s'))
+
+        self.__set_pragmas(connection, DEFAULT_PRAGMAS)
+        self.__run('before (default pragmas, write-through)',
+                   LiveStateStore(0, DATABASE_ALIAS), filesystems,
+                   options['count'])
+
+        configure_sqlite(None, connection)
+        self.__run('tuned pragmas, write-through',
+                   LiveStateStore(0, DATABASE_ALIAS), filesystems,
+                   options['count'])
+        self.__run('tuned pragmas, write-behind',
+                   LiveStateStore(options['interval'], DATABASE_ALIAS),
+                   filesystems, options['count'])
+
+    def __set_pragmas(self, connection, pragmas):
+        """
+        Sets the given `pragmas` on `connection`.
+        """
+        with connection.cursor() as cursor:
+            for (name, value) in pragmas.items():
+                cursor.execute('PRAGMA {} = {}'.format(name, value))
+
+    def __run(self, name, store, filesystems, count):
+        """
+        Writes `count` status updates through `store` and prints the
+        throughput.
+        """
+        start = time.perf_counter()
+
+        for i in range(count):
+            store.update(
+                FilesystemModel,
+                filesystems[i % len(filesystems)],
+                error_code=str(i),
+            )
+        store.flush()
+
+        duration = time.perf_counter() - start
+        self.stdout.write('{:<40} {:>12.0f}'.format(name, count / duration))
@@ -0,0 +1,33 @@
+"""
+This module contains the 'compactruns' command
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from frontend.models import ProgramRun as ProgramRunModel
+
+
+class Command(BaseCommand):
+    """
+    generates the 'compactruns' command
+    """
+    help = 'Deletes finished program runs which are older than the retention'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=float,
+            default=settings.FSIM_RUN_HISTORY_RETENTION,
+            help='amount of days a finished run is kept',
+        )
+
+    def handle(self, *args, **options):
+        (deleted, _) = ProgramRunModel.objects.filter(
+            end__lt=now() - timedelta(days=options['days']),
+        ).delete()
+
+        self.stdout.write('Deleted {} runs.'.format(deleted))
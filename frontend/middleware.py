@@ -0,0 +1,19 @@
+"""
+This module contains the middleware of the `frontend` application.
+"""
+
+from .livestate import LIVE_STATE
+
+
+def flush_live_state(get_response):
+    """
+    Writes the pending changes of the `LiveStateStore` into the database
+    before a request is processed, so that every view reads the current
+    state.
+    """
+
+    def middleware(request):
+        LIVE_STATE.flush()
+        return get_response(request)
+
+    return middleware
@@ -0,0 +1,32 @@
+# Generated by Django 2.0.13 on 2026-10-19 08:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0005_auto_20180328_0849'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scriptgraphfiles',
+            name='script',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='frontend.Script'),
+        ),
+        migrations.AlterField(
+            model_name='scriptgraphprograms',
+            name='script',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='frontend.Script'),
+        ),
+        migrations.AddIndex(
+            model_name='filesystem',
+            index=models.Index(fields=['destination_path', 'destination_type'], name='filesystem_destination_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='programstatus',
+            index=models.Index(fields=['running', 'program'], name='programstatus_running_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 2.0.13 on 2026-10-19 08:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0006_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgramRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('command_uuid', models.CharField(max_length=32, unique=True)),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField(blank=True, null=True)),
+                ('code', models.CharField(blank=True, max_length=200, null=True)),
+                ('timeouted', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProgramRunStatistics',
+            fields=[
+                ('program', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='frontend.Program')),
+                ('runs', models.IntegerField(default=0)),
+                ('errors', models.IntegerField(default=0)),
+                ('timeouts', models.IntegerField(default=0)),
+                ('total_duration', models.FloatField(default=0)),
+                ('max_duration', models.FloatField(default=0)),
+                ('histogram', models.TextField(blank=True, default='')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='programrun',
+            name='program',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='frontend.Program'),
+        ),
+        migrations.AddField(
+            model_name='programrun',
+            name='slave',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='frontend.Slave'),
+        ),
+        migrations.AddIndex(
+            model_name='programrun',
+            index=models.Index(fields=['program', 'start'], name='programrun_program_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='programrun',
+            index=models.Index(fields=['end'], name='programrun_end_idx'),
+        ),
+    ]
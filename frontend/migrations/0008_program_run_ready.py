@@ -0,0 +1,18 @@
+# Generated by Django 2.0.13 on 2026-10-19 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0007_program_runs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='programrun',
+            name='ready',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 2.0.13 on 2026-10-19 08:46
+
+import django.core.validators
+from django.db import migrations, models
+import frontend.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0008_program_run_ready'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='program',
+            name='ready_pattern',
+            field=models.CharField(blank=True, default='', max_length=1000, validators=[frontend.models.validate_regex]),
+        ),
+        migrations.AddField(
+            model_name='program',
+            name='ready_port',
+            field=models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(65535)]),
+        ),
+        migrations.AddField(
+            model_name='programstatus',
+            name='ready',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.0.13 on 2026-10-19 08:53
+
+from django.db import migrations, models
+import frontend.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0009_program_ready_probe'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='script',
+            name='version',
+            field=models.CharField(default=frontend.models.new_version, editable=False, max_length=32),
+        ),
+    ]
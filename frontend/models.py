@@ -3,7 +3,9 @@ This module contains all database models from the `frontend` application.
 """
 
 import logging
+import re
 from shlex import split
+from uuid import uuid4
 
 from utils.typecheck import ensure_type
 
@@ -19,10 +21,19 @@ from django.db.models import (
     TextField,
     DateTimeField,
     Count,
+    F,
     Q,
+    QuerySet,
+    Case,
+    When,
+    Value,
+    Index,
+    FloatField,
 )
 
 from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 from .errors import IdentifierError
@@ -96,6 +107,44 @@ def validate_argument_list(args):
         raise ValidationError(_('Enter a valid argument list.'), )
 
 
+def validate_regex(pattern):
+    """
+    Validates a regular expression if it is compileable.
+
+    Parameters
+    ----------
+        pattern: str
+            A string which contains a regular expression.
+
+    Exception
+    ---------
+        ValidationError:
+            If the given `pattern` is not compileable by `re`.
+    """
+    try:
+        re.compile(pattern)
+    except re.error:
+        raise ValidationError(_('Enter a valid regular expression.'), )
+
+
+class ResetQuerySet(QuerySet):
+    """
+    A `QuerySet` which resets the non persistent fields (the
+    `RESET_FIELDS` of the model) of all rows with one query.
+    """
+
+    def reset(self):
+        """
+        Resets non persistent fields to their default value.
+
+        Returns
+        -------
+            int:
+                The amount of updated rows.
+        """
+        return self.update(**self.model.RESET_FIELDS)
+
+
 class Slave(Model):
     """
     Reprents a slave which runs the counter part of this software. The slave is
@@ -129,12 +178,19 @@ class Slave(Model):
     command_uuid = CharField(blank=True, null=True, max_length=32, unique=True)
     online = BooleanField(unique=False, default=False)
 
+    RESET_FIELDS = {
+        'command_uuid': None,
+        'online': False,
+    }
+
+    objects = ResetQuerySet.as_manager()
+
     def reset(self):
         """
         Resets non persistent fields to their default value.
         """
-        self.command_uuid = None
-        self.online = False
+        for (field, value) in self.RESET_FIELDS.items():
+            setattr(self, field, value)
 
         self.save()
 
@@ -153,6 +209,24 @@ class Slave(Model):
         else:
             return "unknown"
 
+    def to_dict(self):
+        """
+        Returns
+        -------
+            dict:
+                The fields, the state and the counters of this `Slave` (see
+                `Slave.with_status_counts`).
+        """
+        return {
+            'id': self.id,
+            'name': self.name,
+            'ip_address': self.ip_address,
+            'mac_address': self.mac_address,
+            'state': self.data_state,
+            'running': self.current_running,
+            'errored': self.current_errored,
+        }
+
     @property
     def current_errored(self):
         """
@@ -163,6 +237,11 @@ class Slave(Model):
         int:
             The amount of `Program`s and `Filesystem`s where an error occured.
         """
+        # the amount is already known if the slave was loaded by
+        # `Slave.with_status_counts`
+        if hasattr(self, 'errored_count'):
+            return self.errored_count
+
         progs = ProgramStatus.objects.filter(
             ~Q(code="0"),
             running=False,
@@ -186,6 +265,9 @@ class Slave(Model):
             int:
                 The amount of `Program`s which are running.
         """
+        if hasattr(self, 'running_count'):
+            return self.running_count
+
         return ProgramStatus.objects.filter(
             running=True,
             program__slave=self,
@@ -213,15 +295,8 @@ class Slave(Model):
             bool:
                 If the slave has an error value stored.
         """
-        for prog in self.program_set.all():
-            if prog.is_error:
-                return True
-
-        for filesystem in self.filesystem_set.all():
-            if filesystem.is_error:
-                return True
-
-        return False
+        return (self.program_set.errored().exists()
+                or self.filesystem_set.errored().exists())
 
     @property
     def has_running(self):
@@ -233,7 +308,7 @@ class Slave(Model):
             bool:
                 If the slave has running programs.
         """
-        return self.program_set.filter(programstatus__running=True).exists()
+        return self.program_set.running().exists()
 
     @staticmethod
     def from_identifier(identifier, is_string):
@@ -275,6 +350,40 @@ class Slave(Model):
             except ValueError:
                 raise IdentifierError("slave", "int", identifier)
 
+    @staticmethod
+    def with_status_counts():
+        """
+        Returns all `Slave`s with the values of `Slave.current_running` and
+        `Slave.current_errored`, which are counted by the database in the same
+        query.
+
+        Returns
+        -------
+            QuerySet:
+                All `Slave`s annotated with `running_count` and
+                `errored_count`.
+        """
+        return Slave.objects.annotate(
+            running_count=Count(
+                'program__programstatus',
+                filter=Q(program__programstatus__running=True),
+                distinct=True,
+            ),
+            errored_programs=Count(
+                'program__programstatus',
+                filter=Q(program__programstatus__running=False)
+                & ~Q(program__programstatus__code="0"),
+                distinct=True,
+            ),
+            errored_filesystems=Count(
+                'filesystem',
+                filter=~Q(filesystem__error_code="0")
+                & ~Q(filesystem__error_code=""),
+                distinct=True,
+            ),
+        ).annotate(
+            errored_count=F('errored_programs') + F('errored_filesystems'))
+
     @staticmethod
     def with_programs():
         """
@@ -311,6 +420,87 @@ class Slave(Model):
                 )
 
 
+class ProgramQuerySet(QuerySet):
+    """
+    A `QuerySet` for `Program`s which can compute the state of every
+    `Program` in the database (see `ProgramQuerySet.with_state`).
+    """
+
+    def with_state(self):
+        """
+        Annotates every `Program` with its state, so that `Program.is_running`,
+        `Program.is_timeouted`, `Program.is_ready`, `Program.is_executed`,
+        `Program.is_error`, `Program.is_successful` and `Program.data_state`
+        do not query the `ProgramStatus`.
+
+        Returns
+        -------
+            ProgramQuerySet:
+                Annotated with `state_running`, `state_timeouted`,
+                `state_ready`, `state_executed` and `state_error`.
+        """
+        executed = Q(programstatus__running=False) & ~Q(programstatus__code='')
+
+        def flag(condition):
+            return Case(
+                When(condition, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+
+        return self.annotate(
+            state_running=flag(Q(programstatus__running=True)),
+            state_timeouted=flag(Q(programstatus__timeouted=True)),
+            state_ready=flag(Q(programstatus__ready=True)),
+            state_executed=flag(executed),
+            state_error=flag(executed & ~Q(programstatus__code='0')),
+        )
+
+    def running(self):
+        """
+        Returns
+        -------
+            ProgramQuerySet:
+                All `Program`s which are running.
+        """
+        return self.with_state().filter(state_running=True)
+
+    def errored(self):
+        """
+        Returns
+        -------
+            ProgramQuerySet:
+                All `Program`s which had an error while running.
+        """
+        return self.with_state().filter(state_error=True)
+
+
+class FilesystemQuerySet(ResetQuerySet):
+    """
+    A `QuerySet` for `Filesystem`s which filters by the state of the
+    `Filesystem`s.
+    """
+
+    def moved(self):
+        """
+        Returns
+        -------
+            FilesystemQuerySet:
+                All `Filesystem`s which are moved.
+        """
+        return self.exclude(hash_value='').exclude(hash_value=None)
+
+    def errored(self):
+        """
+        Returns
+        -------
+            FilesystemQuerySet:
+                All `Filesystem`s which had an error while the move or restore
+                operation.
+        """
+        return self.exclude(error_code='')
+
+
 class Program(Model):
     """
     Represents a program which is located on a slave and which can be executed.
@@ -327,6 +517,12 @@ class Program(Model):
             The `Slave` on which this `Program` is located.
         start_time: IntegerField
             The amount of time this `Program` needs to start.
+        ready_pattern: CharField
+            A regular expression. The `Program` is ready as soon as a line of
+            its output matches (optional).
+        ready_port: IntegerField
+            A TCP port on the `Slave`. The `Program` is ready as soon as the
+            port accepts connections (optional).
     """
     name = CharField(unique=False, max_length=1000)
     path = TextField(unique=False)
@@ -337,6 +533,20 @@ class Program(Model):
     )
     slave = ForeignKey(Slave, on_delete=CASCADE)
     start_time = IntegerField(default=0)
+    ready_pattern = CharField(
+        max_length=1000,
+        blank=True,
+        default='',
+        validators=[validate_regex],
+    )
+    ready_port = IntegerField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(1),
+                    MaxValueValidator(65535)],
+    )
+
+    objects = ProgramQuerySet.as_manager()
 
     class Meta:
         """
@@ -355,9 +565,11 @@ class Program(Model):
         Returns
         -------
             str:
-                One of "running", "error", "success" or "unknown"
+                One of "ready", "running", "error", "success" or "unknown"
         """
         if self.is_running:
+            if self.is_ready:
+                return "ready"
             return "running"
         elif self.is_error:
             return "error"
@@ -366,6 +578,65 @@ class Program(Model):
         else:
             return "unknown"
 
+    @property
+    def ready_probe(self):
+        """
+        Returns the probes which the `Slave` uses to report this `Program` as
+        ready.
+
+        Returns
+        -------
+            dict or None:
+                Contains `pattern` and/or `port` or None if no probe is
+                configured.
+        """
+        probe = {}
+        if self.ready_pattern:
+            probe['pattern'] = self.ready_pattern
+        if self.ready_port is not None:
+            probe['port'] = self.ready_port
+        return probe or None
+
+    def to_dict(self):
+        """
+        Returns
+        -------
+            dict:
+                The fields and the state of this `Program` (see
+                `ProgramQuerySet.with_state`).
+        """
+        return {
+            'id': self.id,
+            'name': self.name,
+            'slave': self.slave_id,
+            'path': self.path,
+            'arguments': self.arguments,
+            'start_time': self.start_time,
+            'ready_pattern': self.ready_pattern,
+            'ready_port': self.ready_port,
+            'state': self.data_state,
+            'ready': self.is_ready,
+            'timeouted': self.is_timeouted,
+        }
+
+    @property
+    def is_ready(self):
+        """
+        Checks if the `Slave` reported this `Program` as ready.
+
+        Returns
+        -------
+            bool:
+                If the `Program` is ready.
+        """
+        if hasattr(self, 'state_ready'):
+            return self.state_ready
+
+        try:
+            return self.programstatus.ready
+        except ProgramStatus.DoesNotExist:
+            return False
+
     @property
     def is_timeouted(self):
         """
@@ -376,6 +647,9 @@ class Program(Model):
             bool:
                 If the specified amount of time is elapsed.
         """
+        if hasattr(self, 'state_timeouted'):
+            return self.state_timeouted
+
         try:
             return self.programstatus.timeouted
         except ProgramStatus.DoesNotExist:
@@ -391,6 +665,9 @@ class Program(Model):
             bool:
                 If this `Program` is running.
         """
+        if hasattr(self, 'state_running'):
+            return self.state_running
+
         try:
             return self.programstatus.running
         except ProgramStatus.DoesNotExist:
@@ -406,6 +683,9 @@ class Program(Model):
             bool:
                 If this `Program` was running.
         """
+        if hasattr(self, 'state_executed'):
+            return self.state_executed
+
         try:
             return not self.is_running and self.programstatus.code != ''
         except ProgramStatus.DoesNotExist:
@@ -421,6 +701,9 @@ class Program(Model):
             bool:
                 If this `Program` had an error.
         """
+        if hasattr(self, 'state_error'):
+            return self.state_error
+
         # NOTICE: `Program.is_executed` covers the case
         # `ProgramStatus.DoesNotExist`.
         return self.is_executed and self.programstatus.code != '0'
@@ -435,10 +718,36 @@ class Program(Model):
             bool:
                 If this `Program` had no error.
         """
+        if hasattr(self, 'state_error'):
+            return self.state_executed and not self.state_error
+
         # NOTICE: `Program.is_executed` covers the case
         # `ProgramStatus.DoesNotExist`.
         return self.is_executed and self.programstatus.code == '0'
 
+    def readiness_samples(self, limit):
+        """
+        Returns the seconds this `Program` needed to be ready in its latest
+        runs. Runs which failed or have no readiness signal of the `Slave`
+        are ignored.
+
+        Parameters
+        ----------
+            limit: int
+                The maximum amount of runs.
+
+        Returns
+        -------
+            list of float:
+                The readiness of the runs (latest first).
+        """
+        runs = self.programrun_set.filter(
+            Q(code='0') | Q(code=None),
+            ready__isnull=False,
+        ).order_by('-start').only('start', 'ready')[:limit]
+
+        return [run.readiness for run in runs]
+
 
 class Filesystem(Model):
     """
@@ -508,6 +817,13 @@ class Filesystem(Model):
     )
     error_code = CharField(blank=True, default="", max_length=1000)
 
+    RESET_FIELDS = {
+        'command_uuid': None,
+        'error_code': '',
+    }
+
+    objects = FilesystemQuerySet.as_manager()
+
     class Meta:
         """
         Meta class
@@ -522,13 +838,20 @@ class Filesystem(Model):
                 'destination_type',
             ),
         )
+        # `fs_move` searches moved filesystems by their destination
+        indexes = [
+            Index(
+                fields=['destination_path', 'destination_type'],
+                name='filesystem_destination_idx',
+            ),
+        ]
 
     def reset(self):
         """
         Resets non persistent fields to their default value.
         """
-        self.command_uuid = None
-        self.error_code = ""
+        for (field, value) in self.RESET_FIELDS.items():
+            setattr(self, field, value)
 
         self.save()
 
@@ -578,6 +901,38 @@ class Filesystem(Model):
         else:
             return "restored"
 
+    def to_dict(self):
+        """
+        Returns
+        -------
+            dict:
+                The fields and the state of this `Filesystem`.
+        """
+        return {
+            'id': self.id,
+            'name': self.name,
+            'slave': self.slave_id,
+            'source_path': self.source_path,
+            'source_type': self.source_type,
+            'destination_path': self.destination_path,
+            'destination_type': self.destination_type,
+            'state': self.data_state,
+            'error_code': self.error_code,
+        }
+
+
+def new_version():
+    """
+    Returns a new version for a `Script` (random, so that a version is never
+    reused).
+
+    Returns
+    -------
+        str:
+            A random hex string.
+    """
+    return uuid4().hex
+
 
 class Script(Model):
     """
@@ -590,6 +945,9 @@ class Script(Model):
             The unqiue name for this `Script`.
         last_ran: BooleanField
             If this `Script` was the last one which was executed successful.
+        version: CharField
+            Changes every time the exported `Script` changes (e.g. the graph
+            or the name of a referenced `Program`).
 
         is_initialized: BooleanField
             If this `Scheduler` started this `Script`.
@@ -604,6 +962,7 @@ class Script(Model):
     # persistent fields
     name = CharField(unique=True, blank=False, max_length=200)
     last_ran = BooleanField(default=False, blank=True)
+    version = CharField(max_length=32, default=new_version, editable=False)
 
     # non persistent fields
     is_initialized = BooleanField(default=False, blank=True)
@@ -611,20 +970,41 @@ class Script(Model):
     error_code = CharField(default="", max_length=1000, blank=True)
     current_index = IntegerField(default=-1, blank=True)
 
+    RESET_FIELDS = {
+        'is_initialized': False,
+        'is_running': False,
+        'error_code': '',
+        'current_index': -1,
+    }
+
+    objects = ResetQuerySet.as_manager()
+
     def reset(self):
         """
         Resets non persistent fields to their default value.
         """
-        self.is_initialized = False
-        self.is_running = False
-        self.error_code = ""
-        self.current_index = -1
+        for (field, value) in self.RESET_FIELDS.items():
+            setattr(self, field, value)
 
         self.save()
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def touch(*args, **kwargs):
+        """
+        Gives all matching `Script`s a new version.
+
+        Parameters
+        ----------
+            args: list of Q
+                Forwarded to `QuerySet.filter`.
+            kwargs: dict
+                Forwarded to `QuerySet.filter`.
+        """
+        Script.objects.filter(*args, **kwargs).update(version=new_version())
+
     @staticmethod
     def get_last_ran():
         """
@@ -661,7 +1041,8 @@ class Script(Model):
     @property
     def stages(self):
         """
-        Returns a representation of all stages.
+        Returns a representation of all stages. The whole representation
+        (including the status of every `Program`) is loaded with two queries.
 
         Returns
         -------
@@ -669,35 +1050,48 @@ class Script(Model):
                 Contains every stage which consists of the index and all
                 programs/filesystem ordered by the slave.
         """
-        stages = list()
-
-        for i in self.indexes:
-            slave_entries = list()
-            slaves = Slave.objects.filter(
-                Q(program__scriptgraphprograms__script=self,
-                  program__scriptgraphprograms__index=i)
-                | Q(filesystem__scriptgraphfiles__script=self,
-                    filesystem__scriptgraphfiles__index=i)).distinct()
-            for slave in slaves:
-                programs = Program.objects.filter(
-                    scriptgraphprograms__index=i,
-                    scriptgraphprograms__script=self,
-                    slave=slave).distinct().order_by('slave__name')
-                filesystems = Filesystem.objects.filter(
-                    scriptgraphfiles__index=i,
-                    scriptgraphfiles__script=self,
-                    slave=slave).distinct().order_by('slave__name')
-                slave_entries.append({
+        stages = dict()
+
+        def slave_entry(index, slave):
+            """
+            Returns the entry of `slave` in the stage `index`.
+            """
+            slave_entries = stages.setdefault(index, dict())
+            return slave_entries.setdefault(
+                slave.id,
+                {
                     'name': slave.name,
-                    'programs': programs,
-                    'filesystems': filesystems
-                })
+                    'programs': list(),
+                    'filesystems': list(),
+                },
+            )
 
-            stages.append({
-                'index': i,
-                'slave_entries': slave_entries,
-            })
-        return stages
+        # the status of the programs is loaded in the same query, because it
+        # is needed to render the state of every program
+        program_nodes = ScriptGraphPrograms.objects.filter(
+            script=self).select_related(
+                'program__slave',
+                'program__programstatus',
+            ).order_by('program__id')
+
+        for node in program_nodes:
+            slave_entry(node.index, node.program.slave)['programs'].append(
+                node.program)
+
+        filesystem_nodes = ScriptGraphFiles.objects.filter(
+            script=self).select_related('filesystem__slave').order_by(
+                'filesystem__id')
+
+        for node in filesystem_nodes:
+            slave_entry(node.index,
+                        node.filesystem.slave)['filesystems'].append(
+                            node.filesystem)
+
+        return [{
+            'index': index,
+            'slave_entries':
+            [stages[index][slave_id] for slave_id in sorted(stages[index])],
+        } for index in sorted(stages)]
 
     @property
     def indexes(self):
@@ -816,7 +1210,9 @@ class ScriptGraphPrograms(Model):
         program: ForeignKey
             The `Program` which is executed.
     """
-    script = ForeignKey(Script, on_delete=CASCADE)
+    # the unique index on (script, index, program) serves all queries by
+    # script, so the foreign key does not need an index of its own
+    script = ForeignKey(Script, on_delete=CASCADE, db_index=False)
     index = IntegerField(null=False)
     program = ForeignKey(Program, on_delete=CASCADE)
 
@@ -837,7 +1233,9 @@ class ScriptGraphFiles(Model):
         filesystem: ForeignKey
             The `Filesytem` which is moved.
     """
-    script = ForeignKey(Script, on_delete=CASCADE)
+    # the unique index on (script, index, filesystem) serves all queries by
+    # script, so the foreign key does not need an index of its own
+    script = ForeignKey(Script, on_delete=CASCADE, db_index=False)
     index = IntegerField(null=False)
     filesystem = ForeignKey(Filesystem, on_delete=CASCADE)
 
@@ -862,6 +1260,8 @@ class ProgramStatus(Model):
         timeouted: BooleanField
             Indicator if the `Program` elapsed the amount of time it needs to
             execute.
+        ready: BooleanField
+            Indicator if the `Slave` reported the `Program` as ready.
         start_time: DateTimeField
             Indicator when the `Program` was started.
     """
@@ -874,4 +1274,319 @@ class ProgramStatus(Model):
     command_uuid = CharField(max_length=32, unique=True)
     running = BooleanField(unique=False, default=True)
     timeouted = BooleanField(unique=False, default=False)
+    ready = BooleanField(unique=False, default=False)
     start_time = DateTimeField(null=True, blank=True)
+
+    class Meta:
+        """
+        Meta class
+        """
+        # finds the running programs without reading the status rows
+        indexes = [
+            Index(
+                fields=['running', 'program'],
+                name='programstatus_running_idx',
+            ),
+        ]
+
+
+# upper bounds (in seconds) of the duration buckets which are used to compute
+# percentiles of the run durations (0.1 seconds to about 29 hours)
+RUN_DURATION_BUCKETS = [0.1 * 2**i for i in range(21)]
+
+
+class ProgramRun(Model):
+    """
+    Represents one execution of a `Program` (append-only history). Old runs
+    are deleted by the `compactruns` command, their durations are kept in the
+    `ProgramRunStatistics` of the `Program`.
+
+    Attributes
+    ----------
+        program: ForeignKey
+            The `Program` which was executed.
+        slave: ForeignKey
+            The `Slave` on which the `Program` was executed.
+        command_uuid: CharField
+            The UUID of the `execute` command.
+        start: DateTimeField
+            When the `Program` was started.
+        end: DateTimeField
+            When the `Program` finished (None while it is running).
+        ready: DateTimeField
+            When the `Program` was ready (reported by the `Slave`, None if
+            unknown). A run which only exited has no readiness, because the
+            exit of a daemon says nothing about its startup.
+        code: CharField
+            The return code (None if the run was aborted).
+        timeouted: BooleanField
+            If the `Program.start_time` elapsed while running.
+    """
+    program = ForeignKey(Program, on_delete=CASCADE)
+    slave = ForeignKey(Slave, on_delete=CASCADE)
+    command_uuid = CharField(max_length=32, unique=True)
+    start = DateTimeField()
+    end = DateTimeField(null=True, blank=True)
+    ready = DateTimeField(null=True, blank=True)
+    code = CharField(max_length=200, null=True, blank=True)
+    timeouted = BooleanField(default=False)
+
+    class Meta:
+        """
+        Meta class
+        """
+        indexes = [
+            Index(fields=['program', 'start'], name='programrun_program_idx'),
+            Index(fields=['end'], name='programrun_end_idx'),
+        ]
+
+    @property
+    def duration(self):
+        """
+        Returns
+        -------
+            float or None:
+                The duration of the run in seconds or None if the run is not
+                finished.
+        """
+        if self.end is None:
+            return None
+        return (self.end - self.start).total_seconds()
+
+    @property
+    def readiness(self):
+        """
+        Returns
+        -------
+            float or None:
+                The seconds the `Program` needed to be ready or None if
+                unknown.
+        """
+        if self.ready is None:
+            return None
+        return (self.ready - self.start).total_seconds()
+
+    def to_dict(self):
+        """
+        Returns
+        -------
+            dict:
+                The run with ISO 8601 formatted timestamps.
+        """
+        return {
+            'slave': self.slave_id,
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat() if self.end is not None else None,
+            'duration': self.duration,
+            'readiness': self.readiness,
+            'code': self.code,
+            'timeouted': self.timeouted,
+        }
+
+    @staticmethod
+    def finish(command_uuid, code, end):
+        """
+        Finishes the run of the `execute` command with `command_uuid` and
+        adds it to the `ProgramRunStatistics`.
+
+        Parameters
+        ----------
+            command_uuid: str
+                The UUID of the `execute` command.
+            code: str
+                The return code.
+            end: datetime
+                When the `Program` finished.
+
+        Returns
+        -------
+            ProgramRun or None:
+                The finished run or None if the run is unknown.
+        """
+        run = ProgramRun.objects.filter(
+            command_uuid=command_uuid,
+            end=None,
+        ).first()
+
+        if run is None:
+            return None
+
+        run.end = end
+        run.code = str(code)
+        run.save(update_fields=['end', 'code'])
+
+        ProgramRunStatistics.record(run)
+        return run
+
+    @staticmethod
+    def mark_ready(command_uuid, ready):
+        """
+        Sets the readiness of the unfinished run of the `execute` command with
+        `command_uuid` (only the first signal counts).
+
+        Parameters
+        ----------
+            command_uuid: str
+                The UUID of the `execute` command.
+            ready: datetime
+                When the `Program` was ready.
+        """
+        ProgramRun.objects.filter(
+            command_uuid=command_uuid,
+            end=None,
+            ready=None,
+        ).update(ready=ready)
+
+    @staticmethod
+    def abort(slave_ids, end):
+        """
+        Ends all unfinished runs on the given `Slave`s without a return code
+        (e.g. because the slaves disconnected).
+
+        Parameters
+        ----------
+            slave_ids: list of int
+                The identifiers of the `Slave`s.
+            end: datetime
+                When the runs ended.
+        """
+        ProgramRun.objects.filter(
+            slave__in=slave_ids,
+            end=None,
+        ).update(end=end)
+
+
+class ProgramRunStatistics(Model):
+    """
+    Represents the aggregated runs of a `Program`. Every finished run is added
+    when it finishes, so the statistics do not depend on the `ProgramRun`s
+    which are still stored.
+
+    Attributes
+    ----------
+        program: OneToOneField
+            The related `Program`.
+        runs: IntegerField
+            The amount of finished runs.
+        errors: IntegerField
+            The amount of runs with a return code other than 0.
+        timeouts: IntegerField
+            The amount of runs which elapsed the `Program.start_time`.
+        total_duration: FloatField
+            The sum of all durations in seconds.
+        max_duration: FloatField
+            The longest duration in seconds.
+        histogram: TextField
+            The amount of runs per bucket of `RUN_DURATION_BUCKETS` (comma
+            separated).
+    """
+    program = OneToOneField(
+        Program,
+        on_delete=CASCADE,
+        primary_key=True,
+    )
+    runs = IntegerField(default=0)
+    errors = IntegerField(default=0)
+    timeouts = IntegerField(default=0)
+    total_duration = FloatField(default=0)
+    max_duration = FloatField(default=0)
+    histogram = TextField(default='', blank=True)
+
+    @staticmethod
+    def record(run):
+        """
+        Adds a finished `ProgramRun` to the statistics of its `Program`.
+
+        Parameters
+        ----------
+            run: ProgramRun
+                A finished run.
+        """
+        with transaction.atomic():
+            (statistics, _) = ProgramRunStatistics.objects.select_for_update(
+            ).get_or_create(program_id=run.program_id)
+
+            duration = max(0.0, run.duration)
+            counts = statistics.bucket_counts
+
+            bucket = 0
+            while (bucket < len(RUN_DURATION_BUCKETS) - 1
+                   and duration > RUN_DURATION_BUCKETS[bucket]):
+                bucket += 1
+            counts[bucket] += 1
+
+            statistics.runs += 1
+            statistics.errors += int(run.code != '0')
+            statistics.timeouts += int(run.timeouted)
+            statistics.total_duration += duration
+            statistics.max_duration = max(statistics.max_duration, duration)
+            statistics.histogram = ','.join(str(count) for count in counts)
+            statistics.save()
+
+    @property
+    def bucket_counts(self):
+        """
+        Returns
+        -------
+            list of int:
+                The amount of runs per bucket of `RUN_DURATION_BUCKETS`.
+        """
+        if not self.histogram:
+            return [0] * len(RUN_DURATION_BUCKETS)
+        return [int(count) for count in self.histogram.split(',')]
+
+    @property
+    def mean_duration(self):
+        """
+        Returns
+        -------
+            float or None:
+                The mean duration in seconds or None if there are no runs.
+        """
+        if self.runs == 0:
+            return None
+        return self.total_duration / self.runs
+
+    def percentile(self, percent):
+        """
+        Estimates a percentile of the durations (the upper bound of the
+        bucket which contains the percentile).
+
+        Parameters
+        ----------
+            percent: number
+                The percentile between 0 and 100.
+
+        Returns
+        -------
+            float or None:
+                The duration in seconds or None if there are no runs.
+        """
+        if self.runs == 0:
+            return None
+
+        rank = percent / 100 * self.runs
+        seen = 0
+        for (bound, count) in zip(RUN_DURATION_BUCKETS, self.bucket_counts):
+            seen += count
+            if seen >= rank and count > 0:
+                return min(bound, self.max_duration)
+        return self.max_duration
+
+    def to_dict(self):
+        """
+        Returns
+        -------
+            dict:
+                The statistics with the mean and percentiles of the durations.
+        """
+        return {
+            'runs': self.runs,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'mean': self.mean_duration,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max_duration if self.runs else None,
+        }
@@ -145,3 +145,28 @@ class SafeLoop:
         LOGGER.info("Waiting for thread.")
         self.thread.join(timeout=timeout)
         self.thread = None
+
+
+SHARED_LOOP = None
+SHARED_LOOP_LOCK = threading.Lock()
+
+
+def shared_loop():
+    """
+    Returns the `SafeLoop` which is shared by the background services of the
+    application (e.g. timeouts of commands). The loop is started on the first
+    call.
+
+    Returns
+    -------
+        SafeLoop:
+            The running event loop.
+    """
+    global SHARED_LOOP  # pylint: disable=global-statement
+
+    with SHARED_LOOP_LOCK:
+        if SHARED_LOOP is None:
+            SHARED_LOOP = SafeLoop()
+            SHARED_LOOP.start()
+
+    return SHARED_LOOP
@@ -8,6 +8,7 @@ import logging
 
 from server.utils import notify
 from .safeloop import SafeLoop
+from .livestate import LIVE_STATE
 
 LOGGER = logging.getLogger("fsim.scheduler")
 
@@ -287,6 +288,9 @@ class Scheduler:
             self.__event.clear()
             LOGGER.debug("Scheduler is doing a step.")
 
+            # every state reads the database
+            LIVE_STATE.flush()
+
             if self.__stop:
                 LOGGER.info(
                     "Scheduler received interrupt event. Exiting scheduler loop."
@@ -381,8 +385,7 @@ class Scheduler:
             self.__index,
         )
 
-        Script.objects.filter(id=self.__script).update(
-            current_index=self.__index)
+        LIVE_STATE.update(Script, self.__script, current_index=self.__index)
 
         if all_done:
             LOGGER.info(
@@ -473,12 +476,12 @@ class Scheduler:
         progs = ScriptGraphPrograms.objects.filter(
             script=self.__script,
             index=self.__index,
-        )
+        ).select_related('program__programstatus')
 
         filesystems = ScriptGraphFiles.objects.filter(
             script=self.__script,
             index=self.__index,
-        )
+        ).select_related('filesystem')
 
         for sgp in progs:
             prog = sgp.program
@@ -491,7 +494,8 @@ class Scheduler:
                 self.__event.set()
                 return
 
-            elif prog.is_running and not prog.is_timeouted:
+            elif prog.is_running and not (prog.is_timeouted
+                                          or prog.is_ready):
                 LOGGER.debug(
                     "Program %s is not ready yet.",
                     prog.name,
@@ -559,3 +563,60 @@ class Scheduler:
             'error_code': self.__error_code,
             'script_id': self.__script,
         })
+
+
+class LazyScheduler:
+    """
+    A thread-safe proxy which creates the `Scheduler` (and the thread of its
+    event loop) on first use. All attributes are forwarded to the
+    `Scheduler`.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__scheduler = None
+
+    @property
+    def is_created(self):
+        """
+        Thread-safe function.
+
+        Returns
+        -------
+            bool:
+                If the `Scheduler` was created.
+        """
+        with self.__lock:
+            return self.__scheduler is not None
+
+    def instance(self):
+        """
+        Thread-safe function.
+
+        Returns
+        -------
+            Scheduler:
+                The `Scheduler` (which is created if it does not exist).
+        """
+        with self.__lock:
+            if self.__scheduler is None:
+                LOGGER.debug("Creating the scheduler on first use.")
+                self.__scheduler = Scheduler()
+            return self.__scheduler
+
+    def notify(self):
+        """
+        Thread-safe function.
+
+        Forwards to `Scheduler.notify` if the `Scheduler` exists. Without a
+        `Scheduler` no script is running, which could wait for the
+        notification.
+        """
+        with self.__lock:
+            scheduler = self.__scheduler
+
+        if scheduler is not None:
+            scheduler.notify()
+
+    def __getattr__(self, name):
+        return getattr(self.instance(), name)
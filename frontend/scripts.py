@@ -9,6 +9,8 @@ from utils.typecheck import ensure_type, ensure_type_array
 
 from django.db import transaction
 
+from server.database import chunked
+
 from .models import (
     Script as ScriptModel,
     ScriptGraphFiles as SGFModel,
@@ -53,6 +55,208 @@ def get_slave(slave):
             raise SlaveNotExistError(err, slave)
 
 
+def resolve_slaves(identifiers):
+    """
+    Resolves the names and ids of many `SlaveModel`s with one query per chunk
+    of names and ids (see `chunked`).
+
+    Parameters
+    ----------
+        identifiers: list of int or str
+            Identifies `SlaveModel`s by name (str) or id (int).
+
+    Returns
+    -------
+        dict:
+            Maps every identifier of an existing `SlaveModel` to its id.
+    """
+    names = {slave for slave in identifiers if isinstance(slave, str)}
+    ids = {slave for slave in identifiers if isinstance(slave, int)}
+
+    slaves = {}
+    for chunk in chunked(names):
+        slaves.update({
+            name: slave_id
+            for (slave_id, name) in SlaveModel.objects.filter(
+                name__in=chunk).values_list('id', 'name')
+        })
+    for chunk in chunked(ids):
+        slaves.update({
+            slave_id: slave_id
+            for slave_id in SlaveModel.objects.filter(
+                id__in=chunk).values_list('id', flat=True)
+        })
+    return slaves
+
+
+def resolve_entries(entries, slaves, model, field, error):
+    """
+    Resolves the programs or filesystems of many `ScriptEntryProgram`s or
+    `ScriptEntryFilesystem`s with one query per chunk of names and ids (see
+    `chunked`). The entries are checked in order (first the slave, then the
+    referenced object).
+
+    Parameters
+    ----------
+        entries: list of ScriptEntryProgram or ScriptEntryFilesystem
+            The entries which are resolved.
+        slaves: dict
+            The result of `resolve_slaves` for the entries.
+        model: ProgramModel or FilesystemModel
+            The model which the entries reference.
+        field: "program" or "filesystem"
+            The name of the attribute which identifies the object.
+        error: ProgramNotExistError or FilesystemNotExistError
+            The error which is raised if an object does not exist.
+
+    Returns
+    -------
+        list of int:
+            The ids of the referenced objects (in the order of the entries).
+
+    Raises
+    ------
+        SlaveNotExistError
+        ProgramNotExistError
+        FilesystemNotExistError
+    """
+    names = {
+        getattr(entry, field)
+        for entry in entries if isinstance(getattr(entry, field), str)
+    }
+    ids = {
+        getattr(entry, field)
+        for entry in entries if isinstance(getattr(entry, field), int)
+    }
+
+    # maps (slave, name) and (slave, id) to the id of the object
+    objects = {}
+    # the names are not filtered by slave (which would add more variables),
+    # rows of other slaves are never looked up
+    for chunk in chunked(names):
+        objects.update({(slave_id, name): obj_id
+                        for (obj_id, slave_id, name) in model.objects.filter(
+                            name__in=chunk).values_list(
+                                'id', 'slave', 'name')})
+    for chunk in chunked(ids):
+        objects.update({(slave_id, obj_id): obj_id
+                        for (obj_id, slave_id) in model.objects.filter(
+                            id__in=chunk).values_list('id', 'slave')})
+
+    resolved = []
+    for entry in entries:
+        if entry.slave not in slaves:
+            raise SlaveNotExistError(SlaveModel.DoesNotExist(), entry.slave)
+
+        obj_id = objects.get((slaves[entry.slave], getattr(entry, field)))
+        if obj_id is None:
+            raise error(model.DoesNotExist(), getattr(entry, field))
+
+        resolved.append(obj_id)
+    return resolved
+
+
+def ensure_unique(models, fields):
+    """
+    Validates the uniqueness of `fields` between unsaved `models` in memory
+    (instead of one query per model like `Model.full_clean`).
+
+    Parameters
+    ----------
+        models: list of Model
+            Unsaved models of the same class.
+        fields: tuple of str
+            The fields which are unique together.
+
+    Raises
+    ------
+        ValidationError:
+            If two models have the same values.
+    """
+    seen = set()
+    for model in models:
+        key = tuple(
+            getattr(model, model._meta.get_field(field).attname)
+            for field in fields)
+        if key in seen:
+            raise model.unique_error_message(type(model), fields)
+        seen.add(key)
+
+
+def apply_graph_diff(script, models, field):
+    """
+    Changes the stored graph entries of `script` to the given unsaved
+    `models` by deleting the entries which are not in `models` and inserting
+    the missing ones.
+
+    Parameters
+    ----------
+        script: ScriptModel
+            A saved `ScriptModel`.
+        models: list of ScriptGraphPrograms or ScriptGraphFiles
+            The unsaved entries which should be stored.
+        field: "program" or "filesystem"
+            The name of the referenced object.
+
+    Returns
+    -------
+        dict:
+            The amount of `added` and `removed` entries.
+    """
+    model = SGPModel if field == 'program' else SGFModel
+
+    wanted = {(entry.index, getattr(entry, field + '_id')): entry
+              for entry in models}
+    stored = {(index, obj_id): entry_id
+              for (entry_id, index, obj_id) in model.objects.filter(
+                  script=script).values_list('id', 'index', field)}
+
+    removed = [
+        entry_id for (key, entry_id) in stored.items() if key not in wanted
+    ]
+    added = [entry for (key, entry) in wanted.items() if key not in stored]
+
+    for chunk in chunked(removed):
+        model.objects.filter(id__in=chunk).delete()
+    model.objects.bulk_create(added)
+
+    return {'added': len(added), 'removed': len(removed)}
+
+
+def key_columns(key_type, id_column, name_column):
+    """
+    Returns the column which encodes a reference as `key_type`.
+
+    Parameters
+    ----------
+        key_type: "str" or "int"
+            The type of the reference.
+        id_column: str
+            The column which is used for "int".
+        name_column: str
+            The column which is used for "str".
+
+    Returns
+    -------
+        str:
+            The name of the column.
+
+    Raises
+    ------
+        QueryParameterError:
+            If `key_type` is not "str" or "int".
+    """
+    if key_type == "int":
+        return id_column
+    elif key_type == "str":
+        return name_column
+    else:
+        raise QueryParameterError(
+            key_type,
+            ["int", "str"],
+        )
+
+
 class Script:
     """
     A intermediate representation for a script which comes in JSON encoded and
@@ -128,16 +332,30 @@ class Script:
             A `Script` which is retreived from a `ScriptModel`.
 
         """
-        script = ScriptModel.objects.get(id=script_id)
+        slave_columns = key_columns(slaves_type, 'slave_id', 'slave__name')
+        program_columns = key_columns(programs_type, 'id', 'name')
+        filesystem_columns = key_columns(filesystem_type, 'id', 'name')
+
+        script = ScriptModel.objects.only('name').get(id=script_id)
 
+        # one query per entry type (instead of one query per entry)
         programs = [
-            ScriptEntryProgram.from_query(model, slaves_type, programs_type)
-            for model in SGPModel.objects.filter(script=script)
+            ScriptEntryProgram(index, program, slave)
+            for (index, program, slave) in SGPModel.objects.filter(
+                script=script_id).order_by('id').values_list(
+                    'index',
+                    'program__' + program_columns,
+                    'program__' + slave_columns,
+                )
         ]
         filesystems = [
-            ScriptEntryFilesystem.from_query(model, slaves_type,
-                                             filesystem_type)
-            for model in SGFModel.objects.filter(script=script)
+            ScriptEntryFilesystem(index, filesystem, slave)
+            for (index, filesystem, slave) in SGFModel.objects.filter(
+                script=script_id).order_by('id').values_list(
+                    'index',
+                    'filesystem__' + filesystem_columns,
+                    'filesystem__' + slave_columns,
+                )
         ]
 
         return cls(script.name, programs, filesystems)
@@ -186,11 +404,107 @@ class Script:
         script.full_clean()
         script.save()
 
-        for obj in self.programs:
-            obj.save(script)
+        self.save_entries(script)
+
+    @transaction.atomic
+    def save_entries(self, script):
+        """
+        Saves all programs and filesystems of this `Script` as graph entries
+        of `script`. The references are resolved with one query per chunk
+        of 900 references (see `chunked`) and the entries are validated in
+        memory.
+
+        Parameters
+        ----------
+            script: ScriptModel
+                A valid `ScriptModel` which will be the reference for the
+                `ScriptGraphPrograms` and `ScriptGraphFiles`.
+
+        Raises
+        ------
+            SlaveNotExistError
+            ProgramNotExistError
+            FilesystemNotExistError
+            ValidationError:
+                If an entry is in this `Script` twice.
+        """
+        (program_models, filesystem_models) = self.__graph_models(script)
+
+        SGPModel.objects.bulk_create(program_models)
+        SGFModel.objects.bulk_create(filesystem_models)
+
+    @transaction.atomic
+    def update_entries(self, script):
+        """
+        Changes the graph entries of `script` to the programs and filesystems
+        of this `Script`. Only the entries which were added or removed are
+        written, so the cost depends on the size of the change.
+
+        Parameters
+        ----------
+            script: ScriptModel
+                A valid `ScriptModel` which is already saved.
+
+        Returns
+        -------
+            dict:
+                The amount of added and removed `programs` and `filesystems`.
+
+        Raises
+        ------
+            SlaveNotExistError
+            ProgramNotExistError
+            FilesystemNotExistError
+            ValidationError:
+                If an entry is in this `Script` twice.
+        """
+        (program_models, filesystem_models) = self.__graph_models(script)
+
+        return {
+            'programs': apply_graph_diff(script, program_models, 'program'),
+            'filesystems': apply_graph_diff(script, filesystem_models,
+                                            'filesystem'),
+        }
+
+    def __graph_models(self, script):
+        """
+        Resolves all entries of this `Script` and returns the unsaved
+        `ScriptGraphPrograms` and `ScriptGraphFiles` for `script`.
+        """
+        slaves = resolve_slaves(
+            [entry.slave for entry in self.programs + self.filesystems])
+
+        programs = resolve_entries(
+            self.programs,
+            slaves,
+            ProgramModel,
+            'program',
+            ProgramNotExistError,
+        )
+        filesystems = resolve_entries(
+            self.filesystems,
+            slaves,
+            FilesystemModel,
+            'filesystem',
+            FilesystemNotExistError,
+        )
+
+        program_models = [
+            SGPModel(script=script, index=entry.index, program_id=program)
+            for (entry, program) in zip(self.programs, programs)
+        ]
+        filesystem_models = [
+            SGFModel(
+                script=script,
+                index=entry.index,
+                filesystem_id=filesystem,
+            ) for (entry, filesystem) in zip(self.filesystems, filesystems)
+        ]
+
+        ensure_unique(program_models, ('script', 'index', 'program'))
+        ensure_unique(filesystem_models, ('script', 'index', 'filesystem'))
 
-        for obj in self.filesystems:
-            obj.save(script)
+        return (program_models, filesystem_models)
 
     def to_json(self):
         """
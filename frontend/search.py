@@ -0,0 +1,238 @@
+"""
+This module searches the names of the slaves, programs and filesystems in
+memory (e.g. for the autocompletion of the script editor).
+"""
+
+import string
+import threading
+
+# SQLite compares only ASCII letters case-insensitive (`LIKE`), so the index
+# does the same
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# characters which start a new word in a name (e.g. "sim_start")
+WORD_SEPARATORS = ' _-./\\:'
+
+
+def fold(name):
+    """
+    Returns `name` in the form which is compared by the search.
+    """
+    return name.translate(ASCII_LOWER)
+
+
+def trigrams(name):
+    """
+    Returns all substrings of length three of the folded `name`.
+    """
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+
+def rank(name, query):
+    """
+    Ranks how well the folded `name` matches the folded `query`.
+
+    Returns
+    -------
+        int:
+            0 for the whole name, 1 for a prefix, 2 for the prefix of a word
+            in the name and 3 for any other substring.
+    """
+    if name == query:
+        return 0
+    if name.startswith(query):
+        return 1
+
+    index = name.find(query)
+    while index > 0:
+        if name[index - 1] in WORD_SEPARATORS:
+            return 2
+        index = name.find(query, index + 1)
+    return 3
+
+
+class NameIndex:
+    """
+    A thread-safe trigram index for the names of the models. The names of a
+    model are loaded on the first search and kept in sync by the signals of
+    the model (see `NameIndex.update` and `NameIndex.remove`).
+
+    A search finds the same names as `name__contains` without a query, but
+    the best matches come first.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # model -> {id: name}
+        self.__names = {}
+        # model -> {id: folded name}
+        self.__folded = {}
+        # model -> {trigram: set of ids}
+        self.__trigrams = {}
+        # model -> amount of changes (detects changes during a load)
+        self.__changes = {}
+
+    def clear(self):
+        """
+        Thread-safe function.
+
+        Forgets the names of all models (they are loaded again on the next
+        search).
+        """
+        with self.lock:
+            self.__names.clear()
+            self.__folded.clear()
+            self.__trigrams.clear()
+            self.__changes.clear()
+
+    def update(self, model, pk, name):
+        """
+        Thread-safe function.
+
+        Adds or renames one row of `model` (if the names of `model` are
+        loaded).
+
+        Parameters
+        ----------
+            model: Model
+                The class of the model.
+            pk: int
+                The primary key of the row.
+            name: str
+                The (new) name of the row.
+        """
+        with self.lock:
+            self.__changes[model] = self.__changes.get(model, 0) + 1
+
+            if model in self.__names:
+                self.__remove(model, pk)
+                self.__add(model, pk, name)
+
+    def remove(self, model, pk):
+        """
+        Thread-safe function.
+
+        Removes one row of `model` (if the names of `model` are loaded).
+
+        Parameters
+        ----------
+            model: Model
+                The class of the model.
+            pk: int
+                The primary key of the row.
+        """
+        with self.lock:
+            self.__changes[model] = self.__changes.get(model, 0) + 1
+
+            if model in self.__names:
+                self.__remove(model, pk)
+
+    def search(self, model, query):
+        """
+        Thread-safe function.
+
+        Searches all names of `model` which contain `query` (case-insensitive
+        for ASCII letters). The database is only queried if the names of
+        `model` are not loaded yet.
+
+        Parameters
+        ----------
+            model: Model
+                The class of the model.
+            query: str
+                The searched part of the name.
+
+        Returns
+        -------
+            list of str:
+                The matching names. Whole names come first, then prefixes,
+                prefixes of a word and other matches. Matches with the same
+                rank are ordered by their length and alphabetically.
+        """
+        query = fold(query)
+
+        while True:
+            with self.lock:
+                if model in self.__names:
+                    matches = self.__matches(model, query)
+                    break
+                changes = self.__changes.get(model, 0)
+
+            names = list(model.objects.values_list('id', 'name'))
+
+            with self.lock:
+                # a change during the query could be missing in `names`, so
+                # they are only used for this search
+                if changes != self.__changes.get(model, 0):
+                    matches = [(rank(fold(name), query), len(name), name)
+                               for (_, name) in names if query in fold(name)]
+                    break
+
+                # the names are searched in the next iteration (they are
+                # loaded again if the index is cleared in between)
+                if model not in self.__names:
+                    self.__names[model] = {}
+                    self.__folded[model] = {}
+                    self.__trigrams[model] = {}
+
+                    for (pk, name) in names:
+                        self.__add(model, pk, name)
+
+        return [name for (_, _, name) in sorted(matches)]
+
+    def __matches(self, model, query):
+        """
+        Returns the rank, the length and the name of every loaded name of
+        `model` which contains the folded `query`.
+        """
+        names = self.__names[model]
+        folded = self.__folded[model]
+
+        return [(rank(folded[pk], query), len(names[pk]), names[pk])
+                for pk in self.__candidates(model, query)
+                if query in folded[pk]]
+
+    def __candidates(self, model, query):
+        """
+        Returns the ids of the rows which contain all trigrams of `query`
+        (all ids if `query` is shorter than three characters).
+        """
+        postings = sorted(
+            (self.__trigrams[model].get(trigram, set())
+             for trigram in trigrams(query)),
+            key=len,
+        )
+
+        if not postings:
+            return list(self.__names[model])
+
+        return set.intersection(*postings)
+
+    def __add(self, model, pk, name):
+        """
+        Adds one row to the loaded names of `model`.
+        """
+        folded = fold(name)
+
+        self.__names[model][pk] = name
+        self.__folded[model][pk] = folded
+        for trigram in trigrams(folded):
+            self.__trigrams[model].setdefault(trigram, set()).add(pk)
+
+    def __remove(self, model, pk):
+        """
+        Removes one row from the loaded names of `model`.
+        """
+        self.__names[model].pop(pk, None)
+        folded = self.__folded[model].pop(pk, None)
+
+        if folded is not None:
+            for trigram in trigrams(folded):
+                posting = self.__trigrams[model][trigram]
+                posting.discard(pk)
+                if not posting:
+                    del self.__trigrams[model][trigram]
+
+
+# The index which is used by the whole application.
+NAME_INDEX = NameIndex()
@@ -0,0 +1,383 @@
+"""
+This module shuts down the programs, filesystems and clients in phases. Every
+client advances to the next phase as soon as it has confirmed the previous
+one, so a shutdown takes as long as the slowest client needs.
+"""
+
+import logging
+import platform
+import subprocess
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from server.errors import FsimError
+from server.utils import notify
+
+from .models import (
+    Slave as SlaveModel,
+    Program as ProgramModel,
+    Filesystem as FilesystemModel,
+)
+from .controller import (
+    prog_stop,
+    fs_batch,
+    fs_restore_command,
+    slave_shutdown,
+)
+from .livestate import LIVE_STATE
+
+LOGGER = logging.getLogger("fsim.shutdown")
+
+# the phases of a client for every scope (a client is finished after the last
+# phase of its scope)
+SCOPE_PHASES = {
+    'programs': ['programs'],
+    'filesystem': ['programs', 'filesystems'],
+    'clients': ['programs', 'filesystems', 'clients'],
+}
+
+# the phases of the scope which also shuts down the master
+DEFAULT_PHASES = SCOPE_PHASES['clients']
+
+
+class Shutdown:
+    """
+    One shutdown of the given `scope`. Every client passes the phases:
+        programs:
+            Waits until all programs of the client are stopped.
+        filesystems:
+            Restores all moved filesystems of the client and waits until the
+            client has answered for all of them.
+        clients:
+            Shuts the client down and waits until it is disconnected.
+
+    The programs of all clients are stopped at once (see `Shutdown.begin`),
+    the other phases start per client (see `Shutdown.step`). The progress is
+    send to the web interface.
+
+    Parameters
+    ----------
+        scope: str
+            'programs', 'filesystem', 'clients' or anything else (everything
+            including the master).
+        timeouts: dict
+            Seconds a client may stay in a phase (None for the settings).
+    """
+
+    def __init__(self, scope, timeouts=None):
+        if timeouts is None:
+            timeouts = settings.FSIM_SHUTDOWN_TIMEOUTS
+
+        self.scope = scope
+        self.phases = SCOPE_PHASES.get(scope, DEFAULT_PHASES)
+        self.timeouts = timeouts
+        self.start = None
+
+        # slave id -> (phase, time when the phase was entered)
+        self.slaves = {}
+        # filesystems which are restored and not answered yet
+        self.restoring = set()
+
+    @property
+    def includes_master(self):
+        """
+        If the master is shut down after all clients.
+        """
+        return self.scope not in SCOPE_PHASES
+
+    @property
+    def is_finished(self):
+        """
+        If all clients passed all phases.
+        """
+        return all(phase is None for (phase, _) in self.slaves.values())
+
+    def begin(self):
+        """
+        Collects all clients which take part in this shutdown and stops all
+        running programs at once.
+        """
+        self.start = time.monotonic()
+
+        programs = list(ProgramModel.objects.running().select_related('slave'))
+        slave_ids = {program.slave_id for program in programs}
+
+        if 'filesystems' in self.phases:
+            slave_ids.update(FilesystemModel.objects.moved().values_list(
+                'slave_id', flat=True))
+        if 'clients' in self.phases:
+            slave_ids.update(SlaveModel.objects.filter(
+                online=True).values_list('id', flat=True))
+
+        for slave_id in slave_ids:
+            self.slaves[slave_id] = (self.phases[0], self.start)
+
+        for program in programs:
+            try:
+                prog_stop(program)
+            except FsimError as err:
+                LOGGER.warning("Could not stop program %s: %s", program.name,
+                               str(err))
+
+        self.step()
+
+    def step(self):
+        """
+        Advances every client whose phase is confirmed (or timed out). Is
+        called whenever a client has answered.
+
+        Returns
+        -------
+            bool:
+                If all clients are finished.
+        """
+
+        # the volatile state is read with queries
+        LIVE_STATE.flush()
+
+        running = set(ProgramModel.objects.running().values_list(
+            'slave_id', flat=True))
+        restoring = set()
+        for (filesystem_id, slave_id) in FilesystemModel.objects.moved(
+        ).filter(error_code='').values_list('id', 'slave_id'):
+            if filesystem_id in self.restoring:
+                restoring.add(slave_id)
+        online = set(SlaveModel.objects.filter(online=True).values_list(
+            'id', flat=True))
+
+        waiting = {
+            'programs': running,
+            'filesystems': restoring,
+            'clients': online,
+        }
+
+        clock = time.monotonic()
+
+        for (slave_id, (phase, entered)) in list(self.slaves.items()):
+            if phase is None:
+                continue
+
+            if slave_id in waiting[phase]:
+                if clock - entered < self.timeouts[phase]:
+                    continue
+
+                LOGGER.warning(
+                    "Client %s did not confirm the phase %s in time.",
+                    slave_id,
+                    phase,
+                )
+
+            # phases without commands for the client are skipped
+            phase = self.__advance(slave_id, phase)
+            while phase is not None and not self.__enter(slave_id, phase):
+                phase = self.__advance(slave_id, phase)
+
+        return self.is_finished
+
+    def next_timeout(self):
+        """
+        Returns
+        -------
+            float or None:
+                Seconds until the next phase times out (None if all clients
+                are finished).
+        """
+        deadlines = [
+            entered + self.timeouts[phase]
+            for (phase, entered) in self.slaves.values() if phase is not None
+        ]
+
+        if not deadlines:
+            return None
+
+        return max(0, min(deadlines) - time.monotonic())
+
+    def progress(self):
+        """
+        Returns
+        -------
+            dict:
+                The amount of clients in every phase and the finished clients.
+        """
+        progress = {phase: 0 for phase in self.phases}
+        progress['finished'] = 0
+
+        for (phase, _) in self.slaves.values():
+            progress['finished' if phase is None else phase] += 1
+
+        return progress
+
+    def __advance(self, slave_id, phase):
+        """
+        Returns the phase after `phase` (None if the client is finished) and
+        reports the progress to the web interface.
+        """
+        index = self.phases.index(phase) + 1
+        following = self.phases[index] if index < len(self.phases) else None
+
+        self.slaves[slave_id] = (following, time.monotonic())
+
+        notify({
+            'shutdown_status': 'progress',
+            'sid': str(slave_id),
+            'phase': phase,
+            'progress': self.progress(),
+        })
+
+        return following
+
+    def __enter(self, slave_id, phase):
+        """
+        Sends the commands of `phase` to the client.
+
+        Returns
+        -------
+            bool:
+                If the client has to confirm the phase.
+        """
+        confirm = False
+
+        if phase == 'filesystems':
+            # all restores are send in one command
+            errors = fs_batch(
+                list(FilesystemModel.objects.moved().filter(
+                    slave=slave_id).select_related('slave')),
+                fs_restore_command,
+            )
+
+            for (filesystem_id, err) in errors.items():
+                if err is None:
+                    self.restoring.add(filesystem_id)
+                    confirm = True
+                else:
+                    LOGGER.warning("Could not restore filesystem %s: %s",
+                                   filesystem_id, str(err))
+        elif phase == 'clients':
+            try:
+                slave_shutdown(SlaveModel.objects.get(id=slave_id))
+                confirm = True
+            except FsimError as err:
+                LOGGER.warning("Could not shut down client %s: %s", slave_id,
+                               str(err))
+
+        return confirm
+
+
+class ShutdownOrchestrator:
+    """
+    Runs at most one `Shutdown` at a time in its own thread. The thread waits
+    for `ShutdownOrchestrator.notify` (or the next timeout) between the steps
+    instead of fixed delays.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.__shutdown = None
+        self.__notified = False
+
+    def is_running(self):
+        """
+        Thread-safe function.
+
+        Returns
+        -------
+            bool:
+                If a shutdown is in progress.
+        """
+        with self.lock:
+            return self.__shutdown is not None
+
+    def start(self, scope):
+        """
+        Thread-safe function.
+
+        Starts a shutdown of `scope` in a new thread.
+
+        Parameters
+        ----------
+            scope: str
+                The scope of the shutdown (see `Shutdown`).
+
+        Returns
+        -------
+            bool:
+                False if a shutdown is already in progress.
+        """
+        with self.lock:
+            if self.__shutdown is not None:
+                return False
+
+            self.__shutdown = Shutdown(scope)
+            self.__notified = False
+
+        threading.Thread(
+            target=self.__run,
+            args=(self.__shutdown, ),
+            daemon=True,
+        ).start()
+        return True
+
+    def notify(self):
+        """
+        Thread-safe function.
+
+        Wakes the running shutdown up, because a client has answered.
+        """
+        with self.lock:
+            self.__notified = True
+            self.changed.notify_all()
+
+    def __wait(self, timeout):
+        """
+        Waits until `notify` is called or `timeout` seconds passed.
+        """
+        with self.lock:
+            if not self.__notified:
+                self.changed.wait(timeout)
+            self.__notified = False
+
+    def __run(self, shutdown):
+        """
+        Runs `shutdown` until all clients are finished. The master is only
+        shut down if the shutdown of the clients did not fail.
+        """
+        finished = False
+
+        try:
+            shutdown.begin()
+
+            while not shutdown.is_finished:
+                self.__wait(shutdown.next_timeout())
+                shutdown.step()
+
+            finished = True
+            duration = time.monotonic() - shutdown.start
+            LOGGER.info("Shutdown of scope %s finished after %.1f seconds.",
+                        shutdown.scope, duration)
+            notify({
+                'shutdown_status': 'finished',
+                'scope': shutdown.scope,
+                'duration': round(duration, 1),
+            })
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.error("Shutdown of scope %s failed: %s", shutdown.scope,
+                         str(err))
+        finally:
+            close_old_connections()
+
+            with self.lock:
+                self.__shutdown = None
+
+        if finished and shutdown.includes_master:  # pragma: no cover
+            if platform.system() == "Windows":
+                subprocess.run(['shutdown', '-s', '-t', '0'])
+            else:
+                subprocess.run(['shutdown', '-h now'])
+
+
+# The orchestrator which is used by the whole application.
+SHUTDOWN = ShutdownOrchestrator()
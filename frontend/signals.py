@@ -0,0 +1,87 @@
+"""
+This module contains the receivers for the signals of the models.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Script as ScriptModel
+from .search import NAME_INDEX
+
+# changes of these fields change the exported scripts
+EXPORTED_FIELDS = {'name', 'slave'}
+
+
+def is_export_change(created, update_fields):
+    """
+    Checks if a saved `Program`, `Filesystem` or `Slave` could change an
+    exported `Script`.
+
+    Parameters
+    ----------
+        created: bool
+            If the row was created (no `Script` references it yet).
+        update_fields: frozenset or None
+            The fields which were saved (None for all fields).
+
+    Returns
+    -------
+        bool:
+            If the versions of the referencing `Script`s have to change.
+    """
+    if created:
+        return False
+    return update_fields is None or bool(EXPORTED_FIELDS & update_fields)
+
+
+def program_changed(sender, instance, created=False, update_fields=None,
+                    **kwargs):
+    """
+    Changes the version of every `Script` which references the saved or
+    deleted `Program`.
+    """
+    if is_export_change(created, update_fields):
+        ScriptModel.touch(scriptgraphprograms__program=instance.pk)
+
+
+def filesystem_changed(sender, instance, created=False, update_fields=None,
+                       **kwargs):
+    """
+    Changes the version of every `Script` which references the saved or
+    deleted `Filesystem`.
+    """
+    if is_export_change(created, update_fields):
+        ScriptModel.touch(scriptgraphfiles__filesystem=instance.pk)
+
+
+def slave_changed(sender, instance, created=False, update_fields=None,
+                  **kwargs):
+    """
+    Changes the version of every `Script` which references a `Program` or
+    `Filesystem` of the saved or deleted `Slave`.
+    """
+    if is_export_change(created, update_fields):
+        ScriptModel.touch(
+            Q(scriptgraphprograms__program__slave=instance.pk)
+            | Q(scriptgraphfiles__filesystem__slave=instance.pk))
+
+
+def name_saved(sender, instance, update_fields=None, **kwargs):
+    """
+    Adds the saved `Program`, `Filesystem` or `Slave` to the `NAME_INDEX`
+    after the transaction is committed (a rolled back name never reaches the
+    index).
+    """
+    if update_fields is None or 'name' in update_fields:
+        (pk, name) = (instance.pk, instance.name)
+        transaction.on_commit(lambda: NAME_INDEX.update(sender, pk, name))
+
+
+def name_deleted(sender, instance, **kwargs):
+    """
+    Removes the deleted `Program`, `Filesystem` or `Slave` from the
+    `NAME_INDEX` after the transaction is committed.
+    """
+    # the primary key of the instance is cleared after the deletion
+    pk = instance.pk
+    transaction.on_commit(lambda: NAME_INDEX.remove(sender, pk))
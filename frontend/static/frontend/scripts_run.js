@@ -47,6 +47,14 @@ const socketEventHandler = {
         timestamp.removeAttr('data-timestamp');
         timestamp.attr('data-timestamp', now);
     },
+    programReady(payload) {
+        let statusContainer = $('#programStatusContainer_' + payload.pid);
+
+        // a late ready message does not change a stopped program
+        if (statusContainer.attr('data-state') === 'running') {
+            statusContainer.attr('data-state', 'ready');
+        }
+    },
     programStopped(payload) {
         let statusContainer = $('#programStatusContainer_' + payload.pid);
 
@@ -157,6 +157,14 @@ const socketEventHandler = {
             swapText($(val));
         });
     },
+    programReady(payload) {
+        let statusContainer = $('#programStatusContainer_' + payload.pid);
+
+        // a late ready message does not change a stopped program
+        if (statusContainer.attr('data-state') === 'running') {
+            statusContainer.attr('data-state', 'ready');
+        }
+    },
     programStopped(payload) {
         let statusContainer = $('#programStatusContainer_' + payload.pid);
         let startstopButton = $('#programStartStop_' + payload.pid);
@@ -407,6 +415,8 @@ $(document).ready(function () {
         programForm.find('[name="name"]').val('');
         programForm.find('[name="path"]').val('');
         programForm.find('[name="arguments"]').val('');
+        programForm.find('[name="ready_pattern"]').val('');
+        programForm.find('[name="ready_port"]').val('');
 
         //clear error messages
         clearErrorMessages(programForm);
@@ -428,6 +438,8 @@ $(document).ready(function () {
         let path = $(this).data('program-path');
         let args = $(this).data('program-arguments');
         let startTime = $(this).data('program-start-time');
+        let readyPattern = $(this).attr('data-program-ready-pattern');
+        let readyPort = $(this).data('program-ready-port');
 
         //modify the form for the submit button
         programModal.children().find('.modal-title').text('Edit Program');
@@ -440,6 +452,8 @@ $(document).ready(function () {
         programForm.find('[name="path"]').val(path);
         programForm.find('[name="arguments"]').val(args);
         programForm.find('[name="start_time"]').val(startTime);
+        programForm.find('[name="ready_pattern"]').val(readyPattern);
+        programForm.find('[name="ready_port"]').val(readyPort);
 
         //clear error messages
         clearErrorMessages(programForm);
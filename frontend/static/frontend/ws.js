@@ -44,7 +44,17 @@ function fsimWebsocket(socketEventHandler) {
                         callMaybe(socketEventHandler, 'slaveConnect', status.payload);
                         break;
                     case 'disconnected':
-                        callMaybe(socketEventHandler, 'slaveDisconnect', status.payload);
+                        if (status.payload.sids != null) {
+                            // multiple slaves disconnected at once
+                            status.payload.sids.forEach(function (sid) {
+                                callMaybe(socketEventHandler, 'slaveDisconnect', {
+                                    slave_status: status.payload.slave_status,
+                                    sid: sid,
+                                });
+                            });
+                        } else {
+                            callMaybe(socketEventHandler, 'slaveDisconnect', status.payload);
+                        }
                         break;
                     default:
                         notify('Warning message', 'Unknown slave_status received (' + JSON.stringify(status.payload.message) + ')', 'info');
@@ -58,6 +68,9 @@ function fsimWebsocket(socketEventHandler) {
                     case 'finished':
                         callMaybe(socketEventHandler, 'programStopped', status.payload);
                         break;
+                    case 'ready':
+                        callMaybe(socketEventHandler, 'programReady', status.payload);
+                        break;
                     default:
                         notify('Warning message', 'Unknown program_status received (' + JSON.stringify(status.payload.message) + ')', 'info');
                 }
@@ -97,6 +110,18 @@ function fsimWebsocket(socketEventHandler) {
                         notify('Unknown message', 'Unknown filesystem_status received (' + JSON.stringify(status.payload.message) + ')', 'info');
                 }
 
+            } else if (status.payload.shutdown_status != null) {
+                // handle the progress of a shutdown
+                switch (status.payload.shutdown_status) {
+                    case 'progress':
+                        callMaybe(socketEventHandler, 'shutdownProgress', status.payload);
+                        break;
+                    case 'finished':
+                        notify('Shutdown', 'Finished after ' + status.payload.duration + ' seconds.', 'info');
+                        break;
+                    default:
+                        notify('Unknown message', 'Unknown shutdown_status received (' + JSON.stringify(status.payload.message) + ')', 'info');
+                }
             } else if (status.payload.message != null) {
                 notify('Info message', JSON.stringify(status.payload.message), 'info');
             } else {
@@ -0,0 +1,141 @@
+"""
+Test file for admission.py module.
+"""
+# pylint: disable=missing-docstring,too-many-public-methods
+
+import json
+
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from channels.sessions import session_for_reply_channel
+from channels.test import WSClient
+
+from utils import Command
+
+from frontend.admission import SLAVE_INDEX
+
+from .factory import SlaveFactory
+from .testcases import reset_runtime_state
+
+
+class SlaveIndexTests(TestCase):
+    def setUp(self):
+        reset_runtime_state()
+
+    def tearDown(self):
+        reset_runtime_state()
+
+    def connect(self, ip_address):
+        ws_client = WSClient()
+        ws_client.send_and_consume(
+            'websocket.connect',
+            path='/commands',
+            content={'client': [ip_address, 0]},
+        )
+        return ws_client
+
+    def test_lookup(self):
+        slave = SlaveFactory()
+
+        self.assertEqual(
+            (slave.id, slave.name),
+            SLAVE_INDEX.lookup(slave.ip_address),
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                (slave.id, slave.name),
+                SLAVE_INDEX.lookup(slave.ip_address),
+            )
+
+    def test_lookup_invalidated(self):
+        slave = SlaveFactory()
+
+        def invalidate(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            SLAVE_INDEX.invalidate()
+            return result
+
+        # the slave is changed while it is loaded
+        with connection.execute_wrapper(invalidate):
+            self.assertEqual(
+                (slave.id, slave.name),
+                SLAVE_INDEX.lookup(slave.ip_address),
+            )
+
+        with self.assertNumQueries(1):
+            SLAVE_INDEX.lookup(slave.ip_address)
+
+    def test_lookup_not_exist(self):
+        slave = SlaveFactory.build()
+        self.assertIsNone(SLAVE_INDEX.lookup(slave.ip_address))
+
+    def test_connect_without_queries(self):
+        slave = SlaveFactory()
+        SLAVE_INDEX.lookup(slave.ip_address)
+
+        with self.assertNumQueries(0):
+            ws_client = self.connect(slave.ip_address)
+
+        cmd = Command.from_json(json.dumps(ws_client.receive()))
+        self.assertEqual(cmd.method, 'online')
+        self.assertTrue(SLAVE_INDEX.is_online_requested(cmd.uuid))
+
+    def test_invalidate_slave_put(self):
+        slave = SlaveFactory()
+        new_ip = SlaveFactory.build().ip_address
+        SLAVE_INDEX.lookup(slave.ip_address)
+
+        response = self.client.put(
+            reverse('frontend:slave_entry', args=[slave.id]),
+            data=urlencode({
+                'name': slave.name,
+                'ip_address': new_ip,
+                'mac_address': slave.mac_address,
+            }),
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertIsNone(SLAVE_INDEX.lookup(slave.ip_address))
+        self.assertEqual((slave.id, slave.name), SLAVE_INDEX.lookup(new_ip))
+
+    def test_invalidate_slave_delete(self):
+        slave = SlaveFactory()
+        SLAVE_INDEX.lookup(slave.ip_address)
+
+        response = self.client.delete(
+            reverse('frontend:slave_entry', args=[slave.id]))
+        self.assertEqual(response.status_code, 200)
+
+        self.assertRaisesMessage(
+            AssertionError,
+            "Connection rejected: {'accept': False} != '{accept: True}'",
+            self.connect,
+            slave.ip_address,
+        )
+
+    def test_disconnect_session_deleted(self):
+        slave = SlaveFactory()
+        ws_client = self.connect(slave.ip_address)
+        ws_client.receive()
+
+        session = session_for_reply_channel(ws_client.reply_channel)
+        self.assertEqual(slave.id, session['slave_id'])
+
+        ws_client.send_and_consume('websocket.disconnect', path='/commands')
+
+        session = session_for_reply_channel(ws_client.reply_channel)
+        self.assertFalse(session.exists(session.session_key))
+
+    def test_cancel_online(self):
+        slave = SlaveFactory()
+        SLAVE_INDEX.request_online('a' * 32, (slave.id, slave.name))
+        SLAVE_INDEX.request_online('b' * 32, (slave.id + 1, slave.name))
+
+        SLAVE_INDEX.cancel_online([slave.id])
+
+        self.assertFalse(SLAVE_INDEX.is_online_requested('a' * 32))
+        self.assertTrue(SLAVE_INDEX.is_online_requested('b' * 32))
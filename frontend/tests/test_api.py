@@ -24,16 +24,21 @@ def test_<API>_<HTTP METHOD>_<LIST>:
 
 import json
 import os
+from datetime import timedelta
 
 from urllib.parse import urlencode
 from shlex import split
 
 from django.urls import reverse
+from django.utils.timezone import now
 from channels.test import WSClient
 
 from utils import Status, Command
 
 from frontend.scripts import Script, ScriptEntryFilesystem, ScriptEntryProgram
+from frontend.tracker import COMMANDS
+from frontend.shutdown import ShutdownOrchestrator
+from frontend import api
 
 from frontend.models import (
     Script as ScriptModel,
@@ -43,6 +48,7 @@ from frontend.models import (
     Filesystem as FilesystemModel,
     Program as ProgramModel,
     ProgramStatus as ProgramStatusModel,
+    ProgramRun as ProgramRunModel,
 )
 
 from frontend.errors import (
@@ -54,6 +60,7 @@ from frontend.errors import (
     FilesystemMovedError,
     FilesystemNotMovedError,
     FilesystemNotExistError,
+    FilesystemDestinationError,
     FilesystemDeleteError,
     SimultaneousQueryError,
     LogNotExistError,
@@ -76,7 +83,7 @@ from .factory import (
     ProgramStatusFactory,
 )
 
-from .testcases import StatusTestCase
+from .testcases import StatusTestCase, run_on_commit
 
 
 class ScriptTest(StatusTestCase):
@@ -309,6 +316,110 @@ class ScriptTest(StatusTestCase):
             Status.from_json(response.content.decode('utf-8')),
         )
 
+    def test_entry_get_cached(self):
+        slave = SlaveFactory()
+        program = ProgramFactory(slave=slave)
+        script = Script(
+            ScriptFactory.build().name,
+            [ScriptEntryProgram(0, program.id, slave.id)],
+            [],
+        )
+        script.save()
+        db_script = ScriptModel.objects.get(name=script.name)
+        url = reverse("frontend:script_entry", args=[db_script.id])
+
+        self.client.get(url, {'programs': 'str'})
+
+        # only the version is read
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'programs': 'str'})
+
+        script.programs[0].program = program.name
+        self.assertEqual(
+            Status.ok(dict(script)),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+        # a renamed program changes the version of the script
+        program.name = program.name + '_renamed'
+        program.save()
+        self.assertNotEqual(
+            db_script.version,
+            ScriptModel.objects.get(id=db_script.id).version,
+        )
+
+        response = self.client.get(url, {'programs': 'str'})
+        script.programs[0].program = program.name
+        self.assertEqual(
+            Status.ok(dict(script)),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_entry_get_etag(self):
+        script = ScriptFactory()
+        sgp = SGPFactory(script=script)
+        url = reverse("frontend:script_entry", args=[script.id])
+
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        etag = response['ETag']
+
+        # only the version is read
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, response['ETag'])
+        self.assertEqual(b'', response.content)
+
+        response = self.client.get(
+            url, {'programs': 'str'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+
+        # the key types are validated before the ETag is compared
+        response = self.client.get(
+            url,
+            {'slaves': 'float'},
+            HTTP_IF_NONE_MATCH=etag.replace('-int-', '-float-', 1),
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertStatusRegex(
+            Status.err(QueryParameterError),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+        # deleting a referenced program changes the version
+        sgp.program.delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+        self.assertEqual(
+            Status.ok(dict(Script(script.name, [], []))),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_entry_put_version(self):
+        script = ScriptFactory()
+        SGPFactory(script=script)
+        script_script = Script.from_model(script.id, "int", "int", "int")
+        version = ScriptModel.objects.get(id=script.id).version
+
+        # an update without a change keeps the version
+        self.client.put(
+            reverse("frontend:script_entry", args=[script.id]),
+            data=json.dumps(dict(script_script)),
+        )
+        self.assertEqual(version,
+                         ScriptModel.objects.get(id=script.id).version)
+
+        script_script.programs = []
+        self.client.put(
+            reverse("frontend:script_entry", args=[script.id]),
+            data=json.dumps(dict(script_script)),
+        )
+        self.assertNotEqual(version,
+                            ScriptModel.objects.get(id=script.id).version)
+
     def test_entry_get_type_error(self):
         response = self.client.get(
             reverse("frontend:script_entry", args=[0]),
@@ -364,8 +475,18 @@ class ScriptTest(StatusTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+        # nothing changed
         self.assertEqual(
-            Status.ok(""),
+            Status.ok({
+                'programs': {
+                    'added': 0,
+                    'removed': 0
+                },
+                'filesystems': {
+                    'added': 0,
+                    'removed': 0
+                },
+            }),
             Status.from_json(response.content.decode('utf-8')),
         )
 
@@ -387,13 +508,48 @@ class ScriptTest(StatusTestCase):
         self.assertEqual(response.status_code, 200)
 
         self.assertEqual(
-            Status.ok(""),
+            Status.ok({
+                'programs': {
+                    'added': 0,
+                    'removed': 0
+                },
+                'filesystems': {
+                    'added': 1,
+                    'removed': 0
+                },
+            }),
             Status.from_json(response.content.decode('utf-8')),
         )
 
         new_script_script = Script.from_model(script.id, "str", "str", "str")
         self.assertEqual(script_script, new_script_script)
 
+    def test_entry_put_not_exist_unchanged(self):
+        script = ScriptFactory()
+        SGPFactory(script=script)
+        SGFFactory(script=script)
+        script_script = Script.from_model(script.id, "int", "int", "int")
+
+        changed = Script.from_model(script.id, "int", "int", "int")
+        changed.programs[0].program = -1
+
+        response = self.client.put(
+            reverse("frontend:script_entry", args=[script.id]),
+            data=json.dumps(dict(changed)),
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertStatusRegex(
+            Status.err(ProgramNotExistError),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+        # the failed update is rolled back
+        self.assertEqual(
+            script_script,
+            Script.from_model(script.id, "int", "int", "int"),
+        )
+
     def test_entry_put_exist(self):
         script = ScriptFactory()
         script2 = ScriptFactory()
@@ -675,6 +831,62 @@ class ScriptTest(StatusTestCase):
             reverse('frontend:script_copy', args=['0']))
         self.assertEqual(403, response.status_code)
 
+    def test_copy_set_post_success(self):
+        scripts = [ScriptFactory() for _ in range(3)]
+        for script in scripts:
+            for index in range(10):
+                SGPFactory(script=script, index=index)
+                SGFFactory(script=script, index=index)
+
+        ScriptFactory(name=scripts[0].name + '_copy')
+        script_ids = [scripts[0].id, scripts[1].id, scripts[2].id, scripts[0].id]
+
+        # the amount of queries does not depend on the amount of scripts and
+        # graph entries
+        with self.assertNumQueries(10):
+            response = self.client.post(
+                reverse('frontend:script_copy_set'),
+                {'scripts': script_ids},
+            )
+        self.assertEqual(response.status_code, 200)
+
+        names = [
+            scripts[0].name + '_copy_1',
+            scripts[1].name + '_copy',
+            scripts[2].name + '_copy',
+            scripts[0].name + '_copy_2',
+        ]
+        copies = Status.from_json(response.content.decode('utf-8')).payload
+        self.assertEqual(names, [copy['name'] for copy in copies])
+        self.assertEqual(script_ids, [copy['script'] for copy in copies])
+
+        for (script_id, copy) in zip(script_ids, copies):
+            self.assertEqual(
+                dict(Script.from_model(script_id, "int", "int", "int"),
+                     name=copy['name']),
+                dict(Script.from_model(copy['id'], "int", "int", "int")),
+            )
+
+    def test_copy_set_post_not_exist(self):
+        script = ScriptFactory()
+
+        response = self.client.post(
+            reverse('frontend:script_copy_set'),
+            {'scripts': [script.id, 0]},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertStatusRegex(
+            Status.err(ScriptNotExistError),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+        self.assertFalse(
+            ScriptModel.objects.filter(name=script.name + '_copy').exists())
+
+    def test_copy_set_get_forbidden(self):
+        response = self.client.get(reverse('frontend:script_copy_set'))
+        self.assertEqual(403, response.status_code)
+
     def test_run_put_forbidden(self):
         response = self.client.put(reverse("frontend:script_run", args=[0]))
         self.assertEqual(response.status_code, 403)
@@ -989,6 +1201,30 @@ class FilesystemTests(StatusTestCase):
             Status.ok(slaves),
         )
 
+    def test_set_get_page_success(self):
+        filesystems = FileFactory.create_batch(3)
+
+        response = self.client.get(
+            reverse('frontend:filesystem_set'),
+            {
+                'limit': 1,
+                'cursor': str(filesystems[0].id),
+                'fields': 'id,error_code',
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            Status.ok({
+                'results': [{
+                    'id': filesystems[1].id,
+                    'error_code': '',
+                }],
+                'next': str(filesystems[1].id),
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
     def test_set_get_query_identifier_error(self):
         response = self.client.get(
             reverse("frontend:filesystem_set"),
@@ -1232,6 +1468,128 @@ class FilesystemTests(StatusTestCase):
             Command.from_json(json.dumps(ws_client.receive())),
         )
 
+    def test_restore_set_post_success(self):
+        slave = SlaveFactory(online=True)
+        filesystems = [MovedFileFactory(slave=slave) for _ in range(2)]
+        other = MovedFileFactory(slave=SlaveFactory(online=True))
+        not_moved = FileFactory(slave=slave)
+
+        ws_client = WSClient()
+        ws_client.join_group('client_' + str(slave.id))
+        ws_other = WSClient()
+        ws_other.join_group('client_' + str(other.slave.id))
+
+        filesystem_ids = [
+            filesystems[0].id, other.id, not_moved.id, 0, filesystems[1].id
+        ]
+
+        response = self.client.post(
+            reverse("frontend:filesystem_restore_set"),
+            {'filesystems': filesystem_ids},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        results = Status.from_json(response.content.decode('utf-8')).payload
+        self.assertEqual(filesystem_ids, [result['id'] for result in results])
+        self.assertEqual(['ok', 'ok', 'err', 'err', 'ok'],
+                         [result['status'] for result in results])
+        self.assertRegex(results[2]['payload'],
+                         FilesystemNotMovedError.regex_string())
+        self.assertRegex(results[3]['payload'],
+                         FilesystemNotExistError.regex_string())
+
+        # one command per slave
+        chain = Command.from_json(json.dumps(ws_client.receive()))
+        self.assertEqual('chain_execution', chain.method)
+        self.assertEqual(
+            [
+                FilesystemModel.objects.get(id=filesystem.id).command_uuid
+                for filesystem in filesystems
+            ],
+            [command['uuid'] for command in chain.arguments['commands']],
+        )
+        self.assertIsNone(ws_client.receive())
+
+        self.assertEqual(
+            'filesystem_restore',
+            Command.from_json(json.dumps(ws_other.receive())).method,
+        )
+
+    def test_move_set_post_success(self):
+        slave = SlaveFactory(online=True)
+        filesystems = [FileFactory(slave=slave) for _ in range(3)]
+
+        ws_client = WSClient()
+        ws_client.join_group('client_' + str(slave.id))
+
+        response = self.client.post(
+            reverse("frontend:filesystem_move_set"),
+            {'filesystems': [filesystem.id for filesystem in filesystems]},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        results = Status.from_json(response.content.decode('utf-8')).payload
+        self.assertEqual(['ok'] * 3, [result['status'] for result in results])
+
+        chain = Command.from_json(json.dumps(ws_client.receive()))
+        self.assertEqual(
+            ['filesystem_move'] * 3,
+            [command['method'] for command in chain.arguments['commands']],
+        )
+
+    def test_move_set_post_same_destination(self):
+        slave = SlaveFactory(online=True)
+        first = FileFactory(
+            slave=slave,
+            source_path='/home/sim/config.ini',
+            destination_path='/etc/sim',
+            destination_type='dir',
+        )
+        second = FileFactory(
+            slave=slave,
+            destination_path=os.path.join('/etc/sim', 'config.ini'),
+        )
+        other = FileFactory(
+            slave=SlaveFactory(online=True),
+            destination_path=second.destination_path,
+        )
+
+        ws_client = WSClient()
+        ws_client.join_group('client_' + str(slave.id))
+
+        response = self.client.post(
+            reverse("frontend:filesystem_move_set"),
+            {'filesystems': [first.id, second.id, other.id]},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        results = Status.from_json(response.content.decode('utf-8')).payload
+        self.assertEqual(['ok', 'err', 'ok'],
+                         [result['status'] for result in results])
+        self.assertRegex(results[1]['payload'],
+                         FilesystemDestinationError.regex_string())
+
+        # only the first filesystem is moved
+        cmd = Command.from_json(json.dumps(ws_client.receive()))
+        self.assertEqual('filesystem_move', cmd.method)
+        self.assertEqual(first.source_path, cmd.arguments['source_path'])
+        self.assertIsNone(ws_client.receive())
+
+    def test_move_set_post_value_error(self):
+        response = self.client.post(
+            reverse("frontend:filesystem_move_set"),
+            {'filesystems': ['a']},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            'err',
+            Status.from_json(response.content.decode('utf-8')).status,
+        )
+
+    def test_move_set_get_forbidden(self):
+        response = self.client.get(reverse("frontend:filesystem_move_set"))
+        self.assertEqual(response.status_code, 403)
+
     def test_restore_put_forbidden(self):
         response = self.client.put(
             reverse("frontend:filesystem_restore", args=['0']))
@@ -1526,6 +1884,30 @@ class ProgramTests(StatusTestCase):
             Status.ok(slaves),
         )
 
+    def test_set_get_page_success(self):
+        program = ProgramFactory()
+
+        response = self.client.get(
+            reverse('frontend:program_set'),
+            {
+                'slave': str(program.slave.id),
+                'fields': 'name,path,slave',
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            Status.ok({
+                'results': [{
+                    'name': program.name,
+                    'path': program.path,
+                    'slave': program.slave.id,
+                }],
+                'next': None,
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
     def test_set_get_query_identifier_error(self):
         response = self.client.get(
             reverse("frontend:program_set"),
@@ -1751,6 +2133,54 @@ class ProgramTests(StatusTestCase):
             Status.from_json(response.content.decode('utf-8')),
         )
 
+    def test_start_set_post_success(self):
+        slave = SlaveOnlineFactory()
+        programs = [ProgramFactory(slave=slave) for _ in range(2)]
+        offline = ProgramFactory()
+
+        client = WSClient()
+        client.join_group("client_" + str(slave.id))
+
+        program_ids = [programs[0].id, offline.id, 0, programs[1].id]
+
+        response = self.client.post(
+            reverse('frontend:program_start_set'),
+            {'programs': program_ids + [programs[0].id]},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        # duplicates are started once
+        results = Status.from_json(response.content.decode('utf-8')).payload
+        self.assertEqual(program_ids, [result['id'] for result in results])
+        self.assertEqual(['ok', 'err', 'err', 'ok'],
+                         [result['status'] for result in results])
+        self.assertRegex(results[1]['payload'],
+                         SlaveOfflineError.regex_string())
+        self.assertRegex(results[2]['payload'],
+                         ProgramNotExistError.regex_string())
+
+        self.assertEqual(
+            [program.id for program in programs],
+            [
+                Command.from_json(json.dumps(client.receive())).arguments[
+                    'pid'] for _ in programs
+            ],
+        )
+        self.assertIsNone(client.receive())
+
+        # the running programs can be stopped
+        response = self.client.post(
+            reverse('frontend:program_stop_set'),
+            {'programs': program_ids},
+        )
+        results = Status.from_json(response.content.decode('utf-8')).payload
+        self.assertEqual(['ok', 'err', 'err', 'ok'],
+                         [result['status'] for result in results])
+
+    def test_start_set_get_forbidden(self):
+        response = self.client.get(reverse('frontend:program_start_set'))
+        self.assertEqual(response.status_code, 403)
+
     def test_start_post_success(self):
         slave = SlaveOnlineFactory()
         program = ProgramFactory(slave=slave)
@@ -1797,6 +2227,42 @@ class ProgramTests(StatusTestCase):
         #  test if the programstatus entry exists
         self.assertTrue(ProgramStatusModel.objects.filter())
 
+        #  test if the run was added to the history
+        run = ProgramRunModel.objects.get(command_uuid=cmd.uuid)
+        self.assertEqual(slave.id, run.slave_id)
+        self.assertIsNone(run.end)
+
+    def test_start_post_ready_probe(self):
+        slave = SlaveOnlineFactory()
+        program = ProgramFactory(
+            slave=slave,
+            ready_pattern='listening',
+            ready_port=8080,
+        )
+
+        client = WSClient()
+        client.join_group("client_" + str(slave.id))
+
+        response = self.client.post(
+            reverse('frontend:program_start', args=[program.id]))
+        self.assertEqual(response.status_code, 200)
+
+        cmd = Command.from_json(json.dumps(client.receive()))
+        self.assertEqual(
+            Command(
+                pid=program.id,
+                own_uuid=cmd.uuid,
+                method='execute',
+                path=program.path,
+                arguments=split(program.arguments),
+                ready={
+                    'pattern': 'listening',
+                    'port': 8080
+                },
+            ),
+            cmd,
+        )
+
     def test_start_post_not_exist(self):
         response = self.client.post(
             reverse('frontend:program_start', args=[0]))
@@ -2087,6 +2553,149 @@ class ProgramTests(StatusTestCase):
             reverse('frontend:program_log_enable', args=[0]))
         self.assertEqual(response.status_code, 403)
 
+    def test_runs_get_success(self):
+        program = ProgramFactory()
+        start = now()
+
+        for (uuid, seconds) in [('a', 1), ('b', 3), ('c', None)]:
+            ProgramRunModel.objects.create(
+                program=program,
+                slave=program.slave,
+                command_uuid=uuid,
+                start=start,
+            )
+            if seconds is not None:
+                ProgramRunModel.finish(uuid, 0,
+                                       start + timedelta(seconds=seconds))
+
+        response = self.client.get(
+            reverse('frontend:program_runs', args=[program.id]),
+            {'limit': 2},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        payload = Status.from_json(response.content.decode('utf-8')).payload
+        self.assertEqual(2, payload['statistics']['runs'])
+        self.assertEqual(2, payload['statistics']['mean'])
+        self.assertEqual(3, payload['statistics']['max'])
+        self.assertEqual(2, len(payload['runs']))
+
+    def test_runs_get_empty(self):
+        program = ProgramFactory()
+
+        response = self.client.get(
+            reverse('frontend:program_runs', args=[program.id]))
+        self.assertEqual(response.status_code, 200)
+
+        payload = Status.from_json(response.content.decode('utf-8')).payload
+        self.assertEqual(0, payload['statistics']['runs'])
+        self.assertIsNone(payload['statistics']['p50'])
+        self.assertEqual([], payload['runs'])
+
+    def test_runs_get_not_exist(self):
+        response = self.client.get(
+            reverse('frontend:program_runs', args=[0]))
+        self.assertEqual(response.status_code, 200)
+
+        self.assertStatusRegex(
+            Status.err(ProgramNotExistError),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_runs_post_forbidden(self):
+        response = self.client.post(
+            reverse('frontend:program_runs', args=[0]))
+        self.assertEqual(response.status_code, 403)
+
+    def create_ready_runs(self, program, seconds):
+        start = now()
+
+        for (i, second) in enumerate(seconds):
+            ProgramRunModel.objects.create(
+                program=program,
+                slave=program.slave,
+                command_uuid=str(i),
+                start=start,
+            )
+            ProgramRunModel.mark_ready(str(i),
+                                       start + timedelta(seconds=second))
+            ProgramRunModel.finish(str(i), 0, start + timedelta(seconds=second))
+
+    def test_start_time_get_suggestion(self):
+        program = ProgramFactory(start_time=30)
+        self.create_ready_runs(program, [2, 3, 4, 3.5, 2])
+
+        response = self.client.get(
+            reverse('frontend:program_start_time', args=[program.id]))
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            Status.ok({
+                'start_time': 30,
+                'suggestion': 5,
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+        self.assertEqual(30, ProgramModel.objects.get(id=program.id).start_time)
+
+    def test_start_time_get_not_enough_runs(self):
+        program = ProgramFactory(start_time=30)
+        self.create_ready_runs(program, [2, 3])
+
+        response = self.client.get(
+            reverse('frontend:program_start_time', args=[program.id]))
+        self.assertEqual(
+            Status.ok({
+                'start_time': 30,
+                'suggestion': None,
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_start_time_get_not_tighter(self):
+        program = ProgramFactory(start_time=4)
+        self.create_ready_runs(program, [2, 3, 4, 3.5, 2])
+
+        response = self.client.get(
+            reverse('frontend:program_start_time', args=[program.id]))
+        self.assertEqual(
+            Status.ok({
+                'start_time': 4,
+                'suggestion': None,
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_start_time_post_success(self):
+        program = ProgramFactory(start_time=30)
+        self.create_ready_runs(program, [2, 3, 4, 3.5, 2])
+
+        response = self.client.post(
+            reverse('frontend:program_start_time', args=[program.id]))
+        self.assertEqual(
+            Status.ok({
+                'start_time': 5,
+                'suggestion': 5,
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+        self.assertEqual(5, ProgramModel.objects.get(id=program.id).start_time)
+
+    def test_start_time_get_not_exist(self):
+        response = self.client.get(
+            reverse('frontend:program_start_time', args=[0]))
+        self.assertEqual(response.status_code, 200)
+
+        self.assertStatusRegex(
+            Status.err(ProgramNotExistError),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_start_time_delete_forbidden(self):
+        response = self.client.delete(
+            reverse('frontend:program_start_time', args=[0]))
+        self.assertEqual(response.status_code, 403)
+
 
 class SlaveTests(StatusTestCase):
     def test_set_post_success(self):
@@ -2168,6 +2777,8 @@ class SlaveTests(StatusTestCase):
         )
 
         slave = SlaveFactory()
+        # the name search is updated when the transaction is committed
+        run_on_commit()
 
         response = self.client.get(reverse("frontend:slave_set"))
         self.assertEqual(response.status_code, 200)
@@ -2239,6 +2850,144 @@ class SlaveTests(StatusTestCase):
             Status.from_json(response.content.decode('utf-8')),
         )
 
+    def test_set_get_page_success(self):
+        slaves = SlaveFactory.create_batch(5)
+
+        response = self.client.get(
+            reverse("frontend:slave_set"),
+            {'limit': 2},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            Status.ok({
+                'results': [{
+                    'id': slave.id,
+                    'name': slave.name,
+                } for slave in slaves[:2]],
+                'next': str(slaves[1].id),
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+        response = self.client.get(
+            reverse("frontend:slave_set"),
+            {
+                'limit': 2,
+                'cursor': str(slaves[3].id),
+                'fields': 'name,ip_address',
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            Status.ok({
+                'results': [{
+                    'name': slaves[4].name,
+                    'ip_address': slaves[4].ip_address,
+                }],
+                'next': None,
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_set_get_page_empty(self):
+        slaves = SlaveFactory.create_batch(2)
+
+        for (cursor, following) in [
+            (None, '0'),
+            (str(slaves[0].id), str(slaves[0].id)),
+            (str(slaves[1].id), None),
+        ]:
+            params = {'limit': 0}
+            if cursor is not None:
+                params['cursor'] = cursor
+
+            response = self.client.get(reverse("frontend:slave_set"), params)
+            self.assertEqual(response.status_code, 200)
+
+            self.assertEqual(
+                Status.ok({
+                    'results': [],
+                    'next': following,
+                }),
+                Status.from_json(response.content.decode('utf-8')),
+            )
+
+        # the next page of an empty page contains the following rows
+        response = self.client.get(
+            reverse("frontend:slave_set"),
+            {
+                'limit': 1,
+                'cursor': '0',
+            },
+        )
+        self.assertEqual(
+            [slaves[0].id],
+            [
+                row['id'] for row in Status.from_json(
+                    response.content.decode('utf-8')).payload['results']
+            ],
+        )
+
+    def test_set_get_page_query_success(self):
+        program = ProgramFactory()
+        SlaveFactory()
+
+        response = self.client.get(
+            reverse("frontend:slave_set"),
+            {
+                'programs': '1',
+                'fields': 'id',
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            Status.ok({
+                'results': [{
+                    'id': program.slave.id
+                }],
+                'next': None,
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_set_get_page_field_error(self):
+        response = self.client.get(
+            reverse("frontend:slave_set"),
+            {'fields': 'name,password'},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertStatusRegex(
+            Status.err(QueryParameterError),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_set_get_page_limit_error(self):
+        response = self.client.get(
+            reverse("frontend:slave_set"),
+            {'limit': '-1'},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertStatusRegex(
+            Status.err(PositiveNumberError),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+        response = self.client.get(
+            reverse("frontend:slave_set"),
+            {'cursor': 'first'},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            Status.ID_ERR,
+            Status.from_json(response.content.decode('utf-8')).status,
+        )
+
     def test_entry_get_forbidden(self):
         response = self.client.get(reverse("frontend:slave_entry", args=[0]))
         self.assertEqual(response.status_code, 403)
@@ -2472,6 +3221,39 @@ class SlaveTests(StatusTestCase):
             Status.from_json(response.content.decode('utf-8')),
         )
 
+    def test_connection_get_success(self):
+        slave = SlaveOnlineFactory()
+
+        response = self.client.get(
+            reverse("frontend:slave_connection", args=[slave.id]))
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            Status.ok({
+                'online': True,
+                'last_seen': None,
+                'rtt': None,
+                'jitter': None,
+                'missed': None,
+            }),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_connection_get_not_exist(self):
+        response = self.client.get(
+            reverse("frontend:slave_connection", args=[0]))
+        self.assertEqual(response.status_code, 200)
+
+        self.assertStatusRegex(
+            Status.err(SlaveNotExistError),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+
+    def test_connection_post_forbidden(self):
+        response = self.client.post(
+            reverse("frontend:slave_connection", args=[0]))
+        self.assertEqual(response.status_code, 403)
+
     def test_shutdown_delete_forbidden(self):
         response = self.client.delete(
             reverse(
@@ -2506,6 +3288,130 @@ class SlaveTests(StatusTestCase):
             Status.ok(''),
         )
 
+    def test_stop_all_post_scheduler_stopped_first(self):
+        script = ScriptFactory()
+        SGPFactory(script=script, program=ProgramFactory(), index=0)
+        self.assertTrue(FSIM_CURRENT_SCHEDULER.start(script.id))
+
+        scheduler_stopped = []
+
+        class Orchestrator(ShutdownOrchestrator):
+            def start(self, scope):
+                scheduler_stopped.append(FSIM_CURRENT_SCHEDULER.should_stop())
+                return super().start(scope)
+
+        shutdown = api.SHUTDOWN
+        api.SHUTDOWN = Orchestrator()
+        try:
+            response = self.client.post(
+                reverse("frontend:scope_operation"), {'scope': 'programs'})
+        finally:
+            api.SHUTDOWN = shutdown
+            FSIM_CURRENT_SCHEDULER.loop.clear_tasks()
+
+        self.assertEqual(
+            Status.ok(''),
+            Status.from_json(response.content.decode('utf-8')),
+        )
+        self.assertEqual([True], scheduler_stopped)
+
     def test_stop_all_put_forbidden(self):
         response = self.client.put(reverse("frontend:scope_operation"))
         self.assertEqual(response.status_code, 403)
+
+
+class DashboardTests(StatusTestCase):
+    def test_get_success(self):
+        slave = SlaveFactory(online=True)
+        offline = SlaveFactory()
+        running = ProgramStatusFactory(
+            program=ProgramFactory(slave=slave), running=True)
+        errored = ProgramStatusFactory(
+            program=ProgramFactory(slave=slave), code='1')
+        ready = ProgramStatusFactory(
+            program=ProgramFactory(slave=slave), running=True, ready=True)
+        program = ProgramFactory(slave=offline)
+        moved = MovedFileFactory(slave=slave)
+        failed = FileFactory(slave=offline, error_code='error')
+
+        # the amount of queries does not depend on the amount of objects
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('frontend:dashboard'))
+        self.assertEqual(response.status_code, 200)
+
+        payload = Status.from_json(response.content.decode('utf-8')).payload
+
+        self.assertEqual(
+            {
+                'slaves': 2,
+                'online': 1,
+                'programs': 4,
+                'running': 2,
+                'errored_programs': 1,
+                'filesystems': 2,
+                'moved': 1,
+                'errored_filesystems': 1,
+            },
+            payload['counters'],
+        )
+
+        self.assertEqual(
+            [slave.id, offline.id],
+            [entry['id'] for entry in payload['slaves']],
+        )
+        self.assertEqual(2, payload['slaves'][0]['running'])
+        self.assertEqual(1, payload['slaves'][0]['errored'])
+        self.assertEqual(1, payload['slaves'][1]['errored'])
+
+        self.assertEqual(
+            {
+                running.program.id: 'running',
+                errored.program.id: 'error',
+                ready.program.id: 'ready',
+                program.id: 'unknown',
+            },
+            {entry['id']: entry['state']
+             for entry in payload['programs']},
+        )
+        self.assertEqual(
+            ProgramModel.objects.with_state().get(id=program.id).to_dict(),
+            payload['programs'][3],
+        )
+        self.assertEqual(
+            {
+                moved.id: 'moved',
+                failed.id: 'error'
+            },
+            {entry['id']: entry['state']
+             for entry in payload['filesystems']},
+        )
+
+    def test_post_forbidden(self):
+        response = self.client.post(reverse('frontend:dashboard'))
+        self.assertEqual(response.status_code, 403)
+
+
+class CommandTests(StatusTestCase):
+    def setUp(self):
+        COMMANDS.clear()
+
+    def test_metrics_get_success(self):
+        slave = SlaveOnlineFactory()
+        filesystem = FileFactory(slave=slave)
+
+        response = self.client.post(
+            reverse("frontend:filesystem_move", args=[filesystem.id]))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(reverse("frontend:command_metrics"))
+        self.assertEqual(response.status_code, 200)
+
+        status = Status.from_json(response.content.decode('utf-8'))
+        self.assertTrue(status.is_ok())
+        self.assertEqual(status.payload['sent'], 1)
+        self.assertEqual(status.payload['acknowledged'], 0)
+        self.assertEqual(status.payload['in_flight'], {'filesystem_move': 1})
+
+    def test_metrics_post_forbidden(self):
+        response = self.client.post(reverse("frontend:command_metrics"))
+        self.assertEqual(response.status_code, 403)
@@ -13,8 +13,12 @@ def test_<MODEL>_<OPERATION/ERROR>:
 """
 # pylint: disable=missing-docstring,too-many-public-methods
 
+from datetime import timedelta
+from io import StringIO
+
 from django.test import TestCase
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.utils.timezone import now
 
 from frontend.apps import flush
@@ -25,6 +29,8 @@ from frontend.models import (
     Filesystem as FilesystemModel,
     Program as ProgramModel,
     ProgramStatus as ProgramStatusModel,
+    ProgramRun as ProgramRunModel,
+    ProgramRunStatistics as ProgramRunStatisticsModel,
     validate_mac_address,
     validate_argument_list,
 )
@@ -89,6 +95,43 @@ class DatabaseTests(TestCase):
             {filesystem_node.filesystem},
             set(script.stages[0]['slave_entries'][1]['filesystems']))
 
+    def test_script_stages_queries(self):
+        script = ScriptFactory()
+        slaves = [SlaveFactory() for _ in range(3)]
+
+        for index in range(4):
+            for slave in slaves:
+                SGPFactory(
+                    script=script,
+                    index=index,
+                    program=ProgramFactory(slave=slave),
+                )
+                SGFFactory(
+                    script=script,
+                    index=index,
+                    filesystem=FileFactory(slave=slave),
+                )
+        ProgramStatusFactory(
+            program=script.scriptgraphprograms_set.first().program,
+            running=True,
+        )
+
+        with self.assertNumQueries(2):
+            stages = script.stages
+            states = [
+                program.data_state for stage in stages
+                for entry in stage['slave_entries']
+                for program in entry['programs']
+            ]
+
+        self.assertEqual([0, 1, 2, 3], [stage['index'] for stage in stages])
+        self.assertEqual(
+            [slave.name for slave in slaves],
+            [entry['name'] for entry in stages[0]['slave_entries']],
+        )
+        self.assertEqual(1, states.count("running"))
+        self.assertEqual(11, states.count("unknown"))
+
     def test_script_check_online(self):
         script = ScriptFactory()
 
@@ -139,6 +182,28 @@ class DatabaseTests(TestCase):
 
         self.assertTrue(filesystem.slave.has_error)
 
+    def test_slave_with_status_counts(self):
+        slave = SlaveFactory()
+        ProgramStatusFactory(
+            program=ProgramFactory(slave=slave), running=True)
+        ProgramStatusFactory(
+            program=ProgramFactory(slave=slave), running=False, code="1")
+        ProgramStatusFactory(
+            program=ProgramFactory(slave=slave), running=False, code="0")
+        FileFactory(slave=slave, error_code="Hey")
+        FileFactory(slave=slave)
+        SlaveFactory()
+
+        for annotated in SlaveModel.with_status_counts():
+            plain = SlaveModel.objects.get(id=annotated.id)
+            self.assertEqual(plain.current_running, annotated.current_running)
+            self.assertEqual(plain.current_errored, annotated.current_errored)
+
+        annotated = SlaveModel.with_status_counts().get(id=slave.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(1, annotated.current_running)
+            self.assertEqual(2, annotated.current_errored)
+
     def test_slave_is_online_err(self):
         slave = SlaveFactory()
         self.assertFalse(slave.is_online)
@@ -151,6 +216,56 @@ class DatabaseTests(TestCase):
         self.assertRaises(
             ValidationError, SlaveModel(mac_address='my_cool_mac').full_clean)
 
+    def test_program_with_state(self):
+        ProgramFactory()
+        ProgramStatusFactory(running=True, timeouted=True)
+        ProgramStatusFactory(running=False, code="")
+        ProgramStatusFactory(running=False, code="0")
+        ProgramStatusFactory(running=False, code="1")
+
+        with self.assertNumQueries(1):
+            annotated = {
+                program.id: (
+                    program.is_running,
+                    program.is_timeouted,
+                    program.is_executed,
+                    program.is_error,
+                    program.is_successful,
+                    program.data_state,
+                )
+                for program in ProgramModel.objects.with_state()
+            }
+
+        for program in ProgramModel.objects.all():
+            self.assertEqual((
+                program.is_running,
+                program.is_timeouted,
+                program.is_executed,
+                program.is_error,
+                program.is_successful,
+                program.data_state,
+            ), annotated[program.id])
+
+    def test_program_running_errored(self):
+        running = ProgramStatusFactory(running=True).program
+        errored = ProgramStatusFactory(running=False, code="1").program
+        ProgramStatusFactory(running=False, code="0")
+        ProgramFactory()
+
+        self.assertEqual([running], list(ProgramModel.objects.running()))
+        self.assertEqual([errored], list(ProgramModel.objects.errored()))
+        self.assertTrue(running.slave.has_running)
+        self.assertTrue(errored.slave.has_error)
+        self.assertFalse(running.slave.has_error)
+
+    def test_filesystem_moved_errored(self):
+        moved = FileFactory(hash_value="abc")
+        errored = FileFactory(error_code="Hey")
+        FileFactory()
+
+        self.assertEqual([moved], list(FilesystemModel.objects.moved()))
+        self.assertEqual([errored], list(FilesystemModel.objects.errored()))
+
     def test_program_is_timeouted(self):
         status = ProgramStatusFactory(running=True, timeouted=True)
         prog = status.program
@@ -221,6 +336,15 @@ class DatabaseTests(TestCase):
         program = ProgramModel.objects.get(id=program.id)
         self.assertEqual(program.data_state, "running")
 
+        status.ready = True
+        status.save()
+        program = ProgramModel.objects.get(id=program.id)
+        self.assertEqual(program.data_state, "ready")
+        self.assertEqual(
+            ProgramModel.objects.with_state().get(id=program.id).data_state,
+            "ready",
+        )
+
     def test_program_error(self):
         status = ProgramStatusFactory(code="1")
         prog = status.program
@@ -234,6 +358,123 @@ class DatabaseTests(TestCase):
         self.assertTrue(prog.is_error)
         self.assertFalse(prog.is_timeouted)
 
+    def create_run(self, program, uuid, start, seconds=None, code=0,
+                   ready=True):
+        ProgramRunModel.objects.create(
+            program=program,
+            slave=program.slave,
+            command_uuid=uuid,
+            start=start,
+        )
+        if seconds is not None:
+            if ready:
+                ProgramRunModel.mark_ready(uuid,
+                                           start + timedelta(seconds=seconds))
+            ProgramRunModel.finish(uuid, code,
+                                   start + timedelta(seconds=seconds))
+
+    def test_program_run_finish(self):
+        program = ProgramFactory()
+        start = now()
+
+        self.create_run(program, 'a', start, seconds=2)
+        self.create_run(program, 'b', start, seconds=4, code=1)
+
+        run = ProgramRunModel.objects.get(command_uuid='b')
+        self.assertEqual('1', run.code)
+        self.assertEqual(4, run.duration)
+
+        statistics = ProgramRunStatisticsModel.objects.get(program=program)
+        self.assertEqual(2, statistics.runs)
+        self.assertEqual(1, statistics.errors)
+        self.assertEqual(0, statistics.timeouts)
+        self.assertEqual(3, statistics.mean_duration)
+        self.assertEqual(4, statistics.max_duration)
+
+        # unknown or finished runs are ignored
+        self.assertIsNone(ProgramRunModel.finish('b', 0, now()))
+        self.assertIsNone(ProgramRunModel.finish('c', 0, now()))
+        self.assertEqual(
+            2,
+            ProgramRunStatisticsModel.objects.get(program=program).runs,
+        )
+
+    def test_program_run_percentile(self):
+        program = ProgramFactory()
+        start = now()
+
+        for i in range(100):
+            self.create_run(program, str(i), start, seconds=1 if i < 90 else 60)
+
+        statistics = ProgramRunStatisticsModel.objects.get(program=program)
+        self.assertLessEqual(1, statistics.percentile(50))
+        self.assertGreater(2, statistics.percentile(90))
+        self.assertEqual(60, statistics.percentile(99))
+        self.assertEqual(60, statistics.percentile(100))
+
+    def test_program_run_abort(self):
+        program = ProgramFactory()
+        self.create_run(program, 'a', now())
+
+        ProgramRunModel.abort([program.slave.id], now())
+
+        run = ProgramRunModel.objects.get(command_uuid='a')
+        self.assertIsNotNone(run.end)
+        self.assertIsNone(run.code)
+        self.assertFalse(
+            ProgramRunStatisticsModel.objects.filter(program=program).exists())
+
+    def test_program_readiness_samples(self):
+        program = ProgramFactory()
+        start = now()
+
+        self.create_run(program, 'a', start, seconds=2)
+        self.create_run(program, 'b', start + timedelta(seconds=1), seconds=3)
+        self.create_run(program, 'error', start, seconds=1, code=1)
+        self.create_run(program, 'running', start)
+        # a run which only exited is no sample
+        self.create_run(program, 'exited', start, seconds=1, ready=False)
+
+        self.assertIsNone(
+            ProgramRunModel.objects.get(command_uuid='exited').readiness)
+        self.assertEqual([3, 2], program.readiness_samples(10))
+        self.assertEqual([3], program.readiness_samples(1))
+
+    def test_program_ready_probe(self):
+        self.assertIsNone(ProgramFactory().ready_probe)
+        self.assertEqual(
+            {'pattern': 'ready', 'port': 8080},
+            ProgramFactory(ready_pattern='ready', ready_port=8080).ready_probe,
+        )
+
+    def test_program_ready_pattern_invalid(self):
+        program = ProgramFactory(ready_pattern='(unclosed')
+        self.assertRaises(ValidationError, program.full_clean)
+
+    def test_program_ready_port_invalid(self):
+        program = ProgramFactory(ready_port=70000)
+        self.assertRaises(ValidationError, program.full_clean)
+
+    def test_program_run_compact(self):
+        program = ProgramFactory()
+
+        self.create_run(program, 'old', now() - timedelta(days=40), seconds=1)
+        self.create_run(program, 'new', now(), seconds=1)
+        self.create_run(program, 'open', now() - timedelta(days=40))
+
+        call_command('compactruns', days=30, stdout=StringIO())
+
+        self.assertEqual(
+            ['new', 'open'],
+            sorted(
+                ProgramRunModel.objects.values_list('command_uuid',
+                                                    flat=True)),
+        )
+        self.assertEqual(
+            2,
+            ProgramRunStatisticsModel.objects.get(program=program).runs,
+        )
+
     def test_filesystem_str(self):
         filesystem = FileFactory()
         self.assertEqual(
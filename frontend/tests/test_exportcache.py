@@ -0,0 +1,44 @@
+"""
+Test file for exportcache.py module.
+"""
+# pylint: disable=missing-docstring,too-many-public-methods
+
+from django.test import SimpleTestCase
+
+from frontend.exportcache import ExportCache
+
+
+class ExportCacheTests(SimpleTestCase):
+    def test_get_put(self):
+        cache = ExportCache(capacity=2)
+
+        self.assertIsNone(cache.get((1, 'a')))
+        cache.put((1, 'a'), b'one')
+        self.assertEqual(b'one', cache.get((1, 'a')))
+
+        metrics = cache.metrics()
+        self.assertEqual(1, metrics['hits'])
+        self.assertEqual(1, metrics['misses'])
+        self.assertEqual(1, metrics['size'])
+
+    def test_evict_least_recently_used(self):
+        cache = ExportCache(capacity=2)
+
+        cache.put((1, 'a'), b'one')
+        cache.put((2, 'a'), b'two')
+        cache.get((1, 'a'))
+        cache.put((3, 'a'), b'three')
+
+        self.assertIsNone(cache.get((2, 'a')))
+        self.assertEqual(b'one', cache.get((1, 'a')))
+        self.assertEqual(b'three', cache.get((3, 'a')))
+        self.assertEqual(1, cache.metrics()['evicted'])
+
+    def test_clear(self):
+        cache = ExportCache(capacity=2)
+
+        cache.put((1, 'a'), b'one')
+        cache.clear()
+
+        self.assertIsNone(cache.get((1, 'a')))
+        self.assertEqual(0, cache.metrics()['size'])
@@ -15,13 +15,16 @@ def test_<VIEW>_<OPTION>(self):
 from os import getcwd, remove, mkdir, rmdir
 from os.path import join, isdir
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from .factory import (
     SlaveFactory,
     ScriptFactory,
     ProgramFactory,
+    ProgramStatusFactory,
     FileFactory,
 )
 
@@ -65,6 +68,37 @@ class FrontendTests(TestCase):
         self.assertContains(response, program.name)
         self.assertContains(response, filesystem.name)
 
+    def test_slave_get_constant_queries(self):
+        def add_slave():
+            slave = SlaveFactory()
+            ProgramStatusFactory(
+                program=ProgramFactory(slave=slave), running=True)
+            ProgramStatusFactory(
+                program=ProgramFactory(slave=slave), code="1")
+            ProgramFactory(slave=slave)
+            FileFactory(slave=slave, error_code="Hey")
+
+        add_slave()
+        with CaptureQueriesContext(connection) as one_slave:
+            self.client.get(reverse('frontend:slaves'))
+
+        for _ in range(4):
+            add_slave()
+        with CaptureQueriesContext(connection) as many_slaves:
+            response = self.client.get(reverse('frontend:slaves'))
+
+        self.assertEqual(len(one_slave), len(many_slaves))
+        self.assertContains(
+            response,
+            'name="status-badge-running" data-value="1"',
+            count=10,
+        )
+        self.assertContains(
+            response,
+            'name="status-badge-errored" data-value="2"',
+            count=10,
+        )
+
 
 class DownloadTests(TestCase):
     DOWNLOAD_FOLDER = 'downloads'
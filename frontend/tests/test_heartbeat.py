@@ -0,0 +1,159 @@
+"""
+Test file for heartbeat.py module.
+"""
+# pylint: disable=missing-docstring,too-many-public-methods
+
+import json
+import time
+
+from django.test import TestCase
+from channels.test import WSClient
+
+from utils import Status, Command
+
+from frontend.models import Slave as SlaveModel
+from frontend.heartbeat import HEARTBEATS, SlaveConnection
+
+from .factory import SlaveFactory
+from .testcases import reset_runtime_state
+
+
+class HeartbeatMonitorTests(TestCase):
+    def setUp(self):
+        reset_runtime_state()
+
+        self.slave = SlaveFactory()
+
+        self.slave_ws = WSClient()
+        self.slave_ws.send_and_consume(
+            'websocket.connect',
+            path='/commands',
+            content={'client': [self.slave.ip_address, self.slave.mac_address]},
+        )
+
+        # answer the online request
+        online = Command.from_json(json.dumps(self.slave_ws.receive()))
+        self.answer(online.uuid, 'online')
+
+        self.webinterface = WSClient()
+        self.webinterface.join_group('notifications')
+
+    def tearDown(self):
+        reset_runtime_state()
+
+    def answer(self, uuid, method):
+        status = Status.ok({'method': method, 'result': ''})
+        status.uuid = uuid
+
+        self.slave_ws.send_and_consume(
+            'websocket.receive',
+            path='/commands',
+            content={'text': status.to_json()},
+        )
+
+    def test_update_rtt(self):
+        connection = SlaveConnection(0, 'channel')
+
+        connection.update_rtt(1.0)
+        self.assertEqual(connection.srtt, 1.0)
+        self.assertEqual(connection.rttvar, 0.5)
+
+        connection.update_rtt(2.0)
+        self.assertEqual(connection.srtt, 1.125)
+        self.assertEqual(connection.rttvar, 0.625)
+
+    def test_tick_heartbeat(self):
+        HEARTBEATS.tick()
+
+        cmd = Command.from_json(json.dumps(self.slave_ws.receive()))
+        self.assertEqual(cmd.method, 'heartbeat')
+        self.assertEqual(HEARTBEATS.statistics(self.slave.id)['missed'], 0)
+        self.assertIsNone(HEARTBEATS.statistics(self.slave.id)['rtt'])
+
+        # the first heartbeat is not answered before the next tick
+        HEARTBEATS.tick()
+        self.slave_ws.receive()
+        self.assertEqual(HEARTBEATS.statistics(self.slave.id)['missed'], 1)
+
+        self.answer(cmd.uuid, 'heartbeat')
+
+        statistics = HEARTBEATS.statistics(self.slave.id)
+        self.assertEqual(statistics['missed'], 0)
+        self.assertIsNotNone(statistics['rtt'])
+        self.assertIsNotNone(statistics['jitter'])
+
+        # a heartbeat does not change the state of the slave
+        self.assertIsNone(self.webinterface.receive())
+
+    def test_tick_timeout(self):
+        self.assertTrue(SlaveModel.objects.get(id=self.slave.id).is_online)
+
+        HEARTBEATS.tick(time.monotonic() + HEARTBEATS.timeout + 1)
+
+        self.assertFalse(SlaveModel.objects.get(id=self.slave.id).is_online)
+        self.assertIsNone(HEARTBEATS.statistics(self.slave.id))
+        self.assertEqual(
+            Status.ok({
+                'slave_status': 'disconnected',
+                'sid': str(self.slave.id)
+            }),
+            Status.from_json(json.dumps(self.webinterface.receive())),
+        )
+
+        # the late disconnect of the dead connection is ignored
+        self.slave_ws.send_and_consume(
+            'websocket.disconnect',
+            path='/commands',
+        )
+        self.assertIsNone(self.webinterface.receive())
+
+    def test_tick_timeout_reconnected(self):
+        # the slave connects again before the old connection is closed
+        new_ws = WSClient()
+        new_ws.send_and_consume(
+            'websocket.connect',
+            path='/commands',
+            content={'client': [self.slave.ip_address, self.slave.mac_address]},
+        )
+        self.assertEqual(
+            'online',
+            Command.from_json(json.dumps(new_ws.receive())).method,
+        )
+
+        # the disconnect of the old connection is ignored
+        self.slave_ws.send_and_consume(
+            'websocket.disconnect',
+            path='/commands',
+        )
+        self.assertTrue(SlaveModel.objects.get(id=self.slave.id).is_online)
+        self.assertIsNone(self.webinterface.receive())
+
+        HEARTBEATS.tick()
+        self.assertIsNone(self.slave_ws.receive())
+        self.assertEqual(
+            'heartbeat',
+            Command.from_json(json.dumps(new_ws.receive())).method,
+        )
+
+    def test_receive_seen(self):
+        before = HEARTBEATS.statistics(self.slave.id)['last_seen']
+        time.sleep(0.01)
+        self.assertGreater(
+            HEARTBEATS.statistics(self.slave.id)['last_seen'],
+            before,
+        )
+
+        self.answer('0' * 32, 'unknown')
+        self.assertLess(
+            HEARTBEATS.statistics(self.slave.id)['last_seen'],
+            0.01,
+        )
+
+    def test_disconnect(self):
+        self.slave_ws.send_and_consume(
+            'websocket.disconnect',
+            path='/commands',
+        )
+
+        self.assertIsNone(HEARTBEATS.statistics(self.slave.id))
+        self.assertFalse(SlaveModel.objects.get(id=self.slave.id).is_online)
@@ -0,0 +1,146 @@
+"""
+Test file for ingest.py module.
+"""
+# pylint: disable=missing-docstring,too-many-public-methods
+
+import json
+import time
+
+from django.test import TestCase
+from django.urls import reverse
+from channels.test import WSClient
+
+from utils import Status
+
+from frontend.ingest import LOGS, LogBudget, LogIngest
+
+from .testcases import reset_runtime_state
+
+
+class LogIngestTests(TestCase):
+    def setUp(self):
+        reset_runtime_state()
+
+        self.webinterface = WSClient()
+        self.webinterface.join_group('notifications')
+
+    def tearDown(self):
+        reset_runtime_state()
+
+    def receive_log(self):
+        return Status.from_json(json.dumps(self.webinterface.receive()))
+
+    def test_first_chunk_unchanged(self):
+        ingest = LogIngest(rate=10, burst=10, max_chunk=10)
+        text = Status.ok({'log': 'abc', 'pid': '5'}).to_json()
+
+        ingest.receive(text)
+        self.assertEqual(text, self.webinterface.receive(json=False))
+
+    def test_truncate_chunk(self):
+        ingest = LogIngest(rate=10, burst=10, max_chunk=4)
+
+        ingest.receive(Status.ok({'log': 'abcdefgh', 'pid': 5}).to_json())
+        self.assertEqual(
+            Status.ok({'log': 'efgh', 'pid': 5}),
+            self.receive_log(),
+        )
+        self.assertEqual(4, ingest.metrics()['programs']['5']['truncated'])
+
+    def test_merge_throttled_chunks(self):
+        ingest = LogIngest(rate=1000, burst=10, max_chunk=10)
+
+        ingest.receive(Status.ok({'log': 'a' * 8, 'pid': 5}).to_json())
+        ingest.receive(Status.ok({'log': 'bbbbb', 'pid': 5}).to_json())
+        ingest.receive(Status.ok({'log': 'ccc', 'pid': 5}).to_json())
+
+        self.assertEqual(
+            Status.ok({'log': 'a' * 8, 'pid': 5}),
+            self.receive_log(),
+        )
+
+        time.sleep(0.2)
+        self.assertEqual(
+            Status.ok({'log': 'bbbbbccc', 'pid': 5}),
+            self.receive_log(),
+        )
+        self.assertIsNone(self.webinterface.receive())
+
+        metrics = ingest.metrics()['programs']['5']
+        self.assertEqual(1, metrics['merged'])
+        self.assertEqual(16, metrics['forwarded'])
+        self.assertEqual(0, metrics['buffered'])
+
+    def test_programs_independent(self):
+        ingest = LogIngest(rate=1, burst=10, max_chunk=10)
+
+        ingest.receive(Status.ok({'log': 'a' * 10, 'pid': 1}).to_json())
+        ingest.receive(Status.ok({'log': 'b', 'pid': 1}).to_json())
+        ingest.receive(Status.ok({'log': 'c', 'pid': 2}).to_json())
+
+        self.assertEqual(
+            Status.ok({'log': 'a' * 10, 'pid': 1}),
+            self.receive_log(),
+        )
+        self.assertEqual(
+            Status.ok({'log': 'c', 'pid': 2}),
+            self.receive_log(),
+        )
+        self.assertIsNone(self.webinterface.receive())
+
+        # the pending flush of 'b' must not reach the following tests
+        ingest.clear()
+
+    def test_drop_oldest(self):
+        budget = LogBudget(rate=1, burst=10)
+        budget.tokens = 0
+
+        budget.add('aaaaaa')
+        budget.add('bbbbbb')
+        self.assertIsNone(budget.take())
+        self.assertEqual(2, budget.counters['dropped'])
+        self.assertEqual(10, budget.buffered)
+
+        budget.tokens = 10
+        self.assertEqual(
+            '\n[2 characters of the log were dropped]\naaaabbbbbb',
+            budget.take(),
+        )
+        self.assertEqual(0, budget.tokens)
+
+    def test_no_log_passthrough(self):
+        ingest = LogIngest()
+
+        ingest.receive('not json')
+        self.assertEqual('not json',
+                         self.webinterface.receive(json=False))
+
+    def test_downgrade_slow_webinterface(self):
+        ingest = LogIngest(rate=10**6, burst=10**6, max_chunk=10**6)
+        text = Status.ok({'log': 'a', 'pid': 5}).to_json()
+
+        # never reads its messages
+        for _ in range(20):
+            ingest.receive(text)
+
+        self.assertGreaterEqual(ingest.metrics()['downgraded'], 1)
+        ingest.forget(self.webinterface.reply_channel)
+
+        while self.webinterface.receive(json=False) is not None:
+            pass
+
+        ingest.receive(text)
+        self.assertEqual(text, self.webinterface.receive(json=False))
+
+    def test_metrics_get_success(self):
+        LOGS.receive(Status.ok({'log': 'abc', 'pid': 5}).to_json())
+
+        response = self.client.get(reverse('frontend:log_metrics'))
+        self.assertEqual(200, response.status_code)
+
+        metrics = Status.from_json(response.content.decode('utf-8')).payload
+        self.assertEqual(3, metrics['programs']['5']['received'])
+
+    def test_metrics_post_forbidden(self):
+        response = self.client.post(reverse('frontend:log_metrics'))
+        self.assertEqual(403, response.status_code)
@@ -0,0 +1,99 @@
+"""
+Test file for livestate.py module.
+"""
+# pylint: disable=missing-docstring,too-many-public-methods
+
+import threading
+
+from django.test import TestCase
+
+from frontend.models import (
+    Filesystem as FilesystemModel,
+    ProgramStatus as ProgramStatusModel,
+)
+from frontend.livestate import LiveStateStore
+
+from .factory import FileFactory, ProgramStatusFactory
+
+
+class LiveStateStoreTests(TestCase):
+    def test_write_through(self):
+        store = LiveStateStore(flush_interval=0)
+        filesystem = FileFactory()
+
+        store.update(FilesystemModel, filesystem.id, error_code="Hey")
+
+        self.assertEqual(
+            "Hey",
+            FilesystemModel.objects.get(id=filesystem.id).error_code,
+        )
+        self.assertEqual(0, store.metrics()['pending'])
+
+    def test_write_behind(self):
+        store = LiveStateStore(flush_interval=60)
+        filesystem = FileFactory()
+        status = ProgramStatusFactory(running=True)
+
+        with self.assertNumQueries(0):
+            store.update(FilesystemModel, filesystem.id, error_code="Hey")
+            store.update(FilesystemModel, filesystem.id, hash_value="abc")
+            store.update(ProgramStatusModel, status.pk, running=False)
+
+        self.assertEqual("Hey", store.get(filesystem, 'error_code'))
+        self.assertEqual("abc", store.get(filesystem, 'hash_value'))
+        self.assertEqual(filesystem.name, store.get(filesystem, 'name'))
+        self.assertEqual(
+            "",
+            FilesystemModel.objects.get(id=filesystem.id).error_code,
+        )
+
+        metrics = store.metrics()
+        self.assertEqual(3, metrics['updates'])
+        self.assertEqual(1, metrics['merged'])
+        self.assertEqual(2, metrics['pending'])
+
+        # one UPDATE per row inside one transaction
+        with self.assertNumQueries(4):
+            self.assertEqual(2, store.flush())
+
+        filesystem = FilesystemModel.objects.get(id=filesystem.id)
+        self.assertEqual("Hey", filesystem.error_code)
+        self.assertEqual("abc", filesystem.hash_value)
+        self.assertFalse(ProgramStatusModel.objects.get(pk=status.pk).running)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(0, store.flush())
+
+    def test_discard(self):
+        store = LiveStateStore(flush_interval=60)
+        filesystem = FileFactory()
+
+        store.update(FilesystemModel, filesystem.id, error_code="Hey")
+        store.discard(FilesystemModel, [filesystem.id])
+
+        self.assertEqual("", store.get(filesystem, 'error_code'))
+        self.assertEqual(0, store.flush())
+
+    def test_replacing(self):
+        store = LiveStateStore(flush_interval=60)
+        status = ProgramStatusFactory(running=True)
+
+        store.update(ProgramStatusModel, status.pk, running=False)
+        flushed = threading.Event()
+
+        def flush():
+            store.flush()
+            flushed.set()
+
+        with store.replacing(ProgramStatusModel, [status.pk]):
+            thread = threading.Thread(target=flush)
+            thread.start()
+
+            # the flush waits until the row is written
+            self.assertFalse(flushed.wait(0.1))
+            ProgramStatusModel.objects.filter(pk=status.pk).update(
+                running=True)
+
+        thread.join()
+        self.assertTrue(flushed.is_set())
+        self.assertTrue(ProgramStatusModel.objects.get(pk=status.pk).running)
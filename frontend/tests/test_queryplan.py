@@ -0,0 +1,91 @@
+"""
+Test file for the indexes of the hot queries. Every test checks with
+`EXPLAIN QUERY PLAN` that SQLite uses the expected index.
+"""
+# pylint: disable=missing-docstring,too-many-public-methods
+
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+
+from frontend.models import (
+    Filesystem as FilesystemModel,
+    Program as ProgramModel,
+    ProgramStatus as ProgramStatusModel,
+    ScriptGraphPrograms as SGP,
+    ScriptGraphFiles as SGF,
+)
+
+
+class QueryPlanTests(TestCase):
+    def query_plan(self, queryset):
+        (sql, params) = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return ' | '.join(row[-1] for row in cursor.fetchall())
+
+    def assertUsesIndex(self, index, queryset):
+        plan = self.query_plan(queryset)
+        self.assertIn(index, plan)
+        self.assertNotIn('SCAN', plan.replace('COVERING INDEX', ''))
+
+    def test_script_graph_programs_stage(self):
+        self.assertUsesIndex(
+            'frontend_scriptgraphprograms_script_id_index_program_id',
+            SGP.objects.filter(script=1, index=0),
+        )
+
+    def test_script_graph_programs_next_stage(self):
+        self.assertUsesIndex(
+            'frontend_scriptgraphprograms_script_id_index_program_id',
+            SGP.objects.filter(script=1, index__gt=0).values_list(
+                'index', flat=True),
+        )
+
+    def test_script_graph_files_stage(self):
+        self.assertUsesIndex(
+            'frontend_scriptgraphfiles_script_id_index_filesystem_id',
+            SGF.objects.filter(script=1, index=0),
+        )
+
+    def test_script_graph_files_next_stage(self):
+        self.assertUsesIndex(
+            'frontend_scriptgraphfiles_script_id_index_filesystem_id',
+            SGF.objects.filter(script=1, index__gt=0).values_list(
+                'index', flat=True),
+        )
+
+    def test_program_status_running(self):
+        self.assertUsesIndex(
+            'programstatus_running_idx',
+            ProgramStatusModel.objects.filter(running=True).values_list(
+                'program', flat=True),
+        )
+
+    def test_program_status_running_slave(self):
+        # the programs of one slave are less than the running programs
+        self.assertUsesIndex(
+            'frontend_program_slave_id',
+            ProgramStatusModel.objects.filter(
+                running=True,
+                program__slave=1,
+            ),
+        )
+
+    def test_program_running(self):
+        self.assertUsesIndex(
+            'programstatus_running_idx',
+            ProgramModel.objects.filter(programstatus__running=True),
+        )
+
+    def test_filesystem_destination(self):
+        self.assertUsesIndex(
+            'filesystem_destination_idx',
+            FilesystemModel.objects.filter(
+                ~Q(hash_value__exact='') & ~Q(id=1) &
+                ((Q(destination_path='/a/b') & Q(destination_type='file'))
+                 | (Q(destination_path='/a') & Q(destination_type='dir')
+                    & (Q(source_path__endswith='/b')
+                       | Q(source_path__endswith='\\b'))))),
+        )
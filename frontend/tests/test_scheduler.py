@@ -21,7 +21,9 @@ from frontend.models import (
     Script as ScriptModel,
 )
 
-from frontend.scheduler import Scheduler, SchedulerStatus
+from django.test import TestCase
+
+from frontend.scheduler import Scheduler, SchedulerStatus, LazyScheduler
 from frontend.errors import SlaveOfflineError
 
 from .factory import (
@@ -31,7 +33,7 @@ from .factory import (
     ScriptFactory,
 )
 
-from .testcases import SchedulerTestCase
+from .testcases import SchedulerTestCase, reset_runtime_state
 
 
 class SchedulerTests(SchedulerTestCase):
@@ -72,6 +74,7 @@ class SchedulerTests(SchedulerTestCase):
         # into the event loop. If the function timeouts it will probably raise
         # a database lock error.
         FSIM_CURRENT_SCHEDULER.loop.clear_tasks()
+        reset_runtime_state()
 
         # removes the created scheduler
         self.sched.stop()
@@ -631,6 +634,39 @@ class SchedulerTests(SchedulerTestCase):
             SchedulerStatus.NEXT_STEP,
         )
 
+    def test_state_waiting_programs_ready(self):
+        self.sched._Scheduler__script = self.script.id
+        self.sched._Scheduler__event = asyncio.Event(loop=self.sched.loop)
+        self.sched._Scheduler__index = 0
+        self.sched._Scheduler__state = SchedulerStatus.WAITING_FOR_PROGRAMS_FILESYSTEMS
+
+        self.fs1.hash_value = "Some"
+        self.fs1.save()
+
+        ProgramStatusModel(
+            running=True,
+            program=self.prog1,
+            command_uuid=uuid4().hex,
+            start_time=now()).save()
+
+        self.sched._Scheduler__state_wait_programs_filesystems()
+
+        self.assertEqual(
+            self.sched._Scheduler__state,
+            SchedulerStatus.WAITING_FOR_PROGRAMS_FILESYSTEMS,
+        )
+
+        # the slave reported the program as ready before the start time
+        ProgramStatusModel.objects.filter(program=self.prog1).update(
+            ready=True, )
+
+        self.sched._Scheduler__state_wait_programs_filesystems()
+
+        self.assertEqual(
+            self.sched._Scheduler__state,
+            SchedulerStatus.NEXT_STEP,
+        )
+
     def test_state_success(self):
         webinterface = WSClient()
         webinterface.join_group('notifications')
@@ -703,3 +739,23 @@ class SchedulerTests(SchedulerTestCase):
             self.sched._Scheduler__error_code,
             "Not all slaves connected within 5 minutes.",
         )
+
+
+class LazySchedulerTests(TestCase):
+    def test_created_on_first_use(self):
+        lazy = LazyScheduler()
+        self.assertFalse(lazy.is_created)
+
+        # nothing can wait for a notification without a scheduler
+        with self.assertNumQueries(0):
+            lazy.notify()
+        self.assertFalse(lazy.is_created)
+
+        self.assertFalse(lazy.is_running())
+        self.assertTrue(lazy.is_created)
+        self.assertIs(lazy.instance(), lazy.instance())
+
+        lazy.stop()
+
+    def test_current_scheduler_lazy(self):
+        self.assertIsInstance(FSIM_CURRENT_SCHEDULER, LazyScheduler)
@@ -14,6 +14,7 @@ from frontend.scripts import (
 )
 
 from frontend.models import (
+    Program as ProgramModel,
     Script as ScriptModel,
     ScriptGraphPrograms as SGP,
     ScriptGraphFiles as SGF,
@@ -337,3 +338,193 @@ class ScriptTests(TestCase):
             ).save,
             script,
         )
+
+    def test_save_bulk_queries(self):
+        slaves = [SlaveFactory() for _ in range(2)]
+        programs = [ProgramFactory(slave=slaves[i % 2]) for i in range(20)]
+        filesystems = [FileFactory(slave=slaves[i % 2]) for i in range(20)]
+
+        script = Script(
+            ScriptFactory.build().name,
+            [
+                ScriptEntryProgram(i, program.name, program.slave.name)
+                for (i, program) in enumerate(programs)
+            ] + [
+                ScriptEntryProgram(i, program.id, program.slave.id)
+                for (i, program) in enumerate(programs)
+            ],
+            [
+                ScriptEntryFilesystem(i % 3, filesystem.id,
+                                      filesystem.slave.name)
+                for (i, filesystem) in enumerate(filesystems)
+            ],
+        )
+
+        # the same program with the same index is only allowed once
+        with self.assertRaises(ValidationError):
+            script.save()
+
+        script.programs = script.programs[:20]
+
+        # the script (unique check, insert), one query per kind of reference,
+        # one insert per table and the savepoints (the amount of queries does
+        # not depend on the amount of entries)
+        with self.assertNumQueries(11):
+            script.save()
+
+        model = ScriptModel.objects.get(name=script.name)
+        self.assertEqual(20, SGP.objects.filter(script=model).count())
+        self.assertEqual(20, SGF.objects.filter(script=model).count())
+        self.assertEqual(
+            script,
+            Script.from_model(model.id, "str", "str", "int"),
+        )
+
+    def test_save_bulk_chunked(self):
+        # more references than SQLite allows variables in one query
+        slave = SlaveFactory()
+        ProgramModel.objects.bulk_create([
+            ProgramFactory.build(slave=slave, name='program_' + str(i))
+            for i in range(1000)
+        ])
+        programs = list(
+            ProgramModel.objects.filter(slave=slave).values_list(
+                'id', 'name'))
+
+        script = Script(
+            ScriptFactory.build().name,
+            [
+                ScriptEntryProgram(i, name, slave.name)
+                for (i, (_, name)) in enumerate(programs)
+            ] + [
+                ScriptEntryProgram(i + 1, program_id, slave.id)
+                for (i, (program_id, _)) in enumerate(programs)
+            ],
+            [],
+        )
+        script.save()
+
+        model = ScriptModel.objects.get(name=script.name)
+        self.assertEqual(2000, SGP.objects.filter(script=model).count())
+
+        script.programs = script.programs[:10]
+        self.assertEqual(
+            {'added': 0, 'removed': 1990},
+            script.update_entries(model)['programs'],
+        )
+
+    def test_save_bulk_error_order(self):
+        program = ProgramFactory()
+        filesystem = FileFactory()
+
+        script = Script(
+            ScriptFactory.build().name,
+            [
+                ScriptEntryProgram(0, program.id, program.slave.id),
+                ScriptEntryProgram(1, program.name, filesystem.slave.name),
+                ScriptEntryProgram(2, program.id, -1),
+            ],
+            [],
+        )
+
+        # the first invalid entry raises the error
+        self.assertRaises(ProgramNotExistError, script.save)
+
+        script.programs = script.programs[::2]
+        self.assertRaises(SlaveNotExistError, script.save)
+
+        script.programs = script.programs[:1]
+        script.filesystems = [
+            ScriptEntryFilesystem(0, filesystem.name, program.slave.id)
+        ]
+        self.assertRaises(FilesystemNotExistError, script.save)
+
+        self.assertFalse(ScriptModel.objects.filter(name=script.name).exists())
+        self.assertFalse(SGP.objects.exists())
+
+    def test_update_entries_diff(self):
+        slave = SlaveFactory()
+        programs = [ProgramFactory(slave=slave) for _ in range(10)]
+        filesystem = FileFactory(slave=slave)
+
+        script = Script(
+            ScriptFactory.build().name,
+            [
+                ScriptEntryProgram(i, program.id, slave.id)
+                for (i, program) in enumerate(programs)
+            ],
+            [ScriptEntryFilesystem(0, filesystem.id, slave.id)],
+        )
+        script.save()
+        model = ScriptModel.objects.get(name=script.name)
+        kept = set(
+            SGP.objects.filter(script=model).values_list('id', flat=True))
+
+        # move one program into another stage and remove the filesystem
+        script.programs[0] = ScriptEntryProgram(5, programs[0].id, slave.id)
+        script.filesystems = []
+
+        self.assertEqual(
+            {
+                'programs': {
+                    'added': 1,
+                    'removed': 1
+                },
+                'filesystems': {
+                    'added': 0,
+                    'removed': 1
+                },
+            },
+            script.update_entries(model),
+        )
+
+        self.assertEqual(script, Script.from_model(model.id, "int", "int",
+                                                   "int"))
+        self.assertEqual(
+            9,
+            len(kept & set(
+                SGP.objects.filter(script=model).values_list('id', flat=True))),
+        )
+
+        # without a change nothing is written
+        with self.assertNumQueries(6):
+            self.assertEqual(
+                {
+                    'programs': {
+                        'added': 0,
+                        'removed': 0
+                    },
+                    'filesystems': {
+                        'added': 0,
+                        'removed': 0
+                    },
+                },
+                script.update_entries(model),
+            )
+
+    def test_from_model_queries(self):
+        slaves = [SlaveFactory() for _ in range(3)]
+        script = Script(
+            ScriptFactory.build().name,
+            [
+                ScriptEntryProgram(i, ProgramFactory(slave=slaves[i % 3]).id,
+                                   slaves[i % 3].id) for i in range(30)
+            ],
+            [
+                ScriptEntryFilesystem(i, FileFactory(slave=slaves[i % 3]).id,
+                                      slaves[i % 3].id) for i in range(30)
+            ],
+        )
+        script.save()
+        model = ScriptModel.objects.get(name=script.name)
+
+        # the script and one query per entry type
+        with self.assertNumQueries(3):
+            self.assertEqual(script,
+                             Script.from_model(model.id, "int", "int", "int"))
+
+        with self.assertNumQueries(3):
+            Script.from_model(model.id, "str", "str", "str")
+
+        self.assertRaises(QueryParameterError, Script.from_model, model.id,
+                          "float", "int", "int")
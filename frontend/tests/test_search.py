@@ -0,0 +1,132 @@
+"""
+Test file for search.py module.
+"""
+# pylint: disable=missing-docstring,too-many-public-methods
+
+from django.db import connection, transaction
+from django.test import TestCase
+
+from frontend.models import Slave as SlaveModel, Program as ProgramModel
+from frontend.search import NameIndex, NAME_INDEX, rank
+
+from .factory import SlaveFactory, ProgramFactory
+from .testcases import run_on_commit
+
+
+class NameIndexTests(TestCase):
+    def setUp(self):
+        NAME_INDEX.clear()
+
+    def test_rank(self):
+        self.assertEqual(0, rank('start', 'start'))
+        self.assertEqual(1, rank('start_sim', 'start'))
+        self.assertEqual(2, rank('sim_start', 'start'))
+        self.assertEqual(3, rank('restart', 'start'))
+        self.assertEqual(2, rank('restart sim.start', 'start'))
+
+    def test_search_ranked(self):
+        for name in ['restart', 'sim_start', 'start_sim', 'start', 'stop']:
+            ProgramFactory(name=name)
+
+        self.assertEqual(
+            ['start', 'start_sim', 'sim_start', 'restart'],
+            NAME_INDEX.search(ProgramModel, 'START'),
+        )
+        self.assertEqual(
+            ['stop', 'start', 'start_sim', 'sim_start', 'restart'],
+            NAME_INDEX.search(ProgramModel, 'st'),
+        )
+        self.assertEqual([], NAME_INDEX.search(ProgramModel, 'starts'))
+
+    def test_search_like_contains(self):
+        for name in ['Alpha', 'alphabet', 'Beta', 'gamma', 'ALP']:
+            SlaveFactory(name=name)
+
+        for query in ['a', 'alp', 'ALPHA', 'bet', 'mm', 'x', '']:
+            self.assertCountEqual(
+                SlaveModel.objects.filter(name__contains=query).values_list(
+                    'name', flat=True),
+                NAME_INDEX.search(SlaveModel, query),
+            )
+
+    def test_search_in_sync(self):
+        slave = SlaveFactory(name='simulator')
+        run_on_commit()
+        self.assertEqual(['simulator'], NAME_INDEX.search(SlaveModel, 'sim'))
+
+        slave.name = 'cockpit'
+        slave.save()
+
+        # the index changes when the transaction is committed
+        self.assertEqual(['simulator'], NAME_INDEX.search(SlaveModel, 'sim'))
+        run_on_commit()
+        self.assertEqual([], NAME_INDEX.search(SlaveModel, 'sim'))
+        self.assertEqual(['cockpit'], NAME_INDEX.search(SlaveModel, 'pit'))
+
+        SlaveFactory(name='pitot')
+        run_on_commit()
+        self.assertEqual(['pitot', 'cockpit'],
+                         NAME_INDEX.search(SlaveModel, 'pit'))
+
+        slave.delete()
+        run_on_commit()
+        self.assertEqual(['pitot'], NAME_INDEX.search(SlaveModel, 'pit'))
+
+    def test_search_rollback(self):
+        slave = SlaveFactory(name='simulator')
+        run_on_commit()
+        self.assertEqual(['simulator'], NAME_INDEX.search(SlaveModel, 'sim'))
+
+        try:
+            with transaction.atomic():
+                slave.name = 'cockpit'
+                slave.save()
+                SlaveFactory(name='pitot')
+                raise ValueError()
+        except ValueError:
+            pass
+        run_on_commit()
+
+        self.assertEqual(['simulator'], NAME_INDEX.search(SlaveModel, 'sim'))
+        self.assertEqual([], NAME_INDEX.search(SlaveModel, 'pit'))
+
+    def test_search_cascade(self):
+        program = ProgramFactory(name='engine')
+        self.assertEqual(['engine'], NAME_INDEX.search(ProgramModel, 'eng'))
+
+        program.slave.delete()
+        run_on_commit()
+        self.assertEqual([], NAME_INDEX.search(ProgramModel, 'eng'))
+
+    def test_search_loads_on_demand(self):
+        index = NameIndex()
+        SlaveFactory(name='simulator')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(['simulator'], index.search(SlaveModel, 'mul'))
+            self.assertEqual(['simulator'], index.search(SlaveModel, 'sim'))
+
+        index.update(SlaveModel, 0, 'simulation')
+        with self.assertNumQueries(0):
+            self.assertEqual(['simulator', 'simulation'],
+                             index.search(SlaveModel, 'simul'))
+
+        index.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(['simulator'], index.search(SlaveModel, 'sim'))
+
+    def test_search_cleared_during_load(self):
+        index = NameIndex()
+        SlaveFactory(name='simulator')
+
+        def clear(execute, sql, params, many, context):
+            index.clear()
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(clear):
+            self.assertEqual(['simulator'], index.search(SlaveModel, 'sim'))
+
+        index.update(SlaveModel, 0, 'simulation')
+        with self.assertNumQueries(0):
+            self.assertEqual(['simulator', 'simulation'],
+                             index.search(SlaveModel, 'simul'))
@@ -0,0 +1,140 @@
+"""
+Test file for shutdown.py module.
+"""
+# pylint: disable=missing-docstring,too-many-public-methods
+
+from django.test import TestCase
+from channels.test import WSClient
+
+from utils import Command
+
+from frontend.models import (
+    Filesystem as FilesystemModel,
+    ProgramStatus as ProgramStatusModel,
+    Slave as SlaveModel,
+)
+from frontend.shutdown import Shutdown
+
+from .factory import (
+    SlaveOnlineFactory,
+    ProgramFactory,
+    ProgramStatusFactory,
+    FileFactory,
+)
+from .testcases import reset_runtime_state
+
+NO_TIMEOUTS = {'programs': 60, 'filesystems': 60, 'clients': 60}
+
+
+class ShutdownTests(TestCase):
+    def setUp(self):
+        reset_runtime_state()
+
+        self.slave = SlaveOnlineFactory()
+        self.status = ProgramStatusFactory(
+            program=ProgramFactory(slave=self.slave),
+            running=True,
+        )
+        self.filesystem = FileFactory(slave=self.slave, hash_value='abc')
+
+        self.ws_client = WSClient()
+        self.ws_client.join_group('client_' + str(self.slave.id))
+
+    def tearDown(self):
+        reset_runtime_state()
+
+    def receive_method(self):
+        return Command.from_json(self.ws_client.receive(json=False)).method
+
+    def test_phases(self):
+        shutdown = Shutdown('clients', NO_TIMEOUTS)
+
+        shutdown.begin()
+        self.assertEqual('execute', self.receive_method())
+        self.assertEqual('programs', shutdown.slaves[self.slave.id][0])
+
+        # nothing is confirmed
+        self.assertFalse(shutdown.step())
+        self.assertIsNone(self.ws_client.receive())
+
+        ProgramStatusModel.objects.filter(pk=self.status.pk).update(
+            running=False)
+        self.assertFalse(shutdown.step())
+        self.assertEqual('filesystem_restore', self.receive_method())
+        self.assertEqual('filesystems', shutdown.slaves[self.slave.id][0])
+
+        FilesystemModel.objects.filter(id=self.filesystem.id).update(
+            hash_value='')
+        self.assertFalse(shutdown.step())
+        self.assertEqual('shutdown', self.receive_method())
+
+        SlaveModel.objects.filter(id=self.slave.id).update(online=False)
+        self.assertTrue(shutdown.step())
+        self.assertEqual({
+            'programs': 0,
+            'filesystems': 0,
+            'clients': 0,
+            'finished': 1,
+        }, shutdown.progress())
+        self.assertIsNone(shutdown.next_timeout())
+
+    def test_scope_programs(self):
+        shutdown = Shutdown('programs', NO_TIMEOUTS)
+        shutdown.begin()
+        self.assertEqual('execute', self.receive_method())
+
+        ProgramStatusModel.objects.filter(pk=self.status.pk).update(
+            running=False)
+        self.assertTrue(shutdown.step())
+
+        # the filesystems and the clients are untouched
+        self.assertIsNone(self.ws_client.receive())
+        self.assertFalse(shutdown.includes_master)
+
+    def test_restore_error_confirms(self):
+        shutdown = Shutdown('filesystem', NO_TIMEOUTS)
+        shutdown.begin()
+        ProgramStatusModel.objects.filter(pk=self.status.pk).update(
+            running=False)
+        shutdown.step()
+
+        FilesystemModel.objects.filter(id=self.filesystem.id).update(
+            error_code='error')
+        self.assertTrue(shutdown.step())
+
+    def test_restore_error_of_earlier_command(self):
+        FilesystemModel.objects.filter(id=self.filesystem.id).update(
+            error_code='earlier error')
+
+        shutdown = Shutdown('filesystem', NO_TIMEOUTS)
+        shutdown.begin()
+        ProgramStatusModel.objects.filter(pk=self.status.pk).update(
+            running=False)
+
+        # the client has not answered the restore yet
+        self.assertFalse(shutdown.step())
+        self.assertEqual('filesystems', shutdown.slaves[self.slave.id][0])
+        self.assertEqual(
+            '',
+            FilesystemModel.objects.get(id=self.filesystem.id).error_code)
+
+    def test_timeout(self):
+        shutdown = Shutdown('filesystem', {
+            'programs': 0,
+            'filesystems': 60,
+        })
+        shutdown.begin()
+
+        # the program is still running, but the phase timed out
+        self.assertEqual('filesystems', shutdown.slaves[self.slave.id][0])
+        self.assertEqual('execute', self.receive_method())
+        self.assertEqual('filesystem_restore', self.receive_method())
+
+    def test_skip_phases_without_commands(self):
+        slave = SlaveOnlineFactory()
+        shutdown = Shutdown('all', NO_TIMEOUTS)
+        shutdown.begin()
+
+        # nothing to stop and to restore on the new client
+        self.assertEqual('clients', shutdown.slaves[slave.id][0])
+        self.assertTrue(shutdown.includes_master)
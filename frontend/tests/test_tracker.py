@@ -0,0 +1,261 @@
+"""
+Test file for tracker.py module.
+"""
+# pylint: disable=missing-docstring,too-many-public-methods
+
+import json
+
+from django.test import TestCase
+from channels.test import WSClient
+
+from utils import Status, Command
+
+from frontend.models import Filesystem as FilesystemModel
+from frontend.controller import fs_move, prog_log_get
+from frontend.consumers import select_method
+from frontend.tracker import COMMANDS, CommandTracker
+
+from .factory import (
+    SlaveOnlineFactory,
+    FileFactory,
+    ProgramStatusFactory,
+)
+from .testcases import reset_runtime_state
+
+
+class CommandTrackerTests(TestCase):
+    def setUp(self):
+        reset_runtime_state()
+
+        self.slave = SlaveOnlineFactory()
+        self.filesystem = FileFactory(slave=self.slave)
+
+        self.slave_ws = WSClient()
+        self.slave_ws.join_group('client_{}'.format(self.slave.id))
+
+        self.webinterface = WSClient()
+        self.webinterface.join_group('notifications')
+
+    def tearDown(self):
+        reset_runtime_state()
+
+    def receive_command(self):
+        return Command.from_json(json.dumps(self.slave_ws.receive()))
+
+    def test_send_untracked(self):
+        tracker = CommandTracker(deadlines={})
+        cmd = Command(method='execute')
+
+        tracker.send(cmd, self.slave.id)
+
+        self.assertEqual(cmd, self.receive_command())
+        self.assertEqual(tracker.metrics()['sent'], 0)
+        self.assertEqual(tracker.metrics()['in_flight'], {})
+
+    def test_deadline_chain(self):
+        tracker = CommandTracker(deadlines={
+            'filesystem_move': 60,
+            'chain_execution': 30,
+        })
+        move = Command(method='filesystem_move')
+
+        self.assertEqual(60, tracker.deadline(move))
+        self.assertEqual(
+            180,
+            tracker.deadline(
+                Command(
+                    method='chain_execution',
+                    commands=[dict(move)] * 3,
+                )),
+        )
+        # commands without a deadline count with the deadline of the chain
+        self.assertEqual(
+            90,
+            tracker.deadline(
+                Command(
+                    method='chain_execution',
+                    commands=[dict(move), dict(Command(method='execute'))],
+                )),
+        )
+        self.assertEqual(
+            30,
+            tracker.deadline(Command(method='chain_execution', commands=[])),
+        )
+
+    def test_deadline_retransmit(self):
+        program = ProgramStatusFactory(
+            program__slave=self.slave,
+            running=True,
+        ).program
+        prog_log_get(program)
+        cmd = self.receive_command()
+
+        COMMANDS.on_deadline(cmd.uuid, 0)
+
+        retransmitted = self.receive_command()
+        self.assertEqual(cmd, retransmitted)
+        self.assertEqual(cmd.uuid, retransmitted.uuid)
+        self.assertEqual(COMMANDS.metrics()['retransmitted'], 1)
+
+        # an old deadline is ignored
+        COMMANDS.on_deadline(cmd.uuid, 0)
+        self.assertIsNone(self.slave_ws.receive())
+
+    def test_deadline_expired(self):
+        fs_move(self.filesystem)
+        cmd = self.receive_command()
+
+        # a move is never send again
+        COMMANDS.on_deadline(cmd.uuid, 0)
+        self.assertIsNone(self.slave_ws.receive())
+
+        filesystem = FilesystemModel.objects.get(id=self.filesystem.id)
+        self.assertEqual(filesystem.error_code,
+                         'The client did not answer in time.')
+        self.assertFalse(filesystem.is_moved)
+        self.assertEqual(
+            Status.ok({
+                'filesystem_status': 'error',
+                'error_code': 'The client did not answer in time.',
+                'fid': str(filesystem.id),
+            }),
+            Status.from_json(json.dumps(self.webinterface.receive())),
+        )
+
+        metrics = COMMANDS.metrics()
+        self.assertEqual(metrics['expired'], 1)
+        self.assertEqual(metrics['in_flight'], {})
+
+        # a late answer replaces the error
+        status = Status.ok({'method': 'filesystem_move', 'result': 'abc'})
+        status.uuid = cmd.uuid
+        select_method(status)
+
+        filesystem = FilesystemModel.objects.get(id=self.filesystem.id)
+        self.assertEqual(filesystem.hash_value, 'abc')
+        self.assertEqual(filesystem.error_code, '')
+        self.assertEqual(COMMANDS.metrics()['late'], 1)
+
+        # a second answer is ignored
+        status = Status.err({'method': 'filesystem_move', 'result': 'err'})
+        status.uuid = cmd.uuid
+        select_method(status)
+
+        filesystem = FilesystemModel.objects.get(id=self.filesystem.id)
+        self.assertEqual(filesystem.hash_value, 'abc')
+        self.assertEqual(COMMANDS.metrics()['duplicates'], 1)
+
+    def test_deadline_chain_expired(self):
+        moved = FileFactory(
+            slave=self.slave,
+            destination_path=self.filesystem.destination_path,
+            destination_type=self.filesystem.destination_type,
+            hash_value='abc',
+        )
+
+        fs_move(self.filesystem)
+        cmd = self.receive_command()
+        self.assertEqual(cmd.method, 'chain_execution')
+
+        COMMANDS.on_deadline(cmd.uuid, 0)
+        self.assertIsNone(self.slave_ws.receive())
+
+        self.assertEqual(
+            FilesystemModel.objects.get(id=moved.id).error_code,
+            'The client did not answer in time.',
+        )
+        self.assertEqual(
+            FilesystemModel.objects.get(id=self.filesystem.id).error_code,
+            'The client did not answer in time.',
+        )
+
+        # the late answer of the chain is applied
+        (restore, move) = cmd.arguments['commands']
+        status = Status.ok({
+            'method': 'chain_execution',
+            'result': [
+                dict(
+                    Status.ok({
+                        'method': 'filesystem_restore',
+                        'result': None,
+                    }),
+                    uuid=restore['uuid'],
+                ),
+                dict(
+                    Status.ok({
+                        'method': 'filesystem_move',
+                        'result': 'abc',
+                    }),
+                    uuid=move['uuid'],
+                ),
+            ],
+        })
+        status.uuid = cmd.uuid
+        select_method(status)
+
+        moved = FilesystemModel.objects.get(id=moved.id)
+        self.assertFalse(moved.is_moved)
+        self.assertEqual(moved.error_code, '')
+        self.assertEqual(
+            FilesystemModel.objects.get(id=self.filesystem.id).hash_value,
+            'abc',
+        )
+
+    def test_deadline_not_outstanding(self):
+        fs_move(self.filesystem)
+        cmd = self.receive_command()
+
+        FilesystemModel.objects.filter(id=self.filesystem.id).delete()
+        COMMANDS.on_deadline(cmd.uuid, 0)
+
+        self.assertIsNone(self.slave_ws.receive())
+        self.assertEqual(COMMANDS.metrics()['in_flight'], {})
+        self.assertEqual(COMMANDS.metrics()['expired'], 0)
+
+    def test_acknowledge(self):
+        fs_move(self.filesystem)
+        cmd = self.receive_command()
+
+        status = Status.ok({'method': 'filesystem_move', 'result': 'abc'})
+        status.uuid = cmd.uuid
+        select_method(status)
+
+        COMMANDS.on_deadline(cmd.uuid, 0)
+        self.assertIsNone(self.slave_ws.receive())
+
+        metrics = COMMANDS.metrics()
+        self.assertEqual(metrics['acknowledged'], 1)
+        self.assertEqual(metrics['in_flight'], {})
+        self.assertEqual(
+            FilesystemModel.objects.get(id=self.filesystem.id).hash_value,
+            'abc',
+        )
+
+    def test_acknowledge_unknown(self):
+        self.assertTrue(COMMANDS.acknowledge('0' * 32))
+        self.assertEqual(COMMANDS.metrics()['acknowledged'], 0)
+
+    def test_abort_slaves(self):
+        fs_move(self.filesystem)
+        program = ProgramStatusFactory(
+            program__slave=self.slave,
+            running=True,
+        ).program
+        prog_log_get(program)
+
+        self.assertEqual(
+            COMMANDS.metrics()['in_flight'],
+            {
+                'filesystem_move': 1,
+                'get_log': 1,
+            },
+        )
+
+        COMMANDS.abort_slaves([self.slave.id])
+
+        self.assertEqual(COMMANDS.metrics()['in_flight'], {})
+        self.assertEqual(COMMANDS.metrics()['expired'], 2)
+        self.assertEqual(
+            FilesystemModel.objects.get(id=self.filesystem.id).error_code,
+            'The client disconnected.',
+        )
@@ -30,19 +30,25 @@ def test_<Websocket Function>(self):
 
 import json
 import string
+from datetime import timedelta
 
 from random import choice
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
 from channels import Group
 from channels.test import WSClient
 
 from utils import Status, Command
 
+from frontend.consumers import disconnect_slaves
+from frontend.tracker import COMMANDS
 from frontend.models import (
     Slave as SlaveModel,
     Filesystem as FilesystemModel,
+    Program as ProgramModel,
     ProgramStatus as ProgramStatusModel,
+    ProgramRun as ProgramRunModel,
 )
 
 from .factory import (
@@ -52,9 +58,13 @@ from .factory import (
     FileFactory,
     MovedFileFactory,
 )
+from .testcases import reset_runtime_state
 
 
 class RPCWebsocketTests(TestCase):
+    def tearDown(self):
+        reset_runtime_state()
+
     def test_connect_success(self):
         slave = SlaveFactory()
 
@@ -171,6 +181,48 @@ class RPCWebsocketTests(TestCase):
         #  test if a "disconnected" message has been send to the webinterface
         self.assertIsNone(webinterface.receive())
 
+    def test_disconnect_many_slaves_success(self):
+        COMMANDS.clear()
+
+        slaves = [SlaveOnlineFactory() for _ in range(5)]
+        programs = [
+            ProgramStatusFactory(program__slave=slave).program
+            for slave in slaves for _ in range(4)
+        ]
+        other = ProgramStatusFactory(program__slave=SlaveOnlineFactory())
+
+        webinterface = WSClient()
+        webinterface.join_group('notifications')
+
+        # the scheduler is created on first use (its notification checks if
+        # a script is running)
+        FSIM_CURRENT_SCHEDULER.instance()
+
+        # the amount of queries does not depend on the amount of programs
+        with self.assertNumQueries(7):
+            disconnect_slaves([slave.id for slave in slaves])
+
+        self.assertFalse(
+            SlaveModel.objects.filter(
+                id__in=[slave.id for slave in slaves],
+                online=True,
+            ).exists())
+        self.assertFalse(
+            ProgramStatusModel.objects.filter(program__in=programs).exists())
+        self.assertTrue(
+            ProgramStatusModel.objects.filter(
+                program=other.program).exists())
+
+        #  only one message for all slaves
+        self.assertEqual(
+            Status.ok({
+                'slave_status': 'disconnected',
+                'sids': [str(slave.id) for slave in slaves],
+            }),
+            Status.from_json(json.dumps(webinterface.receive())),
+        )
+        self.assertIsNone(webinterface.receive())
+
     def test_receive_parse_json(self):
         ws_client = WSClient()
 
@@ -332,6 +384,201 @@ class RPCWebsocketTests(TestCase):
             Status.from_json(json.dumps(webinterface.receive())),
         )
 
+    def test_receive_execute_run_history(self):
+        program_status = ProgramStatusFactory(running=True)
+        program = program_status.program
+
+        ProgramRunModel.objects.create(
+            program=program,
+            slave=program.slave,
+            command_uuid=program_status.command_uuid,
+            start=program_status.start_time,
+        )
+
+        expected_status = Status.ok({'method': 'execute', 'result': 1})
+        expected_status.uuid = program_status.command_uuid
+
+        ws_client = WSClient()
+        ws_client.send_and_consume(
+            'websocket.receive',
+            path='/commands',
+            content={'text': expected_status.to_json()},
+        )
+
+        run = ProgramRunModel.objects.get(program=program)
+        self.assertEqual('1', run.code)
+        self.assertIsNotNone(run.end)
+        self.assertEqual(1, program.programrunstatistics.errors)
+
+    @override_settings(FSIM_START_TIME_AUTO_TUNE=True)
+    def test_receive_execute_tune_start_time(self):
+        program_status = ProgramStatusFactory(
+            running=True,
+            program__start_time=60,
+        )
+        program = program_status.program
+
+        start = now() - timedelta(seconds=3)
+        for i in range(4):
+            ProgramRunModel.objects.create(
+                program=program,
+                slave=program.slave,
+                command_uuid=str(i),
+                start=start,
+                end=start + timedelta(seconds=3),
+                ready=start + timedelta(seconds=3),
+                code='0',
+            )
+
+        # the current run was ready after 3 seconds
+        ProgramRunModel.objects.create(
+            program=program,
+            slave=program.slave,
+            command_uuid=program_status.command_uuid,
+            start=start,
+            ready=start + timedelta(seconds=3),
+        )
+
+        expected_status = Status.ok({'method': 'execute', 'result': 0})
+        expected_status.uuid = program_status.command_uuid
+
+        ws_client = WSClient()
+        ws_client.send_and_consume(
+            'websocket.receive',
+            path='/commands',
+            content={'text': expected_status.to_json()},
+        )
+
+        self.assertEqual(4, ProgramModel.objects.get(id=program.id).start_time)
+
+    @override_settings(FSIM_START_TIME_AUTO_TUNE=True)
+    def test_receive_execute_tune_start_time_exit_only(self):
+        program_status = ProgramStatusFactory(
+            running=True,
+            program__start_time=60,
+        )
+        program = program_status.program
+
+        # a daemon which exits quickly without a readiness signal
+        start = now() - timedelta(seconds=1)
+        for i in range(4):
+            ProgramRunModel.objects.create(
+                program=program,
+                slave=program.slave,
+                command_uuid=str(i),
+                start=start,
+                end=start + timedelta(seconds=1),
+                code='0',
+            )
+        ProgramRunModel.objects.create(
+            program=program,
+            slave=program.slave,
+            command_uuid=program_status.command_uuid,
+            start=start,
+        )
+
+        expected_status = Status.ok({'method': 'execute', 'result': 0})
+        expected_status.uuid = program_status.command_uuid
+
+        ws_client = WSClient()
+        ws_client.send_and_consume(
+            'websocket.receive',
+            path='/commands',
+            content={'text': expected_status.to_json()},
+        )
+
+        self.assertEqual(60,
+                         ProgramModel.objects.get(id=program.id).start_time)
+
+    def test_receive_ready_success(self):
+        program_status = ProgramStatusFactory(running=True)
+        program = program_status.program
+
+        ProgramRunModel.objects.create(
+            program=program,
+            slave=program.slave,
+            command_uuid=program_status.command_uuid,
+            start=program_status.start_time,
+        )
+
+        webinterface = WSClient()
+        webinterface.join_group('notifications')
+
+        ready_status = Status.ok({'method': 'ready', 'result': 'port'})
+        ready_status.uuid = program_status.command_uuid
+
+        ws_client = WSClient()
+        ws_client.send_and_consume(
+            'websocket.receive',
+            path='/commands',
+            content={'text': ready_status.to_json()},
+        )
+
+        status = ProgramStatusModel.objects.get(program=program)
+        self.assertTrue(status.ready)
+        self.assertTrue(status.running)
+        self.assertIsNotNone(
+            ProgramRunModel.objects.get(program=program).ready)
+
+        self.assertEqual(
+            Status.ok({
+                'program_status': 'ready',
+                'pid': str(program.id),
+            }),
+            Status.from_json(json.dumps(webinterface.receive())),
+        )
+
+        # the answer of the execute command is not a duplicate
+        expected_status = Status.ok({'method': 'execute', 'result': 0})
+        expected_status.uuid = program_status.command_uuid
+
+        ws_client.send_and_consume(
+            'websocket.receive',
+            path='/commands',
+            content={'text': expected_status.to_json()},
+        )
+
+        self.assertFalse(
+            ProgramStatusModel.objects.get(program=program).running)
+
+    def test_receive_ready_with_error_status(self):
+        program_status = ProgramStatusFactory(running=True)
+
+        webinterface = WSClient()
+        webinterface.join_group('notifications')
+
+        ready_status = Status.err({'method': 'ready', 'result': 'timeout'})
+        ready_status.uuid = program_status.command_uuid
+
+        ws_client = WSClient()
+        ws_client.send_and_consume(
+            'websocket.receive',
+            path='/commands',
+            content={'text': ready_status.to_json()},
+        )
+
+        self.assertFalse(
+            ProgramStatusModel.objects.get(
+                program=program_status.program).ready)
+        self.assertIsNone(webinterface.receive())
+
+    def test_receive_ready_not_running(self):
+        program_status = ProgramStatusFactory(running=False)
+
+        ready_status = Status.ok({'method': 'ready', 'result': 'port'})
+        ready_status.uuid = program_status.command_uuid
+
+        ws_client = WSClient()
+        ws_client.send_and_consume(
+            'websocket.receive',
+            path='/commands',
+            content={'text': ready_status.to_json()},
+        )
+
+        self.assertFalse(
+            ProgramStatusModel.objects.get(
+                program=program_status.program).ready)
+
     def test_receive_execute_slave_not_exists(self):
         program_status = ProgramStatusFactory(running=True)
         program = program_status.program
@@ -3,12 +3,48 @@ Test cases for frontend.
 """
 import unittest
 
+from django.db import connection
 from django.test import TestCase
 from server.errors import FsimError
 
 from utils import Status
 from utils.typecheck import ensure_type
 
+from frontend.admission import SLAVE_INDEX
+from frontend.exportcache import SCRIPT_EXPORTS
+from frontend.heartbeat import HEARTBEATS
+from frontend.ingest import LOGS
+from frontend.livestate import LIVE_STATE
+from frontend.search import NAME_INDEX
+from frontend.tracker import COMMANDS
+
+
+def reset_runtime_state():
+    """
+    Forgets everything which is kept in memory between requests (in-flight
+    commands, connections, the slave index, the log budgets, the live state,
+    the exported scripts and the name search). Timers which are still pending
+    in the event loop will find nothing to do.
+    """
+    COMMANDS.clear()
+    HEARTBEATS.clear()
+    SLAVE_INDEX.clear()
+    LOGS.clear()
+    LIVE_STATE.clear()
+    SCRIPT_EXPORTS.clear()
+    NAME_INDEX.clear()
+
+
+def run_on_commit():
+    """
+    Runs the callbacks of `transaction.on_commit` which are registered so far.
+    A `TestCase` never commits its transaction, so the callbacks (e.g. the
+    updates of the name search) would never run otherwise.
+    """
+    (callbacks, connection.run_on_commit) = (connection.run_on_commit, [])
+    for (_, callback) in callbacks:
+        callback()
+
 
 def assertStatusRegex(self, regex_status, status_object):
     """
@@ -51,6 +87,10 @@ class StatusTestCase(TestCase):
 
     assertStatusRegex = assertStatusRegex
 
+    def tearDown(self):
+        reset_runtime_state()
+        super().tearDown()
+
 
 class SchedulerTestCase(unittest.TestCase):
     """
@@ -0,0 +1,432 @@
+"""
+This module keeps track of commands which were send to slaves and are not
+answered yet (in-flight commands).
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.utils import DatabaseError
+
+from utils import Command, Status
+from utils.typecheck import ensure_type
+from server.utils import notify_slave
+
+from .admission import SLAVE_INDEX
+from .safeloop import shared_loop
+
+LOGGER = logging.getLogger("fsim.tracker")
+
+# Only these methods are send again. They do not change anything on the slave,
+# a second `filesystem_move` or `chain_execution` would move the files again.
+RETRANSMITTED_METHODS = ('online', 'get_log')
+
+
+def outstanding_online(entry):
+    """
+    Checks if the connecting slave still waits for the answer of `entry`.
+    """
+    return SLAVE_INDEX.is_online_requested(entry.command.uuid)
+
+
+def outstanding_filesystem(entry):
+    """
+    Checks if a `FilesystemModel` still waits for the answer of `entry`.
+    """
+    from .models import Filesystem as FilesystemModel
+    return FilesystemModel.objects.filter(
+        command_uuid=entry.command.uuid).exists()
+
+
+def outstanding_chain(entry):
+    """
+    Checks if a `FilesystemModel` still waits for an answer of one command
+    inside the chain `entry`.
+    """
+    from .models import Filesystem as FilesystemModel
+    return FilesystemModel.objects.filter(command_uuid__in=[
+        command['uuid'] for command in entry.command.arguments['commands']
+    ]).exists()
+
+
+def outstanding_log(entry):
+    """
+    Checks if the program which log is requested by `entry` still exists.
+    """
+    from .models import ProgramStatus as ProgramStatusModel
+    return ProgramStatusModel.objects.filter(
+        command_uuid=entry.command.arguments['target_uuid']).exists()
+
+
+OUTSTANDING_CHECKS = {
+    'online': outstanding_online,
+    'filesystem_move': outstanding_filesystem,
+    'filesystem_restore': outstanding_filesystem,
+    'chain_execution': outstanding_chain,
+    'get_log': outstanding_log,
+}
+
+
+class InFlightCommand:
+    """
+    A `Command` which was send to a slave and which is not answered yet.
+
+    Parameters
+    ----------
+        command: Command
+            The `Command` which was send.
+        slave_id: int
+            The identifier of the `SlaveModel` which received the `command`.
+    """
+
+    def __init__(self, command, slave_id):
+        self.command = command
+        self.slave_id = slave_id
+        self.attempt = 0
+        self.sent_at = time.monotonic()
+
+    def errors(self, reason):
+        """
+        Creates the `Status.err` objects which the slave would have send if
+        the `command` failed. For a `chain_execution` one `Status` for every
+        command in the chain is returned.
+
+        Parameters
+        ----------
+            reason: str
+                The result of the created `Status` objects.
+
+        Returns
+        -------
+            list of Status
+        """
+        if self.command.method == 'chain_execution':
+            commands = self.command.arguments['commands']
+        else:
+            commands = [dict(self.command)]
+
+        return [
+            Status(
+                Status.ID_ERR,
+                {
+                    'method': command['method'],
+                    'result': reason,
+                },
+                command['uuid'],
+            ) for command in commands
+        ]
+
+
+class CommandTracker:
+    """
+    A thread-safe table of in-flight commands. Every tracked command has a
+    deadline (per method, see `CommandTracker.deadline`). If no answer
+    arrived before the deadline an idempotent command (see
+    `RETRANSMITTED_METHODS`) is send again with the same uuid. After
+    `max_retries` retransmissions (or at the first deadline for all other
+    commands) the command is answered with a `Status.err` by the master
+    itself, so that everybody who waits for the answer can continue.
+    If the real answer arrives later it is applied nevertheless, because the
+    slave may have finished the operation.
+
+    Parameters
+    ----------
+        deadlines: dict
+            Maps a method name to the seconds to wait for an answer.
+        max_retries: int
+            How often a command is send again before it expires.
+        history: int
+            How many answered uuids are remembered to detect duplicates.
+    """
+
+    def __init__(self, deadlines=None, max_retries=None, history=1024):
+        if deadlines is None:
+            deadlines = settings.FSIM_COMMAND_DEADLINES
+        if max_retries is None:
+            max_retries = settings.FSIM_COMMAND_MAX_RETRIES
+
+        self.deadlines = deadlines
+        self.max_retries = max_retries
+        self.history = history
+
+        self.lock = threading.Lock()
+
+        self.__pending = {}
+        self.__finished = OrderedDict()
+        self.__expired = OrderedDict()
+        self.__counters = {}
+        self.clear()
+
+    def clear(self):
+        """
+        Thread-safe function.
+
+        Forgets all in-flight commands and resets the metrics.
+        """
+        with self.lock:
+            self.__pending.clear()
+            self.__finished.clear()
+            self.__expired.clear()
+            self.__counters = {
+                'sent': 0,
+                'retransmitted': 0,
+                'acknowledged': 0,
+                'expired': 0,
+                'late': 0,
+                'duplicates': 0,
+                'latency_sum': 0.0,
+                'latency_max': 0.0,
+            }
+
+    def deadline(self, command):
+        """
+        Returns the seconds to wait for an answer to the tracked `command`. A
+        `chain_execution` runs its commands one after another, so it waits
+        for the sum of their deadlines (a command without a deadline counts
+        with the deadline of the chain).
+
+        Parameters
+        ----------
+            command: Command
+                A `Command` with a method in `deadlines`.
+
+        Returns
+        -------
+            float:
+                The seconds until the deadline.
+        """
+        deadline = self.deadlines[command.method]
+
+        if command.method == 'chain_execution':
+            deadline = max(
+                deadline,
+                sum(
+                    self.deadlines.get(chained['method'], deadline)
+                    for chained in command.arguments['commands']),
+            )
+
+        return deadline
+
+    def send(self, command, slave_id):
+        """
+        Thread-safe function.
+
+        Sends `command` to the slave and tracks it if the method has a
+        deadline.
+
+        Parameters
+        ----------
+            command: Command
+                The `Command` which is send to the slave.
+            slave_id: int
+                The identifier of the `SlaveModel`.
+        """
+        ensure_type("command", command, Command)
+
+        if command.method in self.deadlines:
+            with self.lock:
+                self.__pending[command.uuid] = InFlightCommand(
+                    command, slave_id)
+                self.__counters['sent'] += 1
+
+            shared_loop().spawn(
+                self.deadline(command),
+                self.on_deadline,
+                command.uuid,
+                0,
+            )
+
+        notify_slave(command, slave_id)
+
+    def acknowledge(self, uuid):
+        """
+        Thread-safe function.
+
+        Marks the command with `uuid` as answered.
+
+        Parameters
+        ----------
+            uuid: str
+                The uuid of the received `Status`.
+
+        Returns
+        -------
+            bool:
+                False if the command was already answered and the answer has
+                to be ignored. The first answer of an expired command is
+                accepted (it replaces the error of the master).
+        """
+        with self.lock:
+            entry = self.__pending.pop(uuid, None)
+
+            if entry is not None:
+                latency = time.monotonic() - entry.sent_at
+                self.__counters['acknowledged'] += 1
+                self.__counters['latency_sum'] += latency
+                self.__counters['latency_max'] = max(
+                    self.__counters['latency_max'], latency)
+                self.__finish(uuid)
+                return True
+
+            if self.__expired.pop(uuid, None) is not None:
+                self.__counters['late'] += 1
+                self.__finish(uuid)
+                return True
+
+            if uuid in self.__finished:
+                self.__counters['duplicates'] += 1
+                return False
+
+        return True
+
+    def on_deadline(self, uuid, attempt):
+        """
+        This is callback function which is called if the deadline of a
+        command is reached. The command is send again or expires if no
+        retries are left (or if it is not idempotent).
+
+        Parameters
+        ----------
+            uuid: str
+                The uuid of the `Command`.
+            attempt: int
+                The attempt which started the deadline.
+        """
+        with self.lock:
+            entry = self.__pending.get(uuid)
+            if entry is None or entry.attempt != attempt:
+                return
+
+        try:
+            outstanding = OUTSTANDING_CHECKS[entry.command.method](entry)
+        except DatabaseError as err:
+            LOGGER.error("Could not check command %s. (cause: %s)", uuid,
+                         str(err))
+            outstanding = False
+
+        if not outstanding:
+            LOGGER.debug("Command %s is not needed anymore.", uuid)
+            with self.lock:
+                self.__pending.pop(uuid, None)
+            return
+
+        if (attempt < self.max_retries
+                and entry.command.method in RETRANSMITTED_METHODS):
+            with self.lock:
+                entry.attempt += 1
+                self.__counters['retransmitted'] += 1
+
+            LOGGER.warning(
+                "No answer for %s (%s) from slave %s ... sending again.",
+                entry.command.method,
+                uuid,
+                entry.slave_id,
+            )
+
+            notify_slave(entry.command, entry.slave_id)
+            shared_loop().spawn(
+                self.deadline(entry.command),
+                self.on_deadline,
+                uuid,
+                entry.attempt,
+            )
+        else:
+            LOGGER.error(
+                "No answer for %s (%s) from slave %s after %s retries.",
+                entry.command.method,
+                uuid,
+                entry.slave_id,
+                attempt,
+            )
+            self.__expire([uuid], "The client did not answer in time.")
+
+    def abort_slaves(self, slave_ids):
+        """
+        Thread-safe function.
+
+        Expires all in-flight commands of the given slaves (e.g. on a
+        disconnect).
+
+        Parameters
+        ----------
+            slave_ids: list of int
+                The identifiers of the `SlaveModel`s.
+        """
+        slave_ids = set(slave_ids)
+
+        with self.lock:
+            uuids = [
+                uuid for (uuid, entry) in self.__pending.items()
+                if entry.slave_id in slave_ids
+            ]
+
+        self.__expire(uuids, "The client disconnected.")
+
+    def metrics(self):
+        """
+        Thread-safe function.
+
+        Returns
+        -------
+            dict:
+                Counters about the send, retransmitted, acknowledged, expired
+                and late answered commands and the acknowledgement latency.
+        """
+        with self.lock:
+            metrics = dict(self.__counters)
+            in_flight = {}
+            for entry in self.__pending.values():
+                in_flight[entry.command.method] = in_flight.get(
+                    entry.command.method, 0) + 1
+
+        latency_sum = metrics.pop('latency_sum')
+        if metrics['acknowledged']:
+            metrics['latency_mean'] = latency_sum / metrics['acknowledged']
+        else:
+            metrics['latency_mean'] = 0.0
+        metrics['in_flight'] = in_flight
+
+        return metrics
+
+    def __finish(self, uuid):
+        """
+        Remembers that `uuid` is answered. Has to be called with the lock.
+        """
+        self.__finished[uuid] = True
+        while len(self.__finished) > self.history:
+            self.__finished.popitem(last=False)
+
+    def __remember_expired(self, uuid):
+        """
+        Remembers that `uuid` expired, so that a late answer is accepted once.
+        Has to be called with the lock.
+        """
+        self.__expired[uuid] = True
+        while len(self.__expired) > self.history:
+            self.__expired.popitem(last=False)
+
+    def __expire(self, uuids, reason):
+        """
+        Removes the commands with `uuids` and answers them with `Status.err`.
+        """
+        from .consumers import select_method
+
+        for uuid in uuids:
+            with self.lock:
+                entry = self.__pending.pop(uuid, None)
+                if entry is None:
+                    continue
+                self.__counters['expired'] += 1
+
+            for status in entry.errors(reason):
+                select_method(status)
+
+            with self.lock:
+                self.__remember_expired(uuid)
+
+
+# The tracker which is used by the whole application.
+COMMANDS = CommandTracker()
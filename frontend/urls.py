@@ -25,6 +25,7 @@ urlpatterns = [  # pylint: disable=C0103
     url(r'^api/script/([0-9]+)/run$', api.script_run, name='script_run'),
     url(r'^api/script/stop$', api.script_stop, name='script_stop'),
     url(r'^api/script/([0-9]+)/copy$', api.script_copy, name='script_copy'),
+    url(r'^api/scripts/copy$', api.script_copy_set, name='script_copy_set'),
     url(r'^api/script/([0-9]+)/set_default$',
         api.script_set_default,
         name='script_set_default'),
@@ -32,6 +33,11 @@ urlpatterns = [  # pylint: disable=C0103
     url(r'^api/slaves$', api.slave_set, name='slave_set'),
     url(r'^api/slave/([0-9]+)$', api.slave_entry, name='slave_entry'),
     url(r'^api/slave/([0-9]+)/wol$', api.slave_wol, name='slave_wol'),
+    url(
+        r'^api/slave/([0-9]+)/connection$',
+        api.slave_connection,
+        name='slave_connection',
+    ),
     url(
         r'^api/slave/([0-9]+)/shutdown$',
         api.slave_shutdown,
@@ -39,6 +45,16 @@ urlpatterns = [  # pylint: disable=C0103
     ),
     # Programs
     url(r'^api/programs$', api.program_set, name='program_set'),
+    url(
+        r'^api/programs/start$',
+        api.program_start_set,
+        name='program_start_set',
+    ),
+    url(
+        r'^api/programs/stop$',
+        api.program_stop_set,
+        name='program_stop_set',
+    ),
     url(r'^api/program/([0-9]+)$', api.program_entry, name='program_entry'),
     url(
         r'^api/program/([0-9]+)/start$',
@@ -59,8 +75,26 @@ urlpatterns = [  # pylint: disable=C0103
         api.program_log_disable,
         name='program_log_disable',
     ),
+    url(r'^api/program/([0-9]+)/runs$',
+        api.program_runs,
+        name='program_runs'),
+    url(
+        r'^api/program/([0-9]+)/start_time$',
+        api.program_start_time,
+        name='program_start_time',
+    ),
     # Filesystems
     url(r'^api/filesystems$', api.filesystem_set, name='filesystem_set'),
+    url(
+        r'^api/filesystems/move$',
+        api.filesystem_move_set,
+        name='filesystem_move_set',
+    ),
+    url(
+        r'^api/filesystems/restore$',
+        api.filesystem_restore_set,
+        name='filesystem_restore_set',
+    ),
     url(
         r'^api/filesystem/([0-9]+)$',
         api.filesystem_entry,
@@ -76,6 +110,11 @@ urlpatterns = [  # pylint: disable=C0103
         api.filesystem_restore,
         name='filesystem_restore',
     ),
+    # Dashboard
+    url(r'^api/dashboard$', api.dashboard, name='dashboard'),
+    # Commands
+    url(r'^api/commands$', api.command_metrics, name='command_metrics'),
+    url(r'^api/logs$', api.log_metrics, name='log_metrics'),
     # shutdown everything
     url(r'^api/all/scope_operation$',
         api.scope_operations,
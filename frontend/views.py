@@ -2,9 +2,11 @@
 This module contains all views of the frontend application.
 """
 
+from django.db.models import Prefetch
 from django.views.generic import TemplateView, ListView
 
 from .models import Slave as SlaveModel
+from .models import Program as ProgramModel
 from .models import Script as ScriptModel
 from .forms import SlaveForm
 from .forms import ProgramForm
@@ -60,6 +62,12 @@ class SlavesView(ListView):
     model = SlaveModel
     context_object_name = "slaves"
 
+    def get_queryset(self):
+        return SlaveModel.with_status_counts().prefetch_related(
+            Prefetch('program_set', queryset=ProgramModel.objects.with_state()),
+            'filesystem_set',
+        )
+
     def get_context_data(self, **kwargs):  # pylint: disable=w0221
         context = super(SlavesView, self).get_context_data(**kwargs)
         context['slave_form'] = SlaveForm()
@@ -0,0 +1,58 @@
+"""
+This module configures the database connections.
+"""
+
+import logging
+
+from django.conf import settings
+
+LOGGER = logging.getLogger("fsim.database")
+
+# SQLite allows at most 999 variables per query, so the values of an `__in`
+# lookup are split into chunks (with room for the other variables)
+MAX_QUERY_VARIABLES = 900
+
+
+def configure_sqlite(sender, connection, **kwargs):  # pylint: disable=W0613
+    """
+    Sets the pragmas from `FSIM_SQLITE_PRAGMAS` on a new SQLite connection.
+    This function is a receiver of the `connection_created` signal.
+
+    Parameters
+    ----------
+        sender: class
+            The class of the database wrapper.
+        connection: DatabaseWrapper
+            The new connection.
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    pragmas = settings.FSIM_SQLITE_PRAGMAS
+
+    with connection.cursor() as cursor:
+        for (name, value) in pragmas.items():
+            cursor.execute('PRAGMA {} = {}'.format(name, value))
+
+    LOGGER.debug("Configured SQLite connection with %s.", pragmas)
+
+
+def chunked(values, size=MAX_QUERY_VARIABLES):
+    """
+    Splits `values` into lists which fit into one `__in` lookup.
+
+    Parameters
+    ----------
+        values: iterable
+            The values of the lookup.
+        size: int
+            The maximum length of one chunk.
+
+    Returns
+    -------
+        generator of list:
+            The consecutive chunks of `values`.
+    """
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
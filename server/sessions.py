@@ -0,0 +1,23 @@
+"""
+This module contains the session engine of the websocket connections (see
+`CHANNEL_SESSION_ENGINE`).
+"""
+
+from django.contrib.sessions.backends import cache
+from django.core.cache import caches
+
+# the cache which contains the sessions of the websocket connections
+CACHE_ALIAS = 'channel_sessions'
+
+
+class SessionStore(cache.SessionStore):
+    """
+    Keeps the sessions in the `channel_sessions` cache instead of the default
+    cache. The default cache culls entries if it is full, which would drop the
+    state of connected slaves. The session of a connection is deleted when the
+    connection is closed.
+    """
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._cache = caches[CACHE_ALIAS]
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/1.11/ref/settings/
 """
 
 import os
+import sys
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -53,6 +54,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'frontend.middleware.flush_live_state',
 ]
 
 ROOT_URLCONF = 'server.urls'
@@ -88,6 +90,16 @@ DATABASES = {
     },
 }
 
+# pragmas which are set on every SQLite connection (see server/database.py).
+# WAL lets readers work while a write is in progress and synchronous=NORMAL
+# only syncs at checkpoints in WAL mode.
+FSIM_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 64 * 1024 * 1024,
+    'cache_size': -16 * 1024,
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
 
@@ -147,6 +159,97 @@ CHANNEL_LAYERS = {
     },
 }
 
+# websocket sessions are only used by this process, so they do not need to
+# be written into the database. They are kept in their own cache which never
+# culls entries (a culled session would lose the slave of a connection), the
+# session of a connection is deleted when it is closed.
+CHANNEL_SESSION_ENGINE = 'server.sessions'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'channel_sessions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'channel_sessions',
+        'OPTIONS': {
+            'MAX_ENTRIES': sys.maxsize,
+        },
+    },
+}
+
+# seconds to wait for an answer of a slave (per method). `online` and
+# `get_log` are send again (FSIM_COMMAND_MAX_RETRIES times) before they fail,
+# all other commands fail at their deadline (a late answer is still applied).
+# A `chain_execution` waits for the sum of the deadlines of its commands (at
+# least its own). Commands with a method which is not listed here are not
+# tracked. `execute` is answered when the program exits and a second `execute`
+# with the same uuid stops the program on the slave, so it can not be tracked.
+FSIM_COMMAND_DEADLINES = {
+    'online': 5,
+    'filesystem_move': 60,
+    'filesystem_restore': 60,
+    'chain_execution': 60,
+    'get_log': 5,
+}
+FSIM_COMMAND_MAX_RETRIES = 2
+
+# seconds between two heartbeats to a slave and seconds without any message
+# after which a slave is declared offline
+FSIM_HEARTBEAT_INTERVAL = 1
+FSIM_HEARTBEAT_TIMEOUT = 5
+
+# characters per second which are forwarded from the log of one program to the
+# web interface, characters which can be forwarded (and buffered) at once and
+# the maximum size of one log chunk
+FSIM_LOG_RATE = 64 * 1024
+FSIM_LOG_BURST = 256 * 1024
+FSIM_LOG_MAX_CHUNK = 64 * 1024
+
+# seconds between two writes of the volatile state (e.g. program results) into
+# the database. With 0 (the default) every change is written immediately, a
+# value like 0.2 merges the changes of a burst into one transaction. The
+# database stays the source of truth either way (see frontend/livestate.py).
+FSIM_LIVE_STATE_FLUSH_INTERVAL = 0
+
+# days a finished program run is kept in the history (see the command
+# `compactruns`, the statistics of the programs keep all runs)
+FSIM_RUN_HISTORY_RETENTION = 30
+
+# the amount of latest runs which are used to suggest a start time for a
+# program, the amount of runs which are needed at least and the safety margin
+# on top of the slowest readiness. If FSIM_START_TIME_AUTO_TUNE is set, the
+# suggestion is applied after every run.
+FSIM_START_TIME_SAMPLES = 20
+FSIM_START_TIME_MIN_SAMPLES = 5
+FSIM_START_TIME_MARGIN = 0.25
+FSIM_START_TIME_AUTO_TUNE = False
+
+# seconds a management command (boot) and the reset of the database on startup
+# may take (checked by the command `benchmarkstartup`)
+FSIM_STARTUP_BUDGET = {
+    'boot': 5.0,
+    'reset': 0.5,
+}
+
+# the amount of exported scripts (GET api/script/<id>) which are kept in
+# memory. The exports are identified by the version of the script, so that
+# changed scripts are never served from the cache.
+FSIM_SCRIPT_EXPORT_CACHE_SIZE = 256
+
+# seconds a client may stay in a phase of a shutdown (api/all/scope_operation)
+# before the next phase starts without its confirmation
+FSIM_SHUTDOWN_TIMEOUTS = {
+    'programs': 10,
+    'filesystems': 20,
+    'clients': 30,
+}
+
+# the default and the maximal amount of rows on one page of the list endpoints
+# (e.g. GET api/slaves?limit=100&cursor=<next>&fields=id,name)
+FSIM_PAGE_SIZE = 100
+FSIM_MAX_PAGE_SIZE = 1000
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -1,10 +1,13 @@
 # pylint: disable=C0111
 # pylint: disable=C302
 
+from io import StringIO
 from os import remove
 from os.path import isfile, isdir
 from sass import CompileError
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
 from utils.status import Status
 from server.management.commands.compilesass import Command
 
@@ -41,6 +44,78 @@ class ManagementTest(TestCase):
             self.assertTrue(isfile(self.CSS_PATH))
 
 
+class DatabaseTest(TransactionTestCase):
+    def test_sqlite_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            # NORMAL
+            self.assertEqual(1, cursor.fetchone()[0])
+
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(-16 * 1024, cursor.fetchone()[0])
+
+    def test_benchmark_status(self):
+        from frontend.models import Slave
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+
+        out = StringIO()
+        call_command('benchmarkstatus', count=20, rows=2, stdout=out)
+
+        self.assertIn('before', out.getvalue())
+        self.assertIn('write-behind', out.getvalue())
+        self.assertIn('write-through', out.getvalue())
+
+        # the benchmark uses a temporary database
+        self.assertFalse(Slave.objects.exists())
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(journal_mode, cursor.fetchone()[0])
+
+
+class StartupTest(TestCase):
+    def test_reset_database_queries(self):
+        from frontend.apps import reset_database
+        from frontend.models import Slave
+
+        Slave.objects.bulk_create([
+            Slave(
+                name='slave_{}'.format(i),
+                ip_address='10.0.0.{}'.format(i),
+                mac_address='00:00:00:00:00:{:02X}'.format(i),
+                online=True,
+            ) for i in range(50)
+        ])
+
+        # one query per table, independent of the amount of rows
+        with self.assertNumQueries(5):
+            reset_database()
+
+        self.assertFalse(Slave.objects.filter(online=True).exists())
+
+    def test_benchmark_startup(self):
+        from frontend.models import Slave
+
+        slave = Slave.objects.create(
+            name='slave',
+            ip_address='10.0.0.1',
+            mac_address='00:00:00:00:00:01',
+            online=True,
+        )
+
+        out = StringIO()
+        call_command('benchmarkstartup', rows=20, boot_runs=0, stdout=out)
+
+        self.assertIn('reset', out.getvalue())
+        self.assertNotIn('boot', out.getvalue())
+
+        # the reset of the benchmark is rolled back
+        self.assertEqual([slave.id], list(
+            Slave.objects.filter(online=True).values_list('id', flat=True)))
+
+
 class ErrorTests(TestCase):
     def test_raise_error(self):
         self.assertRaisesRegex(